@@ -0,0 +1,609 @@
+"""
+This module provides vectorised evaluation of timber member design capacities. Member inputs are
+stored as NumPy arrays (one element per member) so that many members can be evaluated in one
+pass, using the same AS1720.1 formulas as the timberas.member classes.
+
+Classes:
+    MemberBatch: Struct-of-arrays equivalent of BoardMember and GlulamMember objects.
+
+Functions:
+    calc_k12(): Vectorised stability factor k_12 for compression or bending.
+
+    g3_lookup(): Vectorised geometric factor g_31/g_32 lookup, Table 2.7.
+
+    k_4_lookup(): Vectorised partial seasoning factor k_4, Table 2.5.
+
+    k_6_lookup(): Vectorised temperature factor k_6, Clause 2.4.3.
+
+    k_9_lookup(): Vectorised strength sharing factor k_9, Clause 2.4.5.3.
+
+    round_sig_figs(): Vectorised rounding to a number of significant figures.
+
+    round_decimals(): Vectorised rounding to a number of decimal digits.
+"""
+from __future__ import annotations
+
+import math
+from dataclasses import dataclass, field, fields
+
+import numpy as np
+import pandas as pd
+
+from timberas.geometry import TimberSection, import_section_library
+from timberas.material import TimberMaterial, SizedMaterialCache, SIZED_MATERIALS
+from timberas.member import TimberMember, RestraintEdge
+
+# Table 2.7, AS1720.1:2010 - g_31/g_32 for n = 1..9, n >= 10 uses 1.33
+G3_TABLE = np.array([1.0, 1.14, 1.2, 1.24, 1.26, 1.28, 1.3, 1.31, 1.32])
+
+CAPACITY_NAMES = ("N_dt", "N_dcx", "N_dcy", "N_dc", "M_d", "V_d")
+# capacities which depend on S1, and jump at L_ay = L_CLR (Clause 3.2.3.2)
+S1_CAPACITIES = ("M_d",)
+
+MEMBER_TYPES = ("board", "glulam")
+
+
+def calc_k12(rho_times_s: np.ndarray) -> np.ndarray:
+    """Calculate stability factor k12 from the product of material constant and slenderness
+    coefficient. Same piecewise curve for compression (Clause 3.3.3) and bending (Clause
+    3.2.4), AS1720.1:2010."""
+    rho_times_s = np.asarray(rho_times_s, dtype=float)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        return np.where(
+            rho_times_s <= 10,
+            1.0,
+            np.where(
+                rho_times_s <= 20,
+                1.5 - 0.05 * rho_times_s,
+                200 / rho_times_s**2,
+            ),
+        )
+
+
+def g3_lookup(n: np.ndarray) -> np.ndarray:
+    """Table 2.7, AS1720.1:2010"""
+    n = np.asarray(n)
+    idx = np.clip(n, 1, len(G3_TABLE)).astype(int) - 1
+    return np.where((n >= 1) & (n <= len(G3_TABLE)), G3_TABLE[idx], 1.33)
+
+
+def k_4_lookup(
+    seasoned: np.ndarray,
+    consider_partial_seasoning: np.ndarray,
+    b: np.ndarray,
+    d: np.ndarray,
+) -> np.ndarray:
+    """Table 2.5, AS1720.1:2010"""
+    partial = ~np.asarray(seasoned, dtype=bool) & np.asarray(
+        consider_partial_seasoning, dtype=bool
+    )
+    least_dim = np.minimum(b, d)
+    k_4 = np.select(
+        [least_dim <= 38, least_dim <= 50, least_dim <= 75, least_dim > 100],
+        [1.15, 1.10, 1.05, 1.00],
+        default=np.nan,
+    )
+    undefined = partial & np.isnan(k_4)
+    if np.any(undefined):
+        raise NotImplementedError(
+            f"{np.asarray(d)[undefined]} not defined for k_4 partial seasoning factor"
+        )
+    return np.where(partial, k_4, 1.0)
+
+
+def k_6_lookup(seasoned: np.ndarray, high_temp_latitude: np.ndarray) -> np.ndarray:
+    """Clause 2.4.3, AS1720.1:2010"""
+    return np.where(
+        np.asarray(seasoned, dtype=bool) & np.asarray(high_temp_latitude, dtype=bool),
+        0.9,
+        1.0,
+    )
+
+
+def k_9_lookup(
+    n_com: np.ndarray, n_mem: np.ndarray, s: np.ndarray, L: np.ndarray
+) -> np.ndarray:
+    """Clause 2.4.5.3, AS1720.1:2010"""
+    g_31 = g3_lookup(n_com)
+    g_32 = g3_lookup(np.asarray(n_com) * np.asarray(n_mem))
+    return np.maximum(g_31 + (g_32 - g_31) * (1 - (2 * np.asarray(s) / L)), 1)
+
+
+def round_sig_figs(val: np.ndarray, sig_figs: int) -> np.ndarray:
+    """Round array values to a number of significant figures, leaving zero and nan values
+    unchanged."""
+    val = np.asarray(val, dtype=float)
+    with np.errstate(divide="ignore"):
+        mag = np.floor(np.log10(np.abs(val)))
+    digits = np.where(np.isfinite(mag), sig_figs - 1 - mag, 0).astype(int)
+    return np.where(np.isfinite(val) & (val != 0), round_decimals(val, digits), val)
+
+
+def round_decimals(val: np.ndarray, digits: np.ndarray | int) -> np.ndarray:
+    """Round array values to a number of decimal digits (may be negative). Matches the
+    rounding of round() used by the member classes, including values at a rounding tie."""
+    val, digits = np.broadcast_arrays(np.asarray(val, dtype=float), np.asarray(digits))
+    scale = 10.0 ** np.abs(digits)
+    with np.errstate(invalid="ignore"):
+        scaled = np.where(digits >= 0, val * scale, val / scale)
+        rounded = np.round(scaled)
+        rounded = np.where(digits >= 0, rounded / scale, rounded * scale)
+        # ties in the scaled value may be rounded differently by round(), which uses the
+        # exact binary value - evaluate these few entries individually
+        ties = np.flatnonzero(np.abs(scaled - np.floor(scaled)) == 0.5)
+    for i in ties:
+        rounded.flat[i] = round(float(val.flat[i]), int(digits.flat[i]))
+    return rounded
+
+
+def _axis_value(value, axis: str, name: str, default=None, required: bool = True):
+    """Returns the axis value of a float | dict | None member input (e.g. g_13, L_a). A dict
+    without the axis key raises a KeyError if required, and gives the default otherwise."""
+    if value is None or isinstance(value, float | int):
+        return default if value is None else value
+    if axis in value:
+        return default if value[axis] is None else value[axis]
+    if not required:
+        return default
+    raise KeyError(f"{name} not defined for {axis}-axis")
+
+
+@dataclass(kw_only=True)
+class MemberBatch:
+    """Vectorised design capacities for a batch of rectangular board or glulam members. Each
+    attribute is an array (or scalar) broadcast to a common shape, so a batch may be a flat list
+    of members or an N-dimensional grid of parameters. Capacities are calculated with the same
+    formulas as BoardMember and GlulamMember.
+
+    Attributes:
+        b (np.ndarray): Breadth of a single board in the section.
+        d (np.ndarray): Depth of the section.
+        n (np.ndarray): Number of boards in the section.
+        A_t (np.ndarray): Section tensile area.
+        A_c (np.ndarray): Section compressive area.
+        I_x (np.ndarray): Section moment of inertia about the x-axis.
+        I_y (np.ndarray): Section moment of inertia about the y-axis.
+        f_b, f_t, f_s, f_c (np.ndarray): Material characteristic strengths.
+        E (np.ndarray): Material modulus of elasticity.
+        seasoned (np.ndarray): Boolean array of material seasoning.
+        phi (np.ndarray): Capacity factor for the member application category.
+        L (np.ndarray): Member length.
+        L_ax, L_ay (np.ndarray): Lateral restraint spacing, x- and y-axis buckling.
+        L_a_phi (np.ndarray): Torsional restraint spacing, nan if not provided.
+        g_13_x, g_13_y (np.ndarray): Effective length factors, x- and y-axis buckling.
+        k_1 (np.ndarray): Load duration factor.
+        r (np.ndarray): Ratio of temporary to total design action effect.
+        restraint_edge (np.ndarray): RestraintEdge string values.
+        k_4, k_6, k_9 (np.ndarray): Modification factors.
+        sig_figs (int, optional): Number of significant figures to round capacities to.
+        Defaults to 4.
+    """
+
+    b: np.ndarray
+    d: np.ndarray
+    n: np.ndarray = 1
+    A_t: np.ndarray
+    A_c: np.ndarray
+    I_x: np.ndarray
+    I_y: np.ndarray
+
+    f_b: np.ndarray
+    f_t: np.ndarray
+    f_s: np.ndarray
+    f_c: np.ndarray
+    E: np.ndarray
+    seasoned: np.ndarray = True
+    phi: np.ndarray
+
+    L: np.ndarray
+    L_ax: np.ndarray
+    L_ay: np.ndarray
+    L_a_phi: np.ndarray = np.nan
+    g_13_x: np.ndarray = 1.0
+    g_13_y: np.ndarray = 1.0
+    k_1: np.ndarray = 1.0
+    r: np.ndarray = 0.25
+    restraint_edge: np.ndarray = RestraintEdge.TENSION.value
+
+    k_4: np.ndarray = 1.0
+    k_6: np.ndarray = 1.0
+    k_9: np.ndarray = 1.0
+
+    N_dt: np.ndarray = field(init=False, repr=False)
+    N_dcx: np.ndarray = field(init=False, repr=False)
+    N_dcy: np.ndarray = field(init=False, repr=False)
+    N_dc: np.ndarray = field(init=False, repr=False)
+    M_d: np.ndarray = field(init=False, repr=False)
+    V_d: np.ndarray = field(init=False, repr=False)
+
+    sig_figs: int = field(repr=False, default=4)
+
+    def __post_init__(self):
+        names = self.input_names()
+        values = [np.asarray(getattr(self, name)) for name in names]
+        for name, val in zip(names, np.broadcast_arrays(*values)):
+            if name == "restraint_edge":
+                val = val.astype(str)
+            elif name == "seasoned":
+                val = val.astype(bool)
+            else:
+                val = val.astype(float)
+            setattr(self, name, val)
+        unknown = ~np.isin(self.restraint_edge, [e.value for e in RestraintEdge])
+        if np.any(unknown):
+            raise ValueError(
+                f"restraint_edge {np.unique(self.restraint_edge[unknown])} not recognised"
+            )
+        self.solve_capacities()
+
+    @classmethod
+    def input_names(cls) -> list[str]:
+        """Names of the batch input attributes."""
+        return [f.name for f in fields(cls) if f.init and f.name != "sig_figs"]
+
+    @property
+    def shape(self) -> tuple:
+        """Broadcast shape of the batch."""
+        return self.d.shape
+
+    def __len__(self) -> int:
+        return self.d.size
+
+    def with_cases(self, **inputs) -> MemberBatch:
+        """Returns a new MemberBatch with a trailing axis added to each input array, broadcast
+        against the given inputs. Used to evaluate members for several load cases at once, e.g.
+        batch.with_cases(k_1=k_1_per_case, r=r_per_member_and_case) gives capacities with
+        shape batch.shape + (n_cases,).
+
+        Args:
+            inputs: Input attribute values which replace the existing values.
+
+        Returns:
+            MemberBatch: The member batch object.
+        """
+        values = {name: getattr(self, name)[..., np.newaxis] for name in self.input_names()}
+        values.update(inputs)
+        return MemberBatch(**values, sig_figs=self.sig_figs)
+
+    def solve_capacities(self):
+        """Calculate tension, compression, bending and shear design capacities."""
+        self.N_dt = self._round(self._N_dt())
+        self.N_dcx = self._N_dcx()
+        self.N_dcy = self._N_dcy()
+        self.N_dc = self._round(np.minimum(self.N_dcx, self.N_dcy))
+        self.N_dcx = self._round(self.N_dcx)
+        self.N_dcy = self._round(self.N_dcy)
+        self.M_d = self._round(self._M_d())
+        self.V_d = self._round(self._V_d())
+
+    def results(self) -> dict[str, np.ndarray]:
+        """Returns a dictionary of design capacity arrays."""
+        return {name: getattr(self, name) for name in CAPACITY_NAMES}
+
+    def _round(self, val: np.ndarray) -> np.ndarray:
+        if self.sig_figs:
+            return round_sig_figs(val, self.sig_figs)
+        return val
+
+    @property
+    def _k_common(self) -> np.ndarray:
+        return self.phi * self.k_1 * self.k_4 * self.k_6
+
+    def _N_dcx(self) -> np.ndarray:
+        """Clause 3.3.1.1, AS1720.1:2010"""
+        return self._k_common * self.k_12_x * self.f_c * self.A_c / 1000
+
+    def _N_dcy(self) -> np.ndarray:
+        """Clause 3.3.1.1, AS1720.1:2010"""
+        return self._k_common * self.k_12_y * self.f_c * self.A_c / 1000
+
+    def _N_dt(self) -> np.ndarray:
+        """Clause 3.4.1, AS1720.1:2010"""
+        return self._k_common * self.f_t * self.A_t / 1000
+
+    def _M_d(self) -> np.ndarray:
+        """Clause 3.2.1.1, AS1720.1:2010"""
+        return self._k_common * self.k_9 * self.k_12_bend * self.f_b * self.Z_x / 1e6
+
+    def _V_d(self) -> np.ndarray:
+        """flexural shear strength Cl 3.2.5"""
+        return self._k_common * self.f_s * self.A_s / 1e3
+
+    @property
+    def b_tot(self) -> np.ndarray:
+        """total width of section containing one or multiple boards, b_tot = n x b"""
+        return self.n * self.b
+
+    @property
+    def Z_x(self) -> np.ndarray:
+        """Section modulus about x-axis."""
+        return self.b_tot * self.d**2 / 6
+
+    @property
+    def A_s(self) -> np.ndarray:
+        """shear plane area 3.2.5"""
+        return 2 / 3 * self.d * self.b_tot
+
+    @property
+    def rho_c(self) -> np.ndarray:
+        """Section E2, AS1720.1:2010"""
+        r = np.where(self.r > 0, self.r, 0.25)
+        return np.where(
+            self.seasoned,
+            11.39 * (self.E / self.f_c) ** (-0.408) * r ** (-0.074),
+            9.29 * (self.E / self.f_c) ** (-0.367) * r ** (-0.146),
+        )
+
+    @property
+    def rho_b(self) -> np.ndarray:
+        """Section E2, AS1720.1:2010"""
+        r = np.where(self.r > 0, self.r, 0.25)
+        return np.where(
+            self.seasoned,
+            14.71 * (self.E / self.f_b) ** (-0.480) * r ** (-0.061),
+            11.63 * (self.E / self.f_b) ** (-0.435) * r ** (-0.110),
+        )
+
+    @property
+    def S1(self) -> np.ndarray:
+        """Slenderness coefficient for lateral buckling under bending, major axis.
+        Clause 3.2.3, AS1720.1:2010."""
+        edge = self.restraint_edge
+        compression = (edge == RestraintEdge.COMPRESSION.value) | (
+            edge == RestraintEdge.BOTH.value
+        )
+        tension = edge == RestraintEdge.TENSION.value
+        torsional = edge == RestraintEdge.TENSION_AND_TORSIONAL.value
+        clr = self.CLR
+        if np.any(torsional & ~clr):
+            raise ValueError(
+                "restraint_edge error - discrete (non-continuous) tension edge"
+                "restraint defined with torsional restraint - no formula for S1"
+            )
+        if np.any(torsional & clr & np.isnan(self.L_a_phi)):
+            raise KeyError(
+                "no torsional restraint distance L_a_phi provided for tension_and_torsional "
+                "restraint_edge"
+            )
+        d_on_b = self.d / self.b
+        with np.errstate(divide="ignore", invalid="ignore"):
+            torsional_bot = ((math.pi * self.d / self.L_a_phi) ** 2 + 0.4) ** 0.5
+            val = np.select(
+                [
+                    clr & compression,
+                    clr & tension,
+                    clr & torsional,
+                    ~clr & compression,
+                    ~clr & tension,
+                ],
+                [
+                    0.0,  # Cl 3.2.3.2(b)
+                    2.25 * d_on_b,  # Eq 3.2(7)
+                    1.5 * d_on_b / torsional_bot,  # Eq 3.2(8)
+                    1.25 * d_on_b * (self.L_ay / self.d) ** 0.5,  # Eq 3.2(4)
+                    d_on_b**1.35 * (self.L_ay / self.d) ** 0.25,  # Eq 3.2(5)
+                ],
+            )
+        return round_decimals(val, 2)
+
+    @property
+    def S2(self) -> np.ndarray:
+        """Slenderness coefficient for lateral buckling under bending, minor axis.
+        Clause 3.2.3(c), AS1720.1:2010."""
+        return np.zeros(self.shape)
+
+    @property
+    def S3(self) -> np.ndarray:
+        """Slenderness coefficient for buckling about x axis in rectangular sections.
+        Clause 3.3.2.2(a), AS1720.1:2010."""
+        return round_decimals(self.g_13_x * self.L / self.d, 2)
+
+    @property
+    def S4(self) -> np.ndarray:
+        """Clause 3.3.2.2(b), AS1720.1:2010"""
+        return round_decimals(
+            np.minimum(self.L_ay / self.b, self.g_13_y * self.L / self.b), 2
+        )
+
+    @property
+    def L_CLR(self) -> np.ndarray:
+        """Eq 3.2(6), AS1720.1:2010"""
+        return 64 / self.d * (self.b / self.rho_b) ** 2
+
+    @property
+    def CLR(self) -> np.ndarray:
+        """True where lateral restraint is continuous, Clause 3.2.3.2"""
+        return self.L_ay <= self.L_CLR
+
+    @property
+    def k_12_x(self) -> np.ndarray:
+        """Clause 3.3.3, AS1720.1:2010."""
+        return calc_k12(self.rho_c * self.S3)
+
+    @property
+    def k_12_y(self) -> np.ndarray:
+        """Clause 3.3.3, AS1720.1:2010."""
+        return calc_k12(self.rho_c * self.S4)
+
+    @property
+    def k_12_c(self) -> np.ndarray:
+        """Minimum of k_12_x and k_12_y. Clause 3.3.3, AS1720.1:2010."""
+        return np.minimum(self.k_12_x, self.k_12_y)
+
+    @property
+    def k_12_bend(self) -> np.ndarray:
+        """Clause 3.2.4, AS1720.1:2010. Equal to 1.0 where the x axis is the minor axis."""
+        return np.where(self.I_x < self.I_y, 1.0, calc_k12(self.rho_b * self.S1))
+
+    @classmethod
+    def from_members(cls, members: list[TimberMember], sig_figs: int = 4) -> MemberBatch:
+        """Creates a MemberBatch from a list of BoardMember or GlulamMember objects.
+
+        Args:
+            members: Member objects to collect input attributes from.
+            sig_figs: Number of significant figures to round capacities to.
+
+        Returns:
+            MemberBatch: The member batch object.
+        """
+        cols = {name: [] for name in cls.input_names()}
+        for mem in members:
+            sec, mat = mem.sec, mem.mat
+            try:
+                l_a_phi = mem.L_a_phi
+            except KeyError:
+                l_a_phi = np.nan
+            row = {
+                "b": sec.b,
+                "d": sec.d,
+                "n": sec.n,
+                "A_t": sec.A_t,
+                "A_c": sec.A_c,
+                "I_x": sec.I_x,
+                "I_y": sec.I_y,
+                "f_b": mat.f_b,
+                "f_t": mat.f_t,
+                "f_s": mat.f_s,
+                "f_c": mat.f_c,
+                "E": mat.E,
+                "seasoned": mat.seasoned,
+                "phi": mem.phi,
+                "L": mem.L,
+                # x-axis restraint is not used by the capacities, and may be undefined
+                "L_ax": mem.L if mem.inputs.L_ax is None else mem.inputs.L_ax,
+                "L_ay": mem.L_ay,
+                "L_a_phi": l_a_phi,
+                "g_13_x": mem.g_13_x,
+                "g_13_y": mem.g_13_y,
+                "k_1": mem.k_1,
+                "r": mem.r,
+                "restraint_edge": RestraintEdge(mem.restraint_edge).value,
+                "k_4": mem.k_4,
+                "k_6": mem.k_6,
+                "k_9": mem.k_9,
+            }
+            for name, val in row.items():
+                cols[name].append(val)
+        return cls(**{k: np.array(v) for k, v in cols.items()}, sig_figs=sig_figs)
+
+    @classmethod
+    def from_records(
+        cls,
+        records: list[dict],
+        section_library: pd.DataFrame | None = None,
+        material_library: pd.DataFrame | None = None,
+        sig_figs: int = 4,
+        sized_materials: SizedMaterialCache | None = None,
+    ) -> MemberBatch:
+        """Creates a MemberBatch from a list of member input dictionaries, without creating
+        member objects. Each record contains:
+
+        - 'sec': section library name, or dictionary of TimberSection attributes;
+        - 'mat': material library name, or dictionary of TimberMaterial attributes;
+        - optional 'member_type': 'board' (default) or 'glulam';
+        - optional 'update_from_section_size': if True, material properties are updated
+          from section size, with materials shared through a SizedMaterialCache;
+        - optional TimberMember attributes (application_cat, high_temp_latitude,
+          consider_partial_seasoning, L, L_a, g_13, k_1, r, restraint_edge) and
+          BoardMember k_9 parameters (n_mem, s), with the same defaults as the member classes.
+
+        Sections and materials are looked up once per unique name.
+
+        Args:
+            records: Member input dictionaries.
+            section_library: DataFrame of sections, defaults to import_section_library().
+            material_library: DataFrame of materials, defaults to import_material_library().
+            sig_figs: Number of significant figures to round capacities to.
+            sized_materials: Optional SizedMaterialCache of the material library, to share
+                size-adjusted materials across calls. Defaults to SIZED_MATERIALS for the
+                default library, or a new cache for a given library.
+
+        Returns:
+            MemberBatch: The member batch object.
+        """
+        if section_library is None:
+            section_library = import_section_library()
+        if sized_materials is not None:
+            material_library = sized_materials.library
+        elif material_library is None:
+            sized_materials = SIZED_MATERIALS
+            material_library = sized_materials.library
+        else:
+            sized_materials = SizedMaterialCache(library=material_library)
+        sections: dict = {}
+        materials: dict = {}
+        cols = {name: [] for name in cls.input_names()}
+        partial, high_temp, n_mem, s = [], [], [], []
+        for rec in records:
+            sec = _lookup(rec["sec"], TimberSection, sections, section_library)
+            mat = _lookup(rec["mat"], TimberMaterial, materials, material_library)
+            if rec.get("update_from_section_size", False):
+                mat = sized_materials.get(
+                    rec["mat"] if isinstance(rec["mat"], str) else mat, sec.d, sec.b
+                )
+            member_type = rec.get("member_type", "board")
+            if member_type not in MEMBER_TYPES:
+                raise ValueError(f"member_type {member_type} not recognised")
+
+            L = rec.get("L", 1)
+            L_a = rec.get("L_a", None)
+            g_13 = rec.get("g_13", 1)
+            row = {
+                "b": sec.b,
+                "d": sec.d,
+                "n": sec.n,
+                "A_t": sec.A_t,
+                "A_c": sec.A_c,
+                "I_x": sec.I_x,
+                "I_y": sec.I_y,
+                "f_b": mat.f_b,
+                "f_t": mat.f_t,
+                "f_s": mat.f_s,
+                "f_c": mat.f_c,
+                "E": mat.E,
+                "seasoned": mat.seasoned,
+                "phi": mat.phi(rec.get("application_cat", 1)),
+                "L": L,
+                "L_ax": _axis_value(L_a, "x", "lateral restraint L_a", L, required=False),
+                "L_ay": _axis_value(L_a, "y", "lateral restraint L_a", L),
+                "L_a_phi": L_a.get("phi", np.nan) if isinstance(L_a, dict) else np.nan,
+                "g_13_x": _axis_value(g_13, "x", "effective length factor g_13"),
+                "g_13_y": _axis_value(g_13, "y", "effective length factor g_13"),
+                "k_1": rec.get("k_1", 1.0),
+                "r": rec.get("r", 0.25),
+                "restraint_edge": RestraintEdge(
+                    rec.get("restraint_edge", RestraintEdge.TENSION)
+                ).value,
+                "k_4": 1.0,
+                "k_6": 1.0,
+                "k_9": 1.0 if member_type == "glulam" else np.nan,
+            }
+            for name, val in row.items():
+                cols[name].append(val)
+            partial.append(rec.get("consider_partial_seasoning", False))
+            high_temp.append(rec.get("high_temp_latitude", False))
+            n_mem.append(rec.get("n_mem", 1))
+            s.append(rec.get("s", 0))
+
+        arrs = {k: np.array(v) for k, v in cols.items()}
+        arrs["k_4"] = k_4_lookup(arrs["seasoned"], np.array(partial), arrs["b"], arrs["d"])
+        arrs["k_6"] = k_6_lookup(arrs["seasoned"], np.array(high_temp))
+        n_com = np.where(arrs["n"] > 1, arrs["n"], 1)
+        arrs["k_9"] = np.where(
+            np.isnan(arrs["k_9"]),
+            k_9_lookup(n_com, np.array(n_mem), np.array(s, dtype=float), arrs["L"]),
+            arrs["k_9"],
+        )
+        return cls(**arrs, sig_figs=sig_figs)
+
+
+def _lookup(value: str | dict, cls: type, cache: dict, library: pd.DataFrame):
+    """Returns a TimberSection or TimberMaterial from a library name (cached) or from a
+    dictionary of attributes."""
+    if not isinstance(value, str):
+        return cls.from_dict(value)
+    if value not in cache:
+        if not (library["name"] == value).any():
+            raise KeyError(f"{value} not found in {cls.__name__} library")
+        cache[value] = cls.from_library(value, library)
+    return cache[value]
@@ -0,0 +1,275 @@
+"""
+This module provides bulk generation of synthetic rectangular candidate sections for sizing
+searches, e.g. custom glulam depths in lamination increments, as an alternative to the rows of
+the section library. Candidates over ranges of depth d, board breadth b and number of boards n
+are generated lazily in blocks, with the section properties (A_g, A_t, A_c, I_x, I_y, Z_x, A_s,
+b_tot) calculated as arrays, without creating TimberSection objects. Properties are rounded to
+significant figures as by TimberSection.solve_shape(), so capacities match those of the
+equivalent TimberSection.
+
+Classes:
+    SectionCandidates: Struct-of-arrays of single board and multi board sections.
+
+Functions:
+    lamination_depths(): Glulam depths in lamination increments.
+
+    generate_sections(): Lazily generates candidate sections over ranges of d, b and n.
+
+    candidate_batch(): MemberBatch of candidate sections for one material.
+"""
+from __future__ import annotations
+
+from dataclasses import dataclass, field
+from typing import Iterator
+
+import numpy as np
+import pandas as pd
+
+from timberas.batch import (
+    MemberBatch,
+    _axis_value,
+    k_4_lookup,
+    k_6_lookup,
+    k_9_lookup,
+    round_sig_figs,
+)
+from timberas.geometry import ShapeType
+from timberas.material import TimberMaterial
+from timberas.member import RestraintEdge
+
+CANDIDATE_BLOCK_SIZE = 4096
+# lamination thickness of glulam sections (mm)
+LAMINATION_THICKNESS = 45
+
+
+def lamination_depths(
+    n_min: int, n_max: int, t: float = LAMINATION_THICKNESS
+) -> np.ndarray:
+    """Glulam section depths from n_min to n_max laminations of thickness t.
+
+    Args:
+        n_min: Least number of laminations.
+        n_max: Greatest number of laminations.
+        t: Lamination thickness (mm).
+
+    Returns:
+        np.ndarray: Section depths (mm).
+    """
+    if n_min < 1 or n_max < n_min:
+        raise ValueError(f"lamination range {n_min} to {n_max} not valid")
+    return np.arange(n_min, n_max + 1) * t
+
+
+@dataclass
+class SectionCandidates:
+    """Struct-of-arrays of rectangular single board (n = 1) and multi board sections, with the
+    section properties of TimberSection as arrays.
+
+    Attributes:
+        b (np.ndarray): Breadth of a single board.
+        d (np.ndarray): Depth of the section.
+        n (np.ndarray): Number of boards in the section.
+        prefix (str): Prefix of section names, e.g. 'GL'.
+        sig_figs (int, optional): Number of significant figures to round section properties to.
+        Defaults to 4.
+    """
+
+    b: np.ndarray
+    d: np.ndarray
+    n: np.ndarray = 1
+    prefix: str = ""
+    sig_figs: int = field(repr=False, default=4)
+
+    def __post_init__(self):
+        b, d, n = np.broadcast_arrays(
+            np.asarray(self.b, dtype=float),
+            np.asarray(self.d, dtype=float),
+            np.asarray(self.n),
+        )
+        if np.any(n < 1) or np.any(b <= 0) or np.any(d <= 0):
+            raise ValueError("candidate sections must have b > 0, d > 0 and n >= 1")
+        self.b, self.d, self.n = self._round(b), self._round(d), n.astype(int)
+        # gross area and moments of inertia, RectangleShape
+        b_tot = self.b_tot
+        self.A_g = self._round(self.d * b_tot)
+        self.I_x = self._round(b_tot * self.d**3 / 12)
+        self.I_y = self._round(self.d * b_tot**3 / 12)
+
+    def _round(self, val: np.ndarray) -> np.ndarray:
+        if self.sig_figs:
+            return round_sig_figs(val, self.sig_figs)
+        return val
+
+    def __len__(self) -> int:
+        return self.d.size
+
+    @property
+    def shape_type(self) -> np.ndarray:
+        """ShapeType string values."""
+        return np.where(
+            self.n > 1, ShapeType.MULTI_BOARD.value, ShapeType.SINGLE_BOARD.value
+        )
+
+    @property
+    def name(self) -> np.ndarray:
+        """Section names in the section library format, e.g. 90x35 and 2/90x35."""
+        return np.array(
+            [
+                f"{self.prefix}{n}/{d:g}x{b:g}" if n > 1 else f"{self.prefix}{d:g}x{b:g}"
+                for n, d, b in zip(self.n.ravel(), self.d.ravel(), self.b.ravel())
+            ]
+        ).reshape(self.d.shape)
+
+    @property
+    def A_t(self) -> np.ndarray:
+        """Tensile area, the gross area."""
+        return self.A_g
+
+    @property
+    def A_c(self) -> np.ndarray:
+        """Compressive area, the gross area."""
+        return self.A_g
+
+    @property
+    def b_tot(self) -> np.ndarray:
+        """total width of section containing one or multiple boards, b_tot = n x b"""
+        return self.n * self.b
+
+    @property
+    def Z_x(self) -> np.ndarray:
+        """Section modulus about x-axis."""
+        return self.b_tot * self.d**2 / 6
+
+    @property
+    def A_s(self) -> np.ndarray:
+        """shear plane area 3.2.5"""
+        return 2 / 3 * self.d * self.b_tot
+
+    def section_inputs(self) -> dict[str, np.ndarray]:
+        """Section input arrays of MemberBatch: b, d, n, A_t, A_c, I_x and I_y."""
+        return {
+            "b": self.b,
+            "d": self.d,
+            "n": self.n,
+            "A_t": self.A_t,
+            "A_c": self.A_c,
+            "I_x": self.I_x,
+            "I_y": self.I_y,
+        }
+
+    def to_frame(self) -> pd.DataFrame:
+        """DataFrame of sections in the section library format, with section properties."""
+        return pd.DataFrame(
+            {
+                "name": self.name.ravel(),
+                "shape_type": self.shape_type.ravel(),
+                "n": self.n.ravel(),
+                "d": self.d.ravel(),
+                "b": self.b.ravel(),
+                "A_g": self.A_g.ravel(),
+                "I_x": self.I_x.ravel(),
+                "I_y": self.I_y.ravel(),
+            }
+        )
+
+
+def generate_sections(
+    d: np.ndarray,
+    b: np.ndarray,
+    n: np.ndarray = 1,
+    block_size: int = CANDIDATE_BLOCK_SIZE,
+    prefix: str = "",
+    sig_figs: int = 4,
+) -> Iterator[SectionCandidates]:
+    """Lazily generates candidate sections for every combination of d, b and n, in blocks of
+    at most block_size sections, with n varying fastest and d slowest. Only the indices of a
+    block are expanded, so large ranges are not held in memory.
+
+    Example:
+        for block in generate_sections(lamination_depths(4, 30), [65, 85, 135]):
+            batch = candidate_batch(block, gl12, L=9000, L_a=1800, member_type="glulam")
+
+    Args:
+        d: Section depths.
+        b: Board breadths.
+        n: Numbers of boards.
+        block_size: Largest number of sections in a block.
+        prefix: Prefix of section names, e.g. 'GL'.
+        sig_figs: Number of significant figures to round section properties to.
+
+    Yields:
+        SectionCandidates: The next block of candidate sections.
+    """
+    axes = [np.atleast_1d(np.asarray(val)).ravel() for val in (d, b, n)]
+    shape = tuple(len(axis) for axis in axes)
+    total = int(np.prod(shape))
+    for start in range(0, total, block_size):
+        d_i, b_i, n_i = np.unravel_index(np.arange(start, min(start + block_size, total)), shape)
+        yield SectionCandidates(
+            b=axes[1][b_i], d=axes[0][d_i], n=axes[2][n_i], prefix=prefix, sig_figs=sig_figs
+        )
+
+
+def candidate_batch(
+    sections: SectionCandidates,
+    mat: TimberMaterial,
+    member_type: str = "board",
+    application_cat: int = 1,
+    high_temp_latitude: bool = False,
+    consider_partial_seasoning: bool = False,
+    L: float = 1,
+    L_a: float | dict | None = None,
+    g_13: float | dict = 1,
+    k_1: float = 1.0,
+    r: float = 0.25,
+    restraint_edge: RestraintEdge | str = RestraintEdge.TENSION,
+    n_mem: int = 1,
+    s: float = 0,
+    sig_figs: int = 4,
+) -> MemberBatch:
+    """MemberBatch of candidate sections for one material and set of member inputs, with the
+    same defaults as MemberBatch.from_records(). Material properties are used as given, not
+    updated from section size.
+
+    Args:
+        sections: Candidate sections.
+        mat: Material of every candidate.
+        member_type: 'board' or 'glulam' (k_9 = 1).
+        application_cat, high_temp_latitude, consider_partial_seasoning, L, L_a, g_13, k_1, r,
+            restraint_edge: Member inputs, see TimberMember.
+        n_mem, s: BoardMember k_9 parameters.
+        sig_figs: Number of significant figures to round capacities to.
+
+    Returns:
+        MemberBatch: The member batch object, one element per candidate.
+    """
+    if member_type not in ("board", "glulam"):
+        raise ValueError(f"member_type {member_type} not recognised")
+    seasoned = np.full(sections.d.shape, bool(mat.seasoned))
+    if member_type == "glulam":
+        k_9 = 1.0
+    else:
+        k_9 = k_9_lookup(np.where(sections.n > 1, sections.n, 1), n_mem, s, L)
+    return MemberBatch(
+        **sections.section_inputs(),
+        f_b=mat.f_b,
+        f_t=mat.f_t,
+        f_s=mat.f_s,
+        f_c=mat.f_c,
+        E=mat.E,
+        seasoned=seasoned,
+        phi=mat.phi(application_cat),
+        L=L,
+        L_ax=_axis_value(L_a, "x", "lateral restraint L_a", L, required=False),
+        L_ay=_axis_value(L_a, "y", "lateral restraint L_a", L),
+        L_a_phi=L_a.get("phi", np.nan) if isinstance(L_a, dict) else np.nan,
+        g_13_x=_axis_value(g_13, "x", "effective length factor g_13"),
+        g_13_y=_axis_value(g_13, "y", "effective length factor g_13"),
+        k_1=k_1,
+        r=r,
+        restraint_edge=RestraintEdge(restraint_edge).value,
+        k_4=k_4_lookup(seasoned, consider_partial_seasoning, sections.b, sections.d),
+        k_6=k_6_lookup(seasoned, high_temp_latitude),
+        k_9=k_9,
+        sig_figs=sig_figs,
+    )
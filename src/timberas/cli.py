@@ -0,0 +1,359 @@
+"""
+This module provides the timberas command line interface.
+
+Commands:
+    timberas check SCHEDULE -o OUTPUT_DIR [--jobs N] [--chunk-size N]
+        Runs a member schedule file (CSV) through capacity and utilisation checks. Results are
+        written to OUTPUT_DIR in chunks (part-NNNNNN.csv) and progress is checkpointed to
+        OUTPUT_DIR/checkpoint.json, so a stopped run resumes from the last completed chunk
+        when the same command is repeated.
+
+    timberas serve [--host HOST] [--port PORT]
+        Runs a design-check server, see timberas.service.
+
+Schedule files contain one member per row, with columns:
+    sec, mat: section and material library names (required).
+    id, member_type, application_cat, high_temp_latitude, consider_partial_seasoning,
+    update_from_section_size, L, k_1, r, restraint_edge, n_mem, s: optional member inputs, see
+    MemberBatch.from_records().
+    L_a, g_13: optional values for both axes, or L_ax, L_ay, L_a_phi, g_13_x, g_13_y for
+    individual axes.
+    N_star_t, N_star_c, M_star, V_star: optional design actions (kN, kNm) for utilisation.
+
+Functions:
+    schedule_records(): Converts a schedule DataFrame to MemberBatch records.
+
+    check_schedule(): Evaluates capacities and utilisations for a schedule DataFrame.
+
+    run_check(): Runs a chunked, checkpointed schedule check.
+
+    main(): Command line entry point.
+"""
+from __future__ import annotations
+
+import argparse
+import hashlib
+import json
+import math
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor, FIRST_COMPLETED, wait
+
+import numpy as np
+import pandas as pd
+
+from timberas.batch import MemberBatch, CAPACITY_NAMES
+from timberas.geometry import import_section_library
+from timberas.material import import_material_library
+
+# design action column: capacity checked against
+ACTION_CAPACITIES = {
+    "N_star_t": "N_dt",
+    "N_star_c": "N_dc",
+    "M_star": "M_d",
+    "V_star": "V_d",
+}
+
+RECORD_KEYS = [
+    "sec",
+    "mat",
+    "member_type",
+    "application_cat",
+    "high_temp_latitude",
+    "consider_partial_seasoning",
+    "update_from_section_size",
+    "L",
+    "k_1",
+    "r",
+    "restraint_edge",
+    "n_mem",
+    "s",
+]
+
+# per-axis schedule columns for member inputs L_a and g_13
+AXIS_COLUMNS = {
+    "L_a": {"x": "L_ax", "y": "L_ay", "phi": "L_a_phi"},
+    "g_13": {"x": "g_13_x", "y": "g_13_y"},
+}
+
+CHECKPOINT_FILE = "checkpoint.json"
+
+_LIBRARIES: dict = {}
+
+
+def schedule_records(schedule: pd.DataFrame) -> list[dict]:
+    """Converts a schedule DataFrame to a list of MemberBatch.from_records() records. Empty
+    cells are treated as not provided.
+
+    Args:
+        schedule: Member schedule, see module documentation for column names.
+
+    Returns:
+        list[dict]: Member input records.
+    """
+    records = []
+    for row in schedule.to_dict(orient="records"):
+        row = {k: v for k, v in row.items() if not _is_missing(v)}
+        rec = {k: _python_value(row[k]) for k in RECORD_KEYS if k in row}
+        for name, axis_columns in AXIS_COLUMNS.items():
+            axes = {axis: row[col] for axis, col in axis_columns.items() if col in row}
+            if axes:
+                # axes without a value use the L_a or g_13 column value, or member default
+                default = row.get(name, 1 if name == "g_13" else None)
+                rec[name] = {"x": default, "y": default} | axes
+            elif name in row:
+                rec[name] = row[name]
+        records.append(rec)
+    return records
+
+
+def _is_missing(val) -> bool:
+    return val is None or (isinstance(val, float) and math.isnan(val))
+
+
+def _python_value(val):
+    return val.item() if isinstance(val, np.generic) else val
+
+
+def check_schedule(
+    schedule: pd.DataFrame,
+    section_library: pd.DataFrame | None = None,
+    material_library: pd.DataFrame | None = None,
+) -> pd.DataFrame:
+    """Evaluates design capacities and utilisations (design action / capacity) for a schedule
+    of members. The schedule is evaluated as one MemberBatch, if that fails rows are evaluated
+    individually and the reason for failed rows is reported in an 'error' column.
+
+    Args:
+        schedule: Member schedule, see module documentation for column names.
+        section_library: DataFrame of sections, defaults to import_section_library().
+        material_library: DataFrame of materials, defaults to import_material_library().
+
+    Returns:
+        pd.DataFrame: The schedule with added capacity, utilisation ('util_' prefix),
+        'util_max', 'passed', and 'error' columns.
+    """
+    records = schedule_records(schedule)
+    results = pd.DataFrame(index=schedule.index, columns=CAPACITY_NAMES, dtype=float)
+    errors = pd.Series("", index=schedule.index)
+    try:
+        batch = MemberBatch.from_records(records, section_library, material_library)
+        for name, val in batch.results().items():
+            results[name] = val
+    except Exception:  # pylint: disable=broad-except
+        for idx, rec in zip(schedule.index, records):
+            try:
+                batch = MemberBatch.from_records([rec], section_library, material_library)
+            except Exception as err:  # pylint: disable=broad-except
+                errors[idx] = f"{type(err).__name__}: {err}"
+                continue
+            for name, val in batch.results().items():
+                results.loc[idx, name] = val[0]
+
+    out = pd.concat([schedule, results], axis=1)
+    utils = []
+    for action, capacity in ACTION_CAPACITIES.items():
+        if action in schedule:
+            util = f"util_{capacity}"
+            with np.errstate(divide="ignore", invalid="ignore"):
+                out[util] = np.abs(schedule[action].fillna(0)) / out[capacity]
+            utils.append(util)
+    if utils:
+        out["util_max"] = out[utils].max(axis=1)
+        out["passed"] = out["util_max"] <= 1.0
+    out["error"] = errors
+    return out
+
+
+def _schedule_sha256(path: str) -> str:
+    sha = hashlib.sha256()
+    with open(path, "rb") as file:
+        for block in iter(lambda: file.read(1 << 20), b""):
+            sha.update(block)
+    return sha.hexdigest()
+
+
+def _write_json(path: str, data: dict) -> None:
+    tmp_path = path + ".tmp"
+    with open(tmp_path, "w", encoding="utf-8") as file:
+        json.dump(data, file, indent=2)
+    os.replace(tmp_path, path)
+
+
+def _init_worker(section_library_path: str | None, material_library_path: str | None):
+    """Loads section and material libraries once per worker process."""
+    _LIBRARIES["section"] = (
+        import_section_library()
+        if section_library_path is None
+        else pd.read_csv(section_library_path)
+    )
+    _LIBRARIES["material"] = (
+        import_material_library()
+        if material_library_path is None
+        else pd.read_csv(material_library_path)
+    )
+
+
+def _check_chunk(index: int, chunk: pd.DataFrame, out_dir: str) -> tuple[int, int]:
+    """Checks one schedule chunk and writes its result part file."""
+    out = check_schedule(chunk, _LIBRARIES["section"], _LIBRARIES["material"])
+    path = os.path.join(out_dir, f"part-{index:06d}.csv")
+    out.to_csv(path + ".tmp", index=False)
+    os.replace(path + ".tmp", path)
+    return index, len(chunk)
+
+
+def run_check(
+    schedule_path: str,
+    out_dir: str,
+    jobs: int = 1,
+    chunk_size: int = 10000,
+    section_library_path: str | None = None,
+    material_library_path: str | None = None,
+    restart: bool = False,
+    combine: bool = True,
+) -> dict:
+    """Runs a schedule file through capacity and utilisation checks in chunks, writing one
+    part file per chunk and checkpointing completed chunks. If a checkpoint for the same
+    schedule file contents and chunk size exists in out_dir, completed chunks are skipped.
+
+    Args:
+        schedule_path: Path to the schedule CSV file.
+        out_dir: Directory for part files, the checkpoint, and combined results.
+        jobs: Number of worker processes, 1 evaluates chunks in this process.
+        chunk_size: Number of members per chunk.
+        section_library_path: Optional section library CSV, defaults to the package library.
+        material_library_path: Optional material library CSV, defaults to the package library.
+        restart: If True, ignores any existing checkpoint.
+        combine: If True, combines part files into out_dir/results.csv when complete.
+
+    Returns:
+        dict: The final checkpoint data.
+    """
+    os.makedirs(out_dir, exist_ok=True)
+    checkpoint_path = os.path.join(out_dir, CHECKPOINT_FILE)
+    checkpoint = {
+        "schedule": os.path.abspath(schedule_path),
+        "sha256": _schedule_sha256(schedule_path),
+        "chunk_size": chunk_size,
+        "completed": [],
+        "n_members": 0,
+        "complete": False,
+    }
+    if not restart and os.path.exists(checkpoint_path):
+        with open(checkpoint_path, encoding="utf-8") as file:
+            previous = json.load(file)
+        if (previous["sha256"], previous["chunk_size"]) == (
+            checkpoint["sha256"],
+            chunk_size,
+        ):
+            checkpoint = previous
+            print(f"Resuming from checkpoint, {len(checkpoint['completed'])} chunks completed")
+        else:
+            print("Schedule or chunk size changed since checkpoint, restarting")
+    completed = set(checkpoint["completed"])
+
+    n_done = 0
+    t_start = time.perf_counter()
+
+    def record(index: int, n_members: int):
+        nonlocal n_done
+        completed.add(index)
+        n_done += n_members
+        checkpoint["completed"] = sorted(completed)
+        checkpoint["n_members"] += n_members
+        _write_json(checkpoint_path, checkpoint)
+        rate = n_done / (time.perf_counter() - t_start)
+        print(
+            f"chunk {index}: {checkpoint['n_members']} members checked, "
+            f"{rate:.0f} members/s"
+        )
+
+    chunks = (
+        (i, chunk)
+        for i, chunk in enumerate(pd.read_csv(schedule_path, chunksize=chunk_size))
+        if i not in completed
+    )
+    if jobs <= 1:
+        _init_worker(section_library_path, material_library_path)
+        for i, chunk in chunks:
+            record(*_check_chunk(i, chunk, out_dir))
+    else:
+        with ProcessPoolExecutor(
+            max_workers=jobs,
+            initializer=_init_worker,
+            initargs=(section_library_path, material_library_path),
+        ) as pool:
+            pending = set()
+            for i, chunk in chunks:
+                pending.add(pool.submit(_check_chunk, i, chunk, out_dir))
+                # bound the number of chunks held in memory
+                if len(pending) >= 2 * jobs:
+                    done, pending = wait(pending, return_when=FIRST_COMPLETED)
+                    for future in done:
+                        record(*future.result())
+            for future in pending:
+                record(*future.result())
+
+    checkpoint["complete"] = True
+    _write_json(checkpoint_path, checkpoint)
+    if combine:
+        results_path = os.path.join(out_dir, "results.csv")
+        with open(results_path + ".tmp", "w", encoding="utf-8", newline="") as file:
+            for i in sorted(completed):
+                part = pd.read_csv(os.path.join(out_dir, f"part-{i:06d}.csv"))
+                part.to_csv(file, index=False, header=(i == 0))
+        os.replace(results_path + ".tmp", results_path)
+        print(f"Results written to {results_path}")
+    return checkpoint
+
+
+def main(argv: list[str] | None = None) -> None:
+    """timberas command line entry point."""
+    parser = argparse.ArgumentParser(
+        prog="timberas", description="timberas design tools for timber structures"
+    )
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    check = commands.add_parser(
+        "check", help="run a member schedule through capacity and utilisation checks"
+    )
+    check.add_argument("schedule", help="member schedule CSV file")
+    check.add_argument("-o", "--output", required=True, help="output directory")
+    check.add_argument("-j", "--jobs", type=int, default=1, help="worker processes")
+    check.add_argument("--chunk-size", type=int, default=10000, help="members per chunk")
+    check.add_argument("--section-library", help="section library CSV file")
+    check.add_argument("--material-library", help="material library CSV file")
+    check.add_argument(
+        "--restart", action="store_true", help="ignore an existing checkpoint"
+    )
+    check.add_argument(
+        "--no-combine", action="store_true", help="do not combine part files"
+    )
+
+    commands.add_parser(
+        "serve", help="run a design-check server (see timberas serve --help)", add_help=False
+    )
+
+    args, extra = parser.parse_known_args(argv)
+    if args.command == "serve":
+        from timberas.service import main as serve_main
+
+        serve_main(extra)
+        return
+    if extra:
+        parser.error(f"unrecognized arguments: {' '.join(extra)}")
+    run_check(
+        args.schedule,
+        args.output,
+        jobs=args.jobs,
+        chunk_size=args.chunk_size,
+        section_library_path=args.section_library,
+        material_library_path=args.material_library,
+        restart=args.restart,
+        combine=not args.no_combine,
+    )
+
+
+if __name__ == "__main__":
+    main()
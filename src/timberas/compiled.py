@@ -0,0 +1,47 @@
+"""
+This module provides single-pass evaluation of BoardMember and GlulamMember design capacities.
+Through the member properties, each capacity recomputes the modification factors common to
+all capacities (phi, k_1, k_4, k_6), and N_dc recomputes N_dcx and N_dcy. evaluate() finds the
+common factors once and passes them to the member formulas - calc_k12_compression(), S3, S4,
+k_9, k_12_bend and the section properties - so the results, printed notes and exceptions are
+those of the member properties, in the same order of operations.
+
+TimberMember.solve_capacities() uses evaluate() for the member types in member.COMPILED_KINDS.
+
+Functions:
+    evaluate(): Design capacities of a member, with the common factors evaluated once.
+"""
+from __future__ import annotations
+
+# capacities returned by evaluate(), in member.CAPACITIES order
+OUTPUTS = ("N_dt", "N_dcx", "N_dcy", "N_dc", "M_d", "V_d")
+COMPRESSION_OUTPUTS = frozenset(("N_dcx", "N_dcy", "N_dc"))
+
+
+def evaluate(member, inputs, names: tuple[str, ...] = OUTPUTS) -> dict[str, float]:
+    """Unrounded design capacities of a member, Clauses 3.2, 3.3 and 3.4, AS1720.1:2010.
+
+    Args:
+        member: BoardMember or GlulamMember.
+        inputs: Normalised member inputs, member.MemberInputs.
+        names: Capacities to evaluate, from OUTPUTS.
+
+    Returns:
+        dict[str, float]: Capacities by name.
+    """
+    sec, mat = member.sec, member.mat
+    k_mod = member.phi * member.k_1 * member.k_4 * member.k_6
+    values = {}
+    if "N_dt" in names:
+        values["N_dt"] = k_mod * mat.f_t * sec.A_t / 1000
+    if not COMPRESSION_OUTPUTS.isdisjoint(names):
+        k_12_x = member.calc_k12_compression(inputs.rho_c, member.S3)
+        k_12_y = member.calc_k12_compression(inputs.rho_c, member.S4)
+        values["N_dcx"] = k_mod * k_12_x * mat.f_c * sec.A_c / 1000
+        values["N_dcy"] = k_mod * k_12_y * mat.f_c * sec.A_c / 1000
+        values["N_dc"] = min(values["N_dcx"], values["N_dcy"])
+    if "M_d" in names:
+        values["M_d"] = k_mod * member.k_9 * member.k_12_bend * mat.f_b * sec.Z_x / 1e6
+    if "V_d" in names:
+        values["V_d"] = k_mod * mat.f_s * sec.A_s / 1e3
+    return values
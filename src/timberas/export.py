@@ -0,0 +1,193 @@
+"""
+This module provides columnar export of member inputs, intermediate design factors and design
+capacities. Columns are built directly from MemberBatch arrays (one value per member), and
+written to Parquet or Feather through pyarrow, an optional dependency:
+
+    pip install timberas[arrow]
+
+Functions:
+    batch_columns(): Dictionary of 1-D column arrays for a MemberBatch or list of members.
+
+    to_frame(): pandas DataFrame of member columns, without copying the column arrays.
+
+    to_arrow(): pyarrow Table of member columns.
+
+    arrow_to_frame(): pandas DataFrame from a pyarrow Table, zero-copy for numeric columns.
+
+    write_parquet(): Writes member columns to a Parquet file.
+
+    write_feather(): Writes member columns to a Feather (Arrow IPC) file.
+"""
+from __future__ import annotations
+
+import numpy as np
+import pandas as pd
+
+from timberas.batch import MemberBatch, CAPACITY_NAMES
+from timberas.member import TimberMember
+
+# intermediate design factors, MemberBatch properties
+FACTOR_COLUMNS = (
+    "k_12_x",
+    "k_12_y",
+    "k_12_c",
+    "k_12_bend",
+    "S1",
+    "S2",
+    "S3",
+    "S4",
+    "rho_c",
+    "rho_b",
+    "L_CLR",
+)
+COLUMN_GROUPS = ("inputs", "factors", "capacities")
+
+
+def _as_batch(members: MemberBatch | list[TimberMember]) -> MemberBatch:
+    if isinstance(members, MemberBatch):
+        return members
+    return MemberBatch.from_members(list(members))
+
+
+def _import_pyarrow():
+    try:
+        import pyarrow  # pylint: disable=import-outside-toplevel
+    except ImportError as err:
+        raise ImportError(
+            "pyarrow is required for Arrow, Parquet and Feather export, install with "
+            "'pip install timberas[arrow]'"
+        ) from err
+    return pyarrow
+
+
+def _id_columns(
+    members: MemberBatch | list[TimberMember], ids: np.ndarray | list | None, size: int
+) -> dict[str, np.ndarray]:
+    """Member identifier columns: 'id' if given, and 'sec' and 'mat' names for members."""
+    cols = {}
+    if ids is not None:
+        cols["id"] = np.ravel(np.asarray(ids))
+        if len(cols["id"]) != size:
+            raise ValueError(f"{len(cols['id'])} ids given for {size} members")
+    if not isinstance(members, MemberBatch):
+        cols["sec"] = np.array([mem.sec.name for mem in members], dtype=object)
+        cols["mat"] = np.array([mem.mat.name for mem in members], dtype=object)
+    return cols
+
+
+def batch_columns(
+    members: MemberBatch | list[TimberMember],
+    columns: list[str] | None = None,
+    groups: tuple[str, ...] = COLUMN_GROUPS,
+    ids: np.ndarray | list | None = None,
+) -> dict[str, np.ndarray]:
+    """Returns member columns as 1-D arrays (batch arrays are flattened, without copying
+    where contiguous). Rows are traced to their members by identifier columns, first: 'id'
+    if ids are given, and the 'sec' and 'mat' names for a list of members.
+
+    Args:
+        members: MemberBatch, or list of members converted with MemberBatch.from_members().
+        columns: Column names (MemberBatch inputs, properties or capacities). Defaults to
+            the column groups.
+        groups: Column groups included if columns is None: 'inputs' (MemberBatch inputs,
+            including k_4, k_6, k_9), 'factors' (FACTOR_COLUMNS) and 'capacities'
+            (CAPACITY_NAMES).
+        ids: Optional member identifiers (e.g. member marks or record keys), one per member
+            in flattened batch order.
+
+    Returns:
+        dict[str, np.ndarray]: Column arrays of length len(batch).
+    """
+    batch = _as_batch(members)
+    if columns is None:
+        columns = []
+        if "inputs" in groups:
+            columns += batch.input_names()
+        if "factors" in groups:
+            columns += list(FACTOR_COLUMNS)
+        if "capacities" in groups:
+            columns += list(CAPACITY_NAMES)
+    cols = _id_columns(members, ids, len(batch))
+    for name in columns:
+        cols[name] = np.ravel(np.broadcast_to(getattr(batch, name), batch.shape))
+    return cols
+
+
+def to_frame(
+    members: MemberBatch | list[TimberMember],
+    columns: list[str] | None = None,
+    groups: tuple[str, ...] = COLUMN_GROUPS,
+    ids: np.ndarray | list | None = None,
+) -> pd.DataFrame:
+    """pandas DataFrame of member columns, see batch_columns(). Column arrays are passed to
+    pandas without copying."""
+    return pd.DataFrame(batch_columns(members, columns, groups, ids), copy=False)
+
+
+def to_arrow(
+    members: MemberBatch | list[TimberMember],
+    columns: list[str] | None = None,
+    groups: tuple[str, ...] = COLUMN_GROUPS,
+    ids: np.ndarray | list | None = None,
+):
+    """pyarrow Table of member columns, see batch_columns(). Numeric column buffers are
+    shared with the MemberBatch arrays where contiguous. Requires pyarrow.
+
+    Returns:
+        pyarrow.Table: The member table.
+    """
+    pa = _import_pyarrow()
+    cols = batch_columns(members, columns, groups, ids)
+    return pa.table({name: pa.array(values) for name, values in cols.items()})
+
+
+def arrow_to_frame(table) -> pd.DataFrame:
+    """pandas DataFrame from a pyarrow Table, without copying numeric columns that have no
+    missing values (one pandas block per column)."""
+    return table.to_pandas(split_blocks=True)
+
+
+def write_parquet(
+    members: MemberBatch | list[TimberMember],
+    path: str,
+    columns: list[str] | None = None,
+    groups: tuple[str, ...] = COLUMN_GROUPS,
+    compression: str = "snappy",
+    ids: np.ndarray | list | None = None,
+) -> None:
+    """Writes member columns to a Parquet file. Requires pyarrow.
+
+    Args:
+        members: MemberBatch or list of members.
+        path: Output file path.
+        columns: Column names, see batch_columns().
+        groups: Column groups, see batch_columns().
+        compression: Parquet compression codec.
+        ids: Optional member identifiers, see batch_columns().
+    """
+    _import_pyarrow()
+    import pyarrow.parquet as pq  # pylint: disable=import-outside-toplevel
+
+    pq.write_table(to_arrow(members, columns, groups, ids), path, compression=compression)
+
+
+def write_feather(
+    members: MemberBatch | list[TimberMember],
+    path: str,
+    columns: list[str] | None = None,
+    groups: tuple[str, ...] = COLUMN_GROUPS,
+    ids: np.ndarray | list | None = None,
+) -> None:
+    """Writes member columns to a Feather (Arrow IPC) file. Requires pyarrow.
+
+    Args:
+        members: MemberBatch or list of members.
+        path: Output file path.
+        columns: Column names, see batch_columns().
+        groups: Column groups, see batch_columns().
+        ids: Optional member identifiers, see batch_columns().
+    """
+    _import_pyarrow()
+    import pyarrow.feather as feather  # pylint: disable=import-outside-toplevel
+
+    feather.write_feather(to_arrow(members, columns, groups, ids), path)
@@ -6,6 +6,8 @@ Classes:
 
     TimberSection: A class is used to manage timber section attributes. 
 
+    SharedTimberSection: Read-only, hashable TimberSection shared between members.
+
     RectangleShape: Represents structural section properties for a rectangular cross-section. 
 
     TimberShape: An alias for the RectangleShape class.
@@ -20,9 +22,11 @@ from __future__ import annotations
 
 import os
 from dataclasses import dataclass, field
+from functools import lru_cache
 from math import nan, isnan, floor, log10
 from enum import Enum, auto
 import pandas as pd
+from timberas.interning import InternTable, ValueObject
 
 
 class ShapeType(str, Enum):
@@ -198,6 +202,52 @@ class TimberSection:
         return 2 / 3 * self.d * self.b_tot
 
 
+@dataclass(kw_only=True, eq=False)
+class SharedTimberSection(ValueObject, TimberSection):
+    """Read-only, hashable TimberSection compared by content, shared between members through
+    the SECTIONS intern table. Use dataclasses.replace() for a modified copy."""
+
+    @classmethod
+    def from_section(cls, sec: TimberSection, **changes) -> SharedTimberSection:
+        """Returns the interned shared section with the attributes of sec and changes. If the
+        changes include dimensions, section properties not in changes are recalculated.
+
+        Args:
+            sec: The timber section.
+            changes: Attribute values which replace those of sec.
+
+        Returns:
+            SharedTimberSection: The interned section.
+        """
+        values = {
+            key: getattr(sec, key)
+            for key, fld in TimberSection.__dataclass_fields__.items()
+            if fld.init
+        }
+        if {"shape_type", "b", "d", "n"} & changes.keys():
+            values |= dict.fromkeys(("A_g", "A_t", "A_c", "I_x", "I_y"), nan)
+        return SECTIONS.intern(cls(**(values | changes)))
+
+    @classmethod
+    def from_library(
+        cls, name: str, library: pd.DataFrame | None = None
+    ) -> SharedTimberSection:
+        """Returns the interned shared section from a section library, defaults to the
+        package library (read once)."""
+        if library is None:
+            library = _default_section_library()
+        return cls.from_section(TimberSection.from_library(name, library))
+
+
+SECTIONS = InternTable()
+
+
+@lru_cache(maxsize=1)
+def _default_section_library() -> pd.DataFrame:
+    """Default section library, read once."""
+    return import_section_library()
+
+
 def import_section_library() -> pd.DataFrame:
     """
     Imports a section library from a CSV file.
@@ -0,0 +1,301 @@
+"""
+This module provides vectorised strength sharing of grid systems, Clause 2.4.5.3, AS1720.1:2010.
+Floors, roofs and walls of parallel members (joists, rafters, studs) are stored as arrays with
+one element per system: member spacing s, number of members n_mem (or system width), span L
+and the number of boards in the member section n_com. The geometric factors g_31 and g_32
+(Table 2.7) and the strength sharing factor k_9 are found for all systems in one pass, and
+passed to MemberBatch for the bending capacities of the system members, so every member of
+every system is checked with one vectorised call.
+
+The members of a system share section, material and inputs, so each system is evaluated once.
+
+Classes:
+    GridSystems: Struct-of-arrays of grid systems, with g_31, g_32 and k_9.
+
+    GridCheck: Utilisation of the members of each grid system.
+
+Functions:
+    grid_k_9(): Vectorised g_31, g_32 and k_9 of grid systems.
+
+    system_members(): Number of members at a spacing across a system width.
+
+    check_grids(): Checks the members of grid systems for design actions.
+"""
+from __future__ import annotations
+
+from dataclasses import dataclass, field
+
+import numpy as np
+import pandas as pd
+
+from timberas.batch import MemberBatch, g3_lookup, k_9_lookup, _lookup
+from timberas.geometry import TimberSection, import_section_library
+from timberas.grouping import utilisation, _member_demands
+
+# record keys describing the grid system, not passed to MemberBatch.from_records()
+GRID_INPUTS = ("s", "n_mem", "width")
+
+
+def grid_k_9(
+    n_com: np.ndarray, n_mem: np.ndarray, s: np.ndarray, L: np.ndarray
+) -> dict[str, np.ndarray]:
+    """Geometric factors and strength sharing factor of grid systems, Clause 2.4.5.3 and
+    Table 2.7, AS1720.1:2010.
+
+    Args:
+        n_com: Number of boards in a combined (multi-board) member.
+        n_mem: Number of members in the parallel system.
+        s: Member spacing (mm).
+        L: Member span (mm).
+
+    Returns:
+        dict[str, np.ndarray]: g_31, g_32 and k_9 arrays, broadcast against the inputs.
+    """
+    n_com = np.where(np.asarray(n_com) > 1, n_com, 1)
+    k_9 = k_9_lookup(n_com, n_mem, np.asarray(s, dtype=float), L)
+    g_31 = g3_lookup(n_com)
+    g_32 = g3_lookup(n_com * np.asarray(n_mem))
+    return {"g_31": g_31, "g_32": g_32, "k_9": k_9}
+
+
+def system_members(width: np.ndarray, s: np.ndarray) -> np.ndarray:
+    """Number of members at spacing s across a system width, with a member at each edge.
+
+    Args:
+        width: System width (mm), perpendicular to the members.
+        s: Member spacing (mm).
+
+    Returns:
+        np.ndarray: Number of members, floor(width / s) + 1.
+    """
+    width, s = np.asarray(width, dtype=float), np.asarray(s, dtype=float)
+    if np.any(s <= 0):
+        raise ValueError("member spacing s must be positive to find members from width")
+    return (np.floor(width / s + 1e-9) + 1).astype(int)
+
+
+@dataclass
+class GridSystems:
+    """Struct-of-arrays of grid systems: floors, roofs or walls of parallel members at a
+    regular spacing, which share load through a continuous deck or lining (Clause 2.4.5.3).
+
+    Attributes:
+        s (np.ndarray): Member spacing (mm).
+        n_mem (np.ndarray): Number of members in each system.
+        L (np.ndarray): Member span (mm).
+        n_com (np.ndarray): Number of boards in each combined member, 1 for single boards.
+        records (list[dict]): Member inputs of each system, see MemberBatch.from_records().
+    """
+
+    s: np.ndarray
+    n_mem: np.ndarray
+    L: np.ndarray
+    n_com: np.ndarray = 1
+    records: list[dict] = field(default_factory=list, repr=False)
+
+    def __post_init__(self):
+        s, n_mem, L, n_com = np.broadcast_arrays(
+            np.asarray(self.s, dtype=float),
+            np.asarray(self.n_mem),
+            np.asarray(self.L, dtype=float),
+            np.asarray(self.n_com),
+        )
+        if np.any(n_mem < 1):
+            raise ValueError("grid systems must have at least one member, n_mem >= 1")
+        self.s, self.L = s, L
+        self.n_mem, self.n_com = n_mem.astype(int), n_com.astype(int)
+        self._factors = grid_k_9(self.n_com, self.n_mem, self.s, self.L)
+
+    def __len__(self) -> int:
+        return self.L.size
+
+    @property
+    def g_31(self) -> np.ndarray:
+        """Table 2.7, AS1720.1:2010"""
+        return self._factors["g_31"]
+
+    @property
+    def g_32(self) -> np.ndarray:
+        """Table 2.7, AS1720.1:2010"""
+        return self._factors["g_32"]
+
+    @property
+    def k_9(self) -> np.ndarray:
+        """Clause 2.4.5.3, AS1720.1:2010"""
+        return self._factors["k_9"]
+
+    @property
+    def n_members(self) -> int:
+        """Total number of members in all systems."""
+        return int(self.n_mem.sum())
+
+    @classmethod
+    def from_records(
+        cls,
+        records: list[dict],
+        section_library: pd.DataFrame | None = None,
+    ) -> GridSystems:
+        """Creates GridSystems from a list of system input dictionaries. Each record contains
+        the member inputs of MemberBatch.from_records() ('sec', 'mat', 'L', 'L_a', etc.) and:
+
+        - 's': member spacing (mm);
+        - 'n_mem': number of members, or 'width': system width (mm), see system_members().
+          Defaults to 1 member.
+
+        Args:
+            records: Grid system input dictionaries.
+            section_library: DataFrame of sections, defaults to import_section_library().
+
+        Returns:
+            GridSystems: The grid systems object.
+        """
+        if section_library is None:
+            section_library = import_section_library()
+        sections: dict = {}
+        s, n_mem, L, n_com = [], [], [], []
+        for rec in records:
+            if "n_mem" in rec and "width" in rec:
+                raise ValueError("grid system record has both n_mem and width")
+            s.append(rec.get("s", 0))
+            if "width" in rec:
+                n_mem.append(system_members(rec["width"], rec.get("s", 0)))
+            else:
+                n_mem.append(rec.get("n_mem", 1))
+            L.append(rec.get("L", 1))
+            n_com.append(_lookup(rec["sec"], TimberSection, sections, section_library).n)
+        return cls(s, n_mem, L, n_com, records=list(records))
+
+    def member_records(self) -> list[dict]:
+        """Member inputs of each system, without the grid inputs (GRID_INPUTS)."""
+        return [
+            {key: val for key, val in rec.items() if key not in GRID_INPUTS}
+            for rec in self.records
+        ]
+
+    def batch(
+        self,
+        section_library: pd.DataFrame | None = None,
+        material_library: pd.DataFrame | None = None,
+        sig_figs: int = 4,
+    ) -> MemberBatch:
+        """MemberBatch of one member of each system, with the system k_9. Glulam members
+        (member_type 'glulam') keep k_9 = 1.
+
+        Args:
+            section_library: DataFrame of sections, defaults to import_section_library().
+            material_library: DataFrame of materials, defaults to import_material_library().
+            sig_figs: Number of significant figures to round capacities to.
+
+        Returns:
+            MemberBatch: The member batch object, one element per system.
+        """
+        batch = MemberBatch.from_records(
+            self.member_records(), section_library, material_library, sig_figs
+        )
+        glulam = np.array([rec.get("member_type", "board") == "glulam" for rec in self.records])
+        values = {name: getattr(batch, name) for name in batch.input_names()}
+        values["k_9"] = np.where(glulam, 1.0, self.k_9)
+        return MemberBatch(**values, sig_figs=sig_figs)
+
+    def to_frame(self) -> pd.DataFrame:
+        """DataFrame of system inputs and factors, one row per system."""
+        return pd.DataFrame(
+            {
+                "s": self.s,
+                "n_mem": self.n_mem,
+                "L": self.L,
+                "n_com": self.n_com,
+                "g_31": self.g_31,
+                "g_32": self.g_32,
+                "k_9": self.k_9,
+            }
+        )
+
+
+@dataclass
+class GridCheck:
+    """Utilisation of the members of each grid system.
+
+    Attributes:
+        systems (GridSystems): The grid systems.
+        batch (MemberBatch): Capacities of the system members, one element per system.
+        demands (dict[str, np.ndarray]): Member demand envelopes N_c, N_t, M and V.
+        utilisation (np.ndarray): Governing member utilisation of each system.
+    """
+
+    systems: GridSystems
+    batch: MemberBatch
+    demands: dict[str, np.ndarray]
+    utilisation: np.ndarray
+
+    @property
+    def passed(self) -> np.ndarray:
+        """True where the system members pass, utilisation <= 1."""
+        return self.utilisation <= 1
+
+    def to_frame(self) -> pd.DataFrame:
+        """DataFrame of system factors, member capacities and utilisation."""
+        frame = self.systems.to_frame()
+        frame["M_d"] = self.batch.M_d
+        frame["V_d"] = self.batch.V_d
+        frame["utilisation"] = self.utilisation
+        frame["passed"] = self.passed
+        return frame
+
+
+def _add_actions(from_w: np.ndarray, actions: np.ndarray | None) -> np.ndarray:
+    """Sum of actions from w_star and given actions of shape (n_systems, ...), with trailing
+    load case axes added to the array with fewer dimensions so systems stay aligned."""
+    if actions is None:
+        return from_w
+    actions = np.asarray(actions, dtype=float)
+    ndim = max(from_w.ndim, actions.ndim)
+    if actions.ndim:
+        actions = actions.reshape(actions.shape + (1,) * (ndim - actions.ndim))
+    return from_w.reshape(from_w.shape + (1,) * (ndim - from_w.ndim)) + actions
+
+
+def check_grids(
+    systems: GridSystems,
+    w_star: np.ndarray | None = None,
+    N_star: np.ndarray | None = None,
+    M_star: np.ndarray | None = None,
+    V_star: np.ndarray | None = None,
+    section_library: pd.DataFrame | None = None,
+    material_library: pd.DataFrame | None = None,
+) -> GridCheck:
+    """Checks the members of grid systems. Member actions are given directly, or from a
+    design pressure w_star on simply supported members, each carrying a strip of width s:
+    M* = w* s L^2 / 8 and V* = w* s L / 2.
+
+    Example:
+        floors = GridSystems.from_records(
+            [{"sec": "190x45", "mat": "MGP10", "L": 3600, "L_a": 450, "s": 450, "width": 4800}]
+        )
+        check_grids(floors, w_star=3.0).utilisation
+
+    Args:
+        systems: The grid systems.
+        w_star: Design pressure (kPa), scalar or shape (n_systems, ...) for load cases.
+        N_star: Design axial force (kN), positive in compression, shape (n_systems, ...).
+        M_star: Design bending moment (kNm), shape (n_systems, ...), added to w_star moments.
+        V_star: Design shear force (kN), shape (n_systems, ...), added to w_star shears.
+        section_library: DataFrame of sections, defaults to import_section_library().
+        material_library: DataFrame of materials, defaults to import_material_library().
+
+    Returns:
+        GridCheck: Utilisation of the members of each system.
+    """
+    n = len(systems)
+    if w_star is not None:
+        w_star = np.asarray(w_star, dtype=float)
+        w_star = np.broadcast_to(w_star, (n,) + w_star.shape[1:]) if w_star.ndim else w_star
+        extra = (1,) * max(w_star.ndim - 1, 0)
+        # line load (kN/m) and span (m)
+        w = w_star * systems.s.reshape((n,) + extra) / 1e3
+        span = systems.L.reshape((n,) + extra) / 1e3
+        M_star = _add_actions(w * span**2 / 8, M_star)
+        V_star = _add_actions(w * span / 2, V_star)
+    demands = _member_demands(n, N_star, M_star, V_star)
+    batch = systems.batch(section_library, material_library)
+    return GridCheck(systems, batch, demands, utilisation(batch, demands))
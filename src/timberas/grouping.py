@@ -0,0 +1,552 @@
+"""
+This module provides grouping of similar members, so one section is checked or selected for
+each group from a representative member and the group demand envelope, instead of for every
+member.
+
+Members are grouped by their categorical inputs (material, restraint edge, etc.) and by bins of
+their length, restraint and effective length inputs, of relative width tolerance. The
+representative member of a group takes the input in each group which gives the lowest
+capacities, see ENVELOPE_INPUTS, and is checked against the group demand envelope (the maximum
+compression, tension, bending moment and shear of the group members). Capacities decrease
+with effective length and restraint spacing, except at the continuous lateral restraint limit
+L_CLR (Clause 3.2.3.2), so selected sections are verified for every member in one vectorised
+pass, and members which do not pass are split into their own groups.
+
+Classes:
+    MemberGroups: Members grouped by design inputs, with representative members.
+
+    GroupCheck: Utilisation of group representatives and members.
+
+    GroupDesign: Section selected for each group, verified for every member.
+
+Functions:
+    group_members(): Groups member records by design inputs.
+
+    demand_envelope(): Demand envelope of each group.
+
+    check_groups(): Checks the representative member of each group, verified for every member.
+
+    optimize_groups(): Selects the lightest passing section for each group.
+"""
+from __future__ import annotations
+
+from dataclasses import dataclass, field
+
+import numpy as np
+import pandas as pd
+
+from timberas.batch import MemberBatch, _axis_value, k_9_lookup
+from timberas.geometry import import_section_library
+from timberas.interaction import interaction_ratios
+from timberas.material import import_material_library
+from timberas.sweep import library_pairs
+
+# grouped continuous inputs, and the direction in which capacities decrease
+ENVELOPE_INPUTS = {
+    "L": "max",
+    "L_ax": "max",
+    "L_ay": "max",
+    "L_a_phi": "max",
+    "g_13_x": "max",
+    "g_13_y": "max",
+    "k_1": "min",
+    "r": "min",
+}
+# member inputs which must be equal within a group
+CATEGORICAL_INPUTS = (
+    "sec",
+    "mat",
+    "member_type",
+    "update_from_section_size",
+    "restraint_edge",
+    "application_cat",
+    "high_temp_latitude",
+    "consider_partial_seasoning",
+    "n_mem",
+    "s",
+)
+DEMANDS = ("N_c", "N_t", "M", "V")
+
+
+def _record_inputs(records: list[dict]) -> dict[str, np.ndarray]:
+    """Continuous inputs of member records, with the member class defaults. r is the ratio
+    used for rho (0.25 where r <= 0, Section E2)."""
+    cols = {name: [] for name in ENVELOPE_INPUTS}
+    for rec in records:
+        L = rec.get("L", 1)
+        L_a = rec.get("L_a", None)
+        g_13 = rec.get("g_13", 1)
+        r = rec.get("r", 0.25)
+        cols["L"].append(L)
+        cols["L_ax"].append(_axis_value(L_a, "x", "lateral restraint L_a", L, required=False))
+        cols["L_ay"].append(_axis_value(L_a, "y", "lateral restraint L_a", L))
+        cols["L_a_phi"].append(L_a.get("phi", np.nan) if isinstance(L_a, dict) else np.nan)
+        cols["g_13_x"].append(_axis_value(g_13, "x", "effective length factor g_13"))
+        cols["g_13_y"].append(_axis_value(g_13, "y", "effective length factor g_13"))
+        cols["k_1"].append(rec.get("k_1", 1.0))
+        cols["r"].append(r if r > 0 else 0.25)
+    return {name: np.array(val, dtype=float) for name, val in cols.items()}
+
+
+def _categorical_key(rec: dict, by: tuple[str, ...]) -> tuple:
+    key = []
+    for name in by:
+        val = rec.get(name)
+        if isinstance(val, dict):
+            val = tuple(sorted(val.items()))
+        key.append(getattr(val, "value", val))
+    return tuple(key)
+
+
+@dataclass
+class MemberGroups:
+    """Members grouped by design inputs.
+
+    Attributes:
+        records (list[dict]): Member records, see MemberBatch.from_records().
+        labels (np.ndarray): Group index of each member, shape (n_members,).
+        inputs (dict[str, np.ndarray]): Continuous inputs of each member, ENVELOPE_INPUTS.
+        tolerance (float): Relative width of the continuous input bins.
+    """
+
+    records: list[dict]
+    labels: np.ndarray
+    inputs: dict[str, np.ndarray]
+    tolerance: float
+
+    @property
+    def n_groups(self) -> int:
+        """Number of groups."""
+        return int(self.labels.max()) + 1 if len(self.labels) else 0
+
+    @property
+    def sizes(self) -> np.ndarray:
+        """Number of members in each group."""
+        return np.bincount(self.labels, minlength=self.n_groups)
+
+    def members(self, group: int) -> np.ndarray:
+        """Indices of the members of a group."""
+        return np.flatnonzero(self.labels == group)
+
+    def envelope(self) -> dict[str, np.ndarray]:
+        """Continuous inputs of the representative member of each group, the maximum or
+        minimum over the group as in ENVELOPE_INPUTS (nan values ignored)."""
+        values = {}
+        for name, direction in ENVELOPE_INPUTS.items():
+            val = self.inputs[name]
+            fill = -np.inf if direction == "max" else np.inf
+            out = np.full(self.n_groups, fill)
+            ufunc = np.maximum if direction == "max" else np.minimum
+            ufunc.at(out, self.labels, np.where(np.isnan(val), fill, val))
+            values[name] = np.where(np.isinf(out), np.nan, out)
+        return values
+
+    def representatives(self) -> list[dict]:
+        """Member records of the representative member of each group, one per group."""
+        env = self.envelope()
+        first = np.full(self.n_groups, len(self.labels))
+        np.minimum.at(first, self.labels, np.arange(len(self.labels)))
+        reps = []
+        for g, i in enumerate(first):
+            rec = dict(self.records[i])
+            L_a = {"x": env["L_ax"][g], "y": env["L_ay"][g]}
+            if not np.isnan(env["L_a_phi"][g]):
+                L_a["phi"] = env["L_a_phi"][g]
+            rec.update(
+                L=env["L"][g],
+                L_a=L_a,
+                g_13={"x": env["g_13_x"][g], "y": env["g_13_y"][g]},
+                k_1=env["k_1"][g],
+                r=env["r"][g],
+            )
+            reps.append(rec)
+        return reps
+
+    def representative_batch(
+        self,
+        sec: list | None = None,
+        group: np.ndarray | None = None,
+        section_library: pd.DataFrame | None = None,
+        material_library: pd.DataFrame | None = None,
+    ) -> MemberBatch:
+        """MemberBatch of group representatives. Board member k_9 increases with L (Clause
+        2.4.5.3), so k_9 is evaluated with the shortest member length of the group.
+
+        Args:
+            sec: Section of each batch member, replacing the record sections.
+            group: Group of each batch member, defaults to each group once.
+            section_library: DataFrame of sections, defaults to import_section_library().
+            material_library: DataFrame of materials, defaults to import_material_library().
+
+        Returns:
+            MemberBatch: The representative members.
+        """
+        reps = self.representatives()
+        group = np.arange(self.n_groups) if group is None else np.asarray(group, dtype=int)
+        records = [
+            reps[g] if sec is None else reps[g] | {"sec": sec[j]} for j, g in enumerate(group)
+        ]
+        batch = MemberBatch.from_records(records, section_library, material_library)
+        L_min = np.full(self.n_groups, np.inf)
+        np.minimum.at(L_min, self.labels, self.inputs["L"])
+        board = np.array([rec.get("member_type", "board") == "board" for rec in records])
+        k_9 = k_9_lookup(
+            np.where(batch.n > 1, batch.n, 1),
+            np.array([rec.get("n_mem", 1) for rec in records]),
+            np.array([rec.get("s", 0) for rec in records], dtype=float),
+            L_min[group],
+        )
+        batch.k_9 = np.where(board, k_9, batch.k_9)
+        batch.solve_capacities()
+        return batch
+
+    def split(self, members: np.ndarray) -> MemberGroups:
+        """Returns groups with each of the given members in its own group."""
+        labels = self.labels.copy()
+        labels[members] = self.n_groups + np.arange(len(members))
+        _, labels = np.unique(labels, return_inverse=True)
+        return MemberGroups(self.records, labels, self.inputs, self.tolerance)
+
+
+def group_members(
+    records: list[dict],
+    tolerance: float = 0.1,
+    by: tuple[str, ...] = CATEGORICAL_INPUTS,
+) -> MemberGroups:
+    """Groups member records with equal categorical inputs and continuous inputs in the same
+    bins of relative width tolerance, so group members differ by at most tolerance in
+    L, L_a, g_13, k_1 and r.
+
+    Args:
+        records: Member records, see MemberBatch.from_records(). Records without 'sec' are
+            grouped for section selection with optimize_groups().
+        tolerance: Relative width of the continuous input bins.
+        by: Categorical inputs which must be equal within a group.
+
+    Returns:
+        MemberGroups: The member groups.
+    """
+    inputs = _record_inputs(records)
+    step = np.log1p(tolerance)
+    bins = []
+    for name in ENVELOPE_INPUTS:
+        val = inputs[name]
+        with np.errstate(divide="ignore", invalid="ignore"):
+            b = np.floor(np.log(val) / step)
+        bins.append(np.where(np.isfinite(b), b, np.where(val > 0, np.inf, -np.inf)))
+    continuous = np.stack(bins, axis=-1) if records else np.zeros((0, len(bins)))
+
+    groups: dict[tuple, int] = {}
+    labels = np.empty(len(records), dtype=int)
+    for i, rec in enumerate(records):
+        key = _categorical_key(rec, by) + tuple(continuous[i])
+        labels[i] = groups.setdefault(key, len(groups))
+    return MemberGroups(list(records), labels, inputs, tolerance)
+
+
+def _member_demands(
+    n: int,
+    N_star: np.ndarray | None,
+    M_star: np.ndarray | None,
+    V_star: np.ndarray | None,
+) -> dict[str, np.ndarray]:
+    """Member demand envelopes over any trailing load case axes, shape (n,)."""
+
+    def reduce(val, func):
+        if val is None:
+            return np.zeros(n)
+        val = np.asarray(val, dtype=float)
+        val = np.broadcast_to(val, (n,) + val.shape[1:]) if val.ndim else np.full(n, val)
+        return func(val.reshape(n, -1), axis=1)
+
+    return {
+        "N_c": np.maximum(reduce(N_star, np.max), 0),
+        "N_t": np.maximum(-reduce(N_star, np.min), 0),
+        "M": reduce(None if M_star is None else np.abs(M_star), np.max),
+        "V": reduce(None if V_star is None else np.abs(V_star), np.max),
+    }
+
+
+def demand_envelope(
+    groups: MemberGroups,
+    N_star: np.ndarray | None = None,
+    M_star: np.ndarray | None = None,
+    V_star: np.ndarray | None = None,
+) -> dict[str, np.ndarray]:
+    """Demand envelope of each group: maximum compression N_c, tension N_t (magnitude), bending
+    moment M and shear V over the members of the group and their load cases.
+
+    Args:
+        groups: The member groups.
+        N_star: Design axial force (kN), positive in compression, shape (n_members, ...).
+        M_star: Design bending moment (kNm), shape (n_members, ...).
+        V_star: Design shear force (kN), shape (n_members, ...).
+
+    Returns:
+        dict[str, np.ndarray]: DEMANDS arrays, shape (n_groups,).
+    """
+    member = _member_demands(len(groups.labels), N_star, M_star, V_star)
+    envelope = {}
+    for name, val in member.items():
+        out = np.zeros(groups.n_groups)
+        np.maximum.at(out, groups.labels, val)
+        envelope[name] = out
+    return envelope
+
+
+def utilisation(batch: MemberBatch, demands: dict[str, np.ndarray]) -> np.ndarray:
+    """Governing utilisation for demand envelopes: axial, bending and shear capacities, and
+    combined bending and compression or tension (Clause 3.5, AS1720.1:2010). Eq 3.5(4) does not
+    exceed the bending utilisation, and is not included.
+
+    Args:
+        batch: Members, or group representatives.
+        demands: DEMANDS arrays broadcast against the batch.
+
+    Returns:
+        np.ndarray: The maximum utilisation, nan where a capacity is not defined.
+    """
+    with np.errstate(divide="ignore", invalid="ignore"):
+        ratios = [
+            demands["N_c"] / batch.N_dc,
+            demands["N_t"] / batch.N_dt,
+            demands["M"] / batch.M_d,
+            demands["V"] / batch.V_d,
+        ]
+        for N_star in (demands["N_c"], -demands["N_t"]):
+            check = interaction_ratios(
+                demands["M"],
+                N_star,
+                M_d=batch.M_d,
+                N_dcx=batch.N_dcx,
+                N_dcy=batch.N_dcy,
+                N_dt=batch.N_dt,
+                k_12_bend=batch.k_12_bend,
+                Z_x=batch.Z_x,
+                A_t=batch.A_t,
+            )
+            ratios += [check.compression_x, check.compression_y, check.tension]
+    ratios = np.stack(np.broadcast_arrays(*ratios), axis=-1)
+    util = np.nanmax(np.where(np.isnan(ratios), -np.inf, ratios), axis=-1)
+    undefined = np.isnan(ratios[..., :4]).any(axis=-1) | np.isinf(util)
+    return np.where(undefined, np.nan, util)
+
+
+@dataclass
+class GroupCheck:
+    """Utilisation of group representatives, and of the members they represent.
+
+    Attributes:
+        groups (MemberGroups): The member groups.
+        utilisation (np.ndarray): Representative utilisation, shape (n_groups,).
+        member_utilisation (np.ndarray): Utilisation of each member, shape (n_members,).
+    """
+
+    groups: MemberGroups
+    utilisation: np.ndarray
+    member_utilisation: np.ndarray
+
+    @property
+    def passed(self) -> np.ndarray:
+        """True for groups whose representative and members all pass."""
+        member_failed = np.zeros(self.groups.n_groups, dtype=bool)
+        np.logical_or.at(member_failed, self.groups.labels, ~self.member_passed)
+        return (self.utilisation <= 1.0) & ~member_failed
+
+    @property
+    def member_passed(self) -> np.ndarray:
+        """True for members which pass, shape (n_members,)."""
+        return self.member_utilisation <= 1.0
+
+
+def check_groups(
+    groups: MemberGroups,
+    N_star: np.ndarray | None = None,
+    M_star: np.ndarray | None = None,
+    V_star: np.ndarray | None = None,
+    section_library: pd.DataFrame | None = None,
+    material_library: pd.DataFrame | None = None,
+) -> GroupCheck:
+    """Checks the representative member of each group against the group demand envelope.
+    Capacities are not monotonic at L_CLR, so every member is also checked with its own
+    inputs and actions in one vectorised pass. Records must include 'sec', grouped with
+    group_members(by=...) including 'sec'.
+
+    Args:
+        groups: The member groups.
+        N_star, M_star, V_star: Member design actions, see demand_envelope().
+        section_library: DataFrame of sections, defaults to import_section_library().
+        material_library: DataFrame of materials, defaults to import_material_library().
+
+    Returns:
+        GroupCheck: Representative and member utilisations.
+    """
+    batch = groups.representative_batch(
+        section_library=section_library, material_library=material_library
+    )
+    demands = demand_envelope(groups, N_star, M_star, V_star)
+    members = MemberBatch.from_records(groups.records, section_library, material_library)
+    member_demands = _member_demands(len(groups.records), N_star, M_star, V_star)
+    return GroupCheck(
+        groups, utilisation(batch, demands), utilisation(members, member_demands)
+    )
+
+
+@dataclass
+class GroupDesign:
+    """Section selected for each group, verified for every member.
+
+    Attributes:
+        groups (MemberGroups): The member groups, after splitting members which did not pass
+            with their group section.
+        sections (np.ndarray): Section name of each group, None where no candidate passes.
+        utilisation (np.ndarray): Member utilisation with the group section, shape
+            (n_members,).
+        work (dict[str, int | float]): Member evaluations with grouping ('evaluations'), and
+            without grouping ('exhaustive' - each member with each candidate section), and
+            their ratio ('reduction').
+    """
+
+    groups: MemberGroups
+    sections: np.ndarray
+    utilisation: np.ndarray
+    work: dict = field(default_factory=dict)
+
+    @property
+    def member_sections(self) -> np.ndarray:
+        """Section name of each member, shape (n_members,)."""
+        return self.sections[self.groups.labels]
+
+    @property
+    def passed(self) -> np.ndarray:
+        """True for members with a passing section."""
+        return self.utilisation <= 1.0
+
+
+def _candidates(
+    mat, sections: list[str] | None, section_library: pd.DataFrame, pairs: pd.DataFrame
+) -> list[str]:
+    """Candidate section names for a material, lightest (smallest area) first."""
+    if sections is None:
+        if isinstance(mat, str) and mat in pairs.columns:
+            sections = list(pairs.index[pairs[mat].to_numpy()])
+        else:
+            sections = list(section_library["name"])
+    lib = section_library.set_index("name").loc[sections]
+    area = (lib["n"] * lib["b"] * lib["d"]).to_numpy(dtype=float)
+    return [sections[i] for i in np.argsort(area, kind="stable")]
+
+
+def _valid(rec: dict, section_library, material_library) -> bool:
+    try:
+        MemberBatch.from_records([rec], section_library, material_library)
+    except (ValueError, KeyError, NotImplementedError):
+        return False
+    return True
+
+
+def optimize_groups(
+    groups: MemberGroups,
+    N_star: np.ndarray | None = None,
+    M_star: np.ndarray | None = None,
+    V_star: np.ndarray | None = None,
+    sections: list[str] | None = None,
+    section_library: pd.DataFrame | None = None,
+    material_library: pd.DataFrame | None = None,
+    max_splits: int = 10,
+) -> GroupDesign:
+    """Selects the lightest (smallest area) candidate section passing the demand envelope of
+    each group, from the group representative. Every member is then checked with its group
+    section, and members which do not pass are moved to their own group and re-selected, so
+    every member passes with its selected section.
+
+    Args:
+        groups: Member groups, from group_members(by=...) without 'sec'.
+        N_star, M_star, V_star: Member design actions, see demand_envelope().
+        sections: Candidate section names, defaults to the library sections matched to the
+            group material (see sweep.library_pairs()), or all library sections.
+        section_library: DataFrame of sections, defaults to import_section_library().
+        material_library: DataFrame of materials, defaults to import_material_library().
+        max_splits: Maximum number of verify and split passes.
+
+    Returns:
+        GroupDesign: The group sections, member utilisations and work reduction.
+    """
+    if section_library is None:
+        section_library = import_section_library()
+    if material_library is None:
+        material_library = import_material_library()
+    records = groups.records
+    member_demands = _member_demands(len(records), N_star, M_star, V_star)
+    evaluations, n_candidates = 0, 0
+    valid_cache: dict = {}
+    candidate_cache: dict = {}
+    pairs = library_pairs(section_library, material_library) if sections is None else None
+
+    for _ in range(max_splits + 1):
+        demands = demand_envelope(groups, N_star, M_star, V_star)
+        group, candidate = [], []
+        for g, rec in enumerate(groups.representatives()):
+            mat_key = _categorical_key(rec, ("mat",))
+            if mat_key not in candidate_cache:
+                candidate_cache[mat_key] = _candidates(
+                    rec["mat"], sections, section_library, pairs
+                )
+            candidates = candidate_cache[mat_key]
+            n_candidates = max(n_candidates, len(candidates))
+            key = _categorical_key(rec, ("mat", "member_type", "update_from_section_size"))
+            for sec in candidates:
+                if key + (sec,) not in valid_cache:
+                    valid_cache[key + (sec,)] = _valid(
+                        rec | {"sec": sec}, section_library, material_library
+                    )
+                if valid_cache[key + (sec,)]:
+                    group.append(g)
+                    candidate.append(sec)
+        group = np.array(group, dtype=int)
+        chosen = np.full(groups.n_groups, None, dtype=object)
+        if len(group):
+            batch = groups.representative_batch(
+                candidate, group, section_library, material_library
+            )
+            util = utilisation(batch, {name: val[group] for name, val in demands.items()})
+            evaluations += len(group)
+            # candidates are in order of area within each group, keep the first passing
+            for j in np.flatnonzero(util <= 1.0)[::-1]:
+                chosen[group[j]] = candidate[j]
+
+        # verify every member with its group section
+        assigned = chosen[groups.labels]
+        has_section = np.array([sec is not None for sec in assigned], dtype=bool)
+        util = np.full(len(records), np.nan)
+        if has_section.any():
+            idx = np.flatnonzero(has_section)
+            batch = MemberBatch.from_records(
+                [records[i] | {"sec": assigned[i]} for i in idx],
+                section_library,
+                material_library,
+            )
+            util[idx] = utilisation(batch, {k: v[idx] for k, v in member_demands.items()})
+            evaluations += len(idx)
+        # includes members of groups with no passing section for the group envelope, which
+        # may pass on their own
+        failed = np.flatnonzero(~(util <= 1.0))
+        # members already alone in their group cannot be split further
+        failed = failed[groups.sizes[groups.labels[failed]] > 1]
+        if len(failed) == 0:
+            break
+        groups = groups.split(failed)
+
+    exhaustive = len(records) * n_candidates
+    return GroupDesign(
+        groups=groups,
+        sections=chosen,
+        utilisation=util,
+        work={
+            "members": len(records),
+            "groups": groups.n_groups,
+            "evaluations": evaluations,
+            "exhaustive": exhaustive,
+            "reduction": exhaustive / evaluations if evaluations else np.nan,
+        },
+    )
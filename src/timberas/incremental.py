@@ -0,0 +1,336 @@
+"""
+This module provides incremental recalculation of stored member results after section or
+material library edits. Each stored member records the library rows its result depends on, and
+a library diff recomputes only the members which depend on added, removed or changed rows.
+
+Dependencies are keyed by:
+    ('sec', name): section library row used by the member;
+    ('mat', name): material library row used by the member;
+    ('grade', grade): all material rows of a grade, for members with materials updated from
+    section size (MGP depth variants and A grade breadth/depth variants).
+
+Records given as section or material dictionaries do not depend on the libraries.
+
+Classes:
+    LibraryDiff: Rows added, removed and changed between two versions of a library.
+
+    Recalculation: Members recomputed after library edits, and results changed beyond a
+    tolerance.
+
+    ResultStore: Stored member results with their library dependency map.
+
+Functions:
+    library_diff(): Compares two versions of a section or material library.
+"""
+from __future__ import annotations
+
+import json
+from dataclasses import dataclass, field
+
+import numpy as np
+import pandas as pd
+
+from timberas.batch import MemberBatch, CAPACITY_NAMES
+from timberas.geometry import import_section_library
+from timberas.material import import_material_library
+
+LIBRARY_KINDS = ("sec", "mat")
+
+
+def _same(a, b) -> bool:
+    """Library cell values equal, with missing values equal to each other."""
+    if pd.isna(a) and pd.isna(b):
+        return True
+    return bool(a == b)
+
+
+@dataclass
+class LibraryDiff:
+    """Rows added, removed and changed between two versions of a library.
+
+    Attributes:
+        kind (str): 'sec' for a section library, 'mat' for a material library.
+        added (list[str]): Names of rows only in the new library.
+        removed (list[str]): Names of rows only in the old library.
+        changed (list[str]): Names of rows with any changed value.
+        grades (set[str]): Grades of added, removed or changed material rows, old and new.
+    """
+
+    kind: str
+    added: list[str] = field(default_factory=list)
+    removed: list[str] = field(default_factory=list)
+    changed: list[str] = field(default_factory=list)
+    grades: set[str] = field(default_factory=set)
+
+    @property
+    def is_empty(self) -> bool:
+        """True if the libraries are the same."""
+        return not (self.added or self.removed or self.changed)
+
+    @property
+    def keys(self) -> set[tuple[str, str]]:
+        """Dependency keys affected by the diff."""
+        names = self.added + self.removed + self.changed
+        keys = {(self.kind, name) for name in names}
+        return keys | {("grade", grade) for grade in self.grades}
+
+
+def library_diff(old: pd.DataFrame, new: pd.DataFrame, kind: str = "mat") -> LibraryDiff:
+    """Compares two versions of a section or material library, matching rows by name.
+
+    Args:
+        old: The previous library.
+        new: The edited library.
+        kind: 'sec' for a section library, 'mat' for a material library.
+
+    Returns:
+        LibraryDiff: The added, removed and changed rows.
+    """
+    if kind not in LIBRARY_KINDS:
+        raise ValueError(f"library kind {kind} not in {LIBRARY_KINDS}")
+    old_rows = old.drop_duplicates("name").set_index("name")
+    new_rows = new.drop_duplicates("name").set_index("name")
+    columns = old_rows.columns.union(new_rows.columns)
+    old_rows = old_rows.reindex(columns=columns)
+    new_rows = new_rows.reindex(columns=columns)
+
+    diff = LibraryDiff(
+        kind=kind,
+        added=[name for name in new_rows.index if name not in old_rows.index],
+        removed=[name for name in old_rows.index if name not in new_rows.index],
+    )
+    for name in old_rows.index.intersection(new_rows.index, sort=False):
+        old_row, new_row = old_rows.loc[name], new_rows.loc[name]
+        if not all(_same(old_row[col], new_row[col]) for col in columns):
+            diff.changed.append(name)
+
+    if kind == "mat" and "grade" in columns:
+        for rows, names in (
+            (old_rows, diff.removed + diff.changed),
+            (new_rows, diff.added + diff.changed),
+        ):
+            diff.grades.update(g for g in rows.loc[names, "grade"] if not pd.isna(g))
+    return diff
+
+
+@dataclass
+class Recalculation:
+    """Members recomputed after library edits.
+
+    Attributes:
+        diffs (list[LibraryDiff]): Library diffs applied.
+        recomputed (np.ndarray): Indices of recomputed members.
+        changed (np.ndarray): Indices of recomputed members with any output changed by more
+            than the tolerance, or which now fail or no longer fail.
+        previous (dict[str, np.ndarray]): Previous outputs of the changed members.
+        current (dict[str, np.ndarray]): Current outputs of the changed members.
+        errors (dict[int, str]): Errors of recomputed members which failed.
+    """
+
+    diffs: list[LibraryDiff]
+    recomputed: np.ndarray
+    changed: np.ndarray
+    previous: dict[str, np.ndarray]
+    current: dict[str, np.ndarray]
+    errors: dict[int, str] = field(default_factory=dict)
+
+    def to_frame(self) -> pd.DataFrame:
+        """Changed members, with previous and current outputs and the relative change."""
+        cols = {"index": self.changed}
+        for name in self.previous:
+            old, new = self.previous[name], self.current[name]
+            cols[f"{name}_previous"] = old
+            cols[f"{name}_current"] = new
+            with np.errstate(divide="ignore", invalid="ignore"):
+                cols[f"{name}_change"] = (new - old) / np.abs(old)
+        return pd.DataFrame(cols)
+
+
+class ResultStore:
+    """Stored member results with a map from library rows to the members which use them.
+
+    Members are given as MemberBatch.from_records() records and evaluated with MemberBatch.
+    Members which fail (e.g. a section missing from the library) are stored with nan outputs
+    and an error message.
+
+    Attributes:
+        records (list[dict]): Member input records.
+        section_library (pd.DataFrame): Section library used for the stored results.
+        material_library (pd.DataFrame): Material library used for the stored results.
+        outputs (tuple[str, ...]): Stored outputs, from CAPACITY_NAMES.
+        results (dict[str, np.ndarray]): Stored outputs, one value per record.
+        errors (dict[int, str]): Error messages of failed members by index.
+        dependencies (dict[tuple[str, str], set[int]]): Member indices by dependency key.
+    """
+
+    def __init__(
+        self,
+        records: list[dict],
+        section_library: pd.DataFrame | None = None,
+        material_library: pd.DataFrame | None = None,
+        outputs: tuple[str, ...] = CAPACITY_NAMES,
+        sig_figs: int = 4,
+    ):
+        if set(outputs) - set(CAPACITY_NAMES):
+            raise ValueError(f"outputs must be capacities from {CAPACITY_NAMES}")
+        self.records = list(records)
+        self.section_library = (
+            import_section_library() if section_library is None else section_library.copy()
+        )
+        self.material_library = (
+            import_material_library() if material_library is None else material_library.copy()
+        )
+        self.outputs = tuple(outputs)
+        self.sig_figs = sig_figs
+        self.results = {name: np.full(len(self.records), np.nan) for name in self.outputs}
+        self.errors: dict[int, str] = {}
+        self.dependencies: dict[tuple[str, str], set[int]] = {}
+        self._build_dependencies()
+        self._evaluate(np.arange(len(self.records)))
+
+    def __len__(self) -> int:
+        return len(self.records)
+
+    def member_dependencies(self, rec: dict) -> set[tuple[str, str]]:
+        """Dependency keys of a member record, for the current libraries."""
+        keys = set()
+        if isinstance(rec["sec"], str):
+            keys.add(("sec", rec["sec"]))
+        if isinstance(rec["mat"], str):
+            keys.add(("mat", rec["mat"]))
+            if rec.get("update_from_section_size", False):
+                grades = self.material_library.loc[
+                    self.material_library["name"] == rec["mat"], "grade"
+                ]
+                keys.update(("grade", grade) for grade in grades)
+        return keys
+
+    def _build_dependencies(self) -> None:
+        self.dependencies = {}
+        for i, rec in enumerate(self.records):
+            for key in self.member_dependencies(rec):
+                self.dependencies.setdefault(key, set()).add(i)
+
+    def dependents(self, keys: set[tuple[str, str]]) -> np.ndarray:
+        """Sorted indices of members depending on any of the dependency keys."""
+        indices = set()
+        for key in keys:
+            indices |= self.dependencies.get(key, set())
+        return np.array(sorted(indices), dtype=int)
+
+    def _batch_outputs(self, records: list[dict]) -> dict[str, np.ndarray]:
+        batch = MemberBatch.from_records(
+            records, self.section_library, self.material_library, self.sig_figs
+        )
+        return {name: getattr(batch, name) for name in self.outputs}
+
+    def _evaluate(self, indices: np.ndarray) -> None:
+        """Evaluates members as one batch, or individually if the batch fails."""
+        if len(indices) == 0:
+            return
+        for i in indices:
+            self.errors.pop(int(i), None)
+        try:
+            values = self._batch_outputs([self.records[i] for i in indices])
+        except Exception:  # pylint: disable=broad-except
+            values = {name: np.full(len(indices), np.nan) for name in self.outputs}
+            for j, i in enumerate(indices):
+                try:
+                    single = self._batch_outputs([self.records[i]])
+                except Exception as err:  # pylint: disable=broad-except
+                    self.errors[int(i)] = f"{type(err).__name__}: {err}"
+                    continue
+                for name in self.outputs:
+                    values[name][j] = single[name][0]
+        for name in self.outputs:
+            self.results[name][indices] = values[name]
+
+    def update_libraries(
+        self,
+        section_library: pd.DataFrame | None = None,
+        material_library: pd.DataFrame | None = None,
+        rtol: float = 1e-3,
+    ) -> Recalculation:
+        """Replaces the section and/or material library, and recomputes only the members
+        which depend on added, removed or changed library rows.
+
+        Args:
+            section_library: Edited section library, unchanged if None.
+            material_library: Edited material library, unchanged if None.
+            rtol: Relative tolerance above which an output change is reported.
+
+        Returns:
+            Recalculation: The recomputed and changed members.
+        """
+        diffs = []
+        if section_library is not None:
+            diffs.append(library_diff(self.section_library, section_library, "sec"))
+            self.section_library = section_library.copy()
+        if material_library is not None:
+            diffs.append(library_diff(self.material_library, material_library, "mat"))
+            self.material_library = material_library.copy()
+
+        keys = set().union(*(diff.keys for diff in diffs))
+        recomputed = self.dependents(keys)
+        previous = {name: self.results[name][recomputed] for name in self.outputs}
+        failed = np.array([int(i) in self.errors for i in recomputed], dtype=bool)
+        if material_library is not None:
+            # grade dependencies follow the grade of the edited material rows
+            self._build_dependencies()
+        self._evaluate(recomputed)
+
+        current = {name: self.results[name][recomputed] for name in self.outputs}
+        now_failed = np.array([int(i) in self.errors for i in recomputed], dtype=bool)
+        changed = failed != now_failed
+        for name in self.outputs:
+            old, new = previous[name], current[name]
+            with np.errstate(invalid="ignore"):
+                changed |= np.abs(new - old) > rtol * np.abs(old)
+            changed |= np.isnan(old) != np.isnan(new)
+        return Recalculation(
+            diffs=diffs,
+            recomputed=recomputed,
+            changed=recomputed[changed],
+            previous={name: val[changed] for name, val in previous.items()},
+            current={name: val[changed] for name, val in current.items()},
+            errors={int(i): self.errors[int(i)] for i in recomputed if int(i) in self.errors},
+        )
+
+    def to_frame(self) -> pd.DataFrame:
+        """Stored outputs, one row per member, with the error message of failed members."""
+        frame = pd.DataFrame(self.results)
+        frame["error"] = [self.errors.get(i) for i in range(len(self))]
+        return frame
+
+    def save(self, path: str) -> None:
+        """Writes records, libraries and stored results to a JSON file, reloaded with
+        ResultStore.load()."""
+        data = {
+            "records": self.records,
+            "outputs": list(self.outputs),
+            "sig_figs": self.sig_figs,
+            "section_library": self.section_library.to_dict("records"),
+            "material_library": self.material_library.to_dict("records"),
+            "results": {name: val.tolist() for name, val in self.results.items()},
+            "errors": {str(i): msg for i, msg in self.errors.items()},
+        }
+        with open(path, "w", encoding="utf-8") as f:
+            json.dump(data, f)
+
+    @classmethod
+    def load(cls, path: str) -> ResultStore:
+        """Reloads stored results written with save(), without recomputing them."""
+        with open(path, encoding="utf-8") as f:
+            data = json.load(f)
+        store = cls.__new__(cls)
+        store.records = data["records"]
+        store.outputs = tuple(data["outputs"])
+        store.sig_figs = data["sig_figs"]
+        store.section_library = pd.DataFrame(data["section_library"])
+        store.material_library = pd.DataFrame(data["material_library"])
+        store.results = {
+            name: np.array(val, dtype=float) for name, val in data["results"].items()
+        }
+        store.errors = {int(i): msg for i, msg in data["errors"].items()}
+        store._build_dependencies()
+        return store
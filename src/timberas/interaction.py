@@ -0,0 +1,148 @@
+"""
+This module provides combined actions checks, Clause 3.5, AS1720.1:2010. Checks reuse the
+member design capacities already solved for a member or MemberBatch (including their stability
+factors k_12), so members are not rebuilt for each load case.
+
+Classes:
+    InteractionCheck: Interaction ratios for combined bending and axial actions.
+
+Functions:
+    interaction_ratios(): Interaction ratios from design actions and capacities.
+
+    check_interaction(): Interaction ratios for a MemberBatch over members x load cases.
+"""
+from __future__ import annotations
+
+from dataclasses import dataclass
+
+import numpy as np
+
+EQUATIONS = ("3.5(1)", "3.5(2)", "3.5(3)", "3.5(4)")
+
+
+@dataclass
+class InteractionCheck:
+    """Interaction ratios for combined bending and axial actions, Clause 3.5, AS1720.1:2010.
+    Compression equations are nan where the axial action is tension, and tension equations
+    are nan where the axial action is compression.
+
+    Attributes:
+        compression_x (np.ndarray): Bending and compression, x-axis buckling, Eq 3.5(1).
+        compression_y (np.ndarray): Bending and compression, y-axis buckling, Eq 3.5(2).
+        tension (np.ndarray): Bending and tension, Eq 3.5(3).
+        tension_net (np.ndarray): Bending and tension, net compression edge, Eq 3.5(4).
+    """
+
+    compression_x: np.ndarray
+    compression_y: np.ndarray
+    tension: np.ndarray
+    tension_net: np.ndarray
+
+    @property
+    def ratios(self) -> np.ndarray:
+        """Interaction ratios stacked on a trailing axis, in EQUATIONS order."""
+        return np.stack(
+            [self.compression_x, self.compression_y, self.tension, self.tension_net],
+            axis=-1,
+        )
+
+    @property
+    def utilisation(self) -> np.ndarray:
+        """Governing (maximum) interaction ratio."""
+        return np.nanmax(self.ratios, axis=-1)
+
+    @property
+    def governing(self) -> np.ndarray:
+        """Governing equation, from EQUATIONS."""
+        return np.array(EQUATIONS)[np.nanargmax(self.ratios, axis=-1)]
+
+    @property
+    def passed(self) -> np.ndarray:
+        """True where all interaction ratios are less than or equal to 1."""
+        return self.utilisation <= 1.0
+
+
+def interaction_ratios(
+    M_star: np.ndarray,
+    N_star: np.ndarray,
+    M_d: np.ndarray,
+    N_dcx: np.ndarray,
+    N_dcy: np.ndarray,
+    N_dt: np.ndarray,
+    k_12_bend: np.ndarray,
+    Z_x: np.ndarray,
+    A_t: np.ndarray,
+) -> InteractionCheck:
+    """Interaction ratios for combined bending and compression (Clause 3.5.1) and combined
+    bending and tension (Clause 3.5.2), AS1720.1:2010.
+
+    Args:
+        M_star: Design bending moment (kNm), major axis.
+        N_star: Design axial force (kN), positive in compression and negative in tension.
+        M_d: Design capacity in bending (kNm), including k_12_bend.
+        N_dcx: Design capacity in compression (kN), x-axis buckling.
+        N_dcy: Design capacity in compression (kN), y-axis buckling.
+        N_dt: Design capacity in tension (kN).
+        k_12_bend: Stability factor included in M_d.
+        Z_x: Section modulus (mm3), major axis.
+        A_t: Section tensile area (mm2).
+
+    Returns:
+        InteractionCheck: The interaction ratios.
+    """
+    M_star = np.abs(np.asarray(M_star, dtype=float))
+    N_star = np.asarray(N_star, dtype=float)
+    N_c = np.where(N_star >= 0, N_star, np.nan)
+    N_t = np.where(N_star < 0, -N_star, np.nan)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        m_ratio = M_star / M_d
+        return InteractionCheck(
+            # Eq 3.5(1) and 3.5(2)
+            compression_x=m_ratio**2 + N_c / N_dcx,
+            compression_y=m_ratio + N_c / N_dcy,
+            # Eq 3.5(3), M_d evaluated with k_12 = 1.0
+            tension=m_ratio * k_12_bend + N_t / N_dt,
+            # Eq 3.5(4), M_d evaluated with k_12 from Clause 3.2.4
+            tension_net=m_ratio - (Z_x * N_t / A_t / 1e3) / M_d,
+        )
+
+
+def check_interaction(
+    batch,
+    M_star: np.ndarray,
+    N_star: np.ndarray,
+    k_1: np.ndarray | None = None,
+) -> InteractionCheck:
+    """Combined actions check for a MemberBatch over members x load cases. Capacities solved
+    for the batch are reused for every load case, scaled by the load case duration factor
+    k_1 (capacities are proportional to k_1), so stability factors are not recalculated per
+    load case. Capacities use the batch r ratio - use MemberBatch.with_cases() to
+    re-evaluate capacities for a different r per load case.
+
+    Args:
+        batch: MemberBatch of members, shape (n,).
+        M_star: Design bending moments (kNm), shape (n,) or (n, n_cases).
+        N_star: Design axial forces (kN), positive in compression, shape (n,) or
+            (n, n_cases).
+        k_1: Optional load duration factor per load case, shape (n_cases,). If None, the
+            batch k_1 is used.
+
+    Returns:
+        InteractionCheck: The interaction ratios, shape (n,) or (n, n_cases).
+    """
+    M_star = np.asarray(M_star, dtype=float)
+    N_star = np.asarray(N_star, dtype=float)
+    per_case = k_1 is not None or max(M_star.ndim, N_star.ndim) > batch.N_dt.ndim
+    case_axis = (..., np.newaxis) if per_case else (...,)
+    scale = 1.0 if k_1 is None else np.asarray(k_1) / batch.k_1[case_axis]
+    return interaction_ratios(
+        M_star,
+        N_star,
+        M_d=batch.M_d[case_axis] * scale,
+        N_dcx=batch.N_dcx[case_axis] * scale,
+        N_dcy=batch.N_dcy[case_axis] * scale,
+        N_dt=batch.N_dt[case_axis] * scale,
+        k_12_bend=batch.k_12_bend[case_axis],
+        Z_x=batch.Z_x[case_axis],
+        A_t=batch.A_t[case_axis],
+    )
@@ -0,0 +1,128 @@
+"""
+This module provides immutable, hashable value objects and interning tables, used to share
+identical sections and materials across a model, and to use them as dictionary or cache keys.
+
+Classes:
+    ValueObject: Mixin making a dataclass read-only, hashable and comparable by content, with a
+    stable content fingerprint.
+
+    InternTable: Table of canonical value objects, so objects with equal content are shared.
+"""
+from __future__ import annotations
+
+import hashlib
+import math
+import numbers
+import weakref
+from dataclasses import fields
+from enum import Enum
+
+import numpy as np
+
+
+def _normalise(value):
+    """Normalises attribute values so equal content gives equal tuples, hashes and reprs:
+    enums to their values, numbers to float, and nan to None."""
+    if isinstance(value, Enum):
+        return value.value
+    if isinstance(value, (bool, np.bool_)):
+        return bool(value)
+    if isinstance(value, str) or value is None:
+        return value
+    if isinstance(value, numbers.Real):
+        value = float(value)
+        return None if math.isnan(value) else value
+    return value
+
+
+class ValueObject:
+    """Mixin for dataclasses, making instances read-only once initialised, and hashable and
+    comparable by the values of their init fields. Derived (init=False) fields are not part
+    of the content. Use dataclasses.replace() to create a modified copy.
+
+    Subclasses must be decorated with @dataclass(eq=False), so the generated __init__ calls
+    __post_init__ and the content based __eq__ and __hash__ are kept."""
+
+    def __post_init__(self):
+        post_init = getattr(super(), "__post_init__", None)
+        if post_init is not None:
+            post_init()
+        self.__dict__["_content"] = tuple(
+            (f.name, _normalise(getattr(self, f.name))) for f in fields(self) if f.init
+        )
+        self.__dict__["_read_only"] = True
+
+    def __setattr__(self, name, value):
+        if self.__dict__.get("_read_only", False):
+            raise AttributeError(
+                f"{type(self).__name__} is read-only, attribute {name} cannot be changed"
+            )
+        super().__setattr__(name, value)
+
+    def __delattr__(self, name):
+        raise AttributeError(f"{type(self).__name__} is read-only")
+
+    @property
+    def content(self) -> tuple:
+        """Normalised (name, value) pairs of the init fields."""
+        return self.__dict__["_content"]
+
+    @property
+    def fingerprint(self) -> str:
+        """SHA-256 hex digest of the content, stable across sessions and processes."""
+        text = repr((type(self).__name__, self.content))
+        return hashlib.sha256(text.encode()).hexdigest()
+
+    def __hash__(self) -> int:
+        return hash(self.content)
+
+    def __eq__(self, other) -> bool:
+        if not isinstance(other, ValueObject):
+            return NotImplemented
+        return type(self) is type(other) and self.content == other.content
+
+
+class InternTable:
+    """Weak table of canonical value objects keyed by content. intern() returns the object
+    already held for equal content, so identical sections or materials are shared, and
+    objects are released once no longer referenced elsewhere.
+
+    Attributes:
+        hits (int): Number of intern() calls returning an existing object.
+        misses (int): Number of intern() calls adding a new object.
+    """
+
+    def __init__(self):
+        self._table: weakref.WeakValueDictionary = weakref.WeakValueDictionary()
+        self.hits = 0
+        self.misses = 0
+
+    def __len__(self) -> int:
+        return len(self._table)
+
+    def __contains__(self, obj: ValueObject) -> bool:
+        return (type(obj), obj.content) in self._table
+
+    def intern(self, obj: ValueObject) -> ValueObject:
+        """Returns the canonical object with the same content as obj, adding obj if there is
+        none.
+
+        Args:
+            obj: The value object.
+
+        Returns:
+            ValueObject: The canonical (shared) object.
+        """
+        key = (type(obj), obj.content)
+        canonical = self._table.get(key)
+        if canonical is not None:
+            self.hits += 1
+            return canonical
+        self.misses += 1
+        self._table[key] = obj
+        return obj
+
+    @property
+    def stats(self) -> dict[str, int]:
+        """Interning statistics."""
+        return {"hits": self.hits, "misses": self.misses, "size": len(self)}
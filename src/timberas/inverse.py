@@ -0,0 +1,176 @@
+"""
+This module provides closed-form inverse design solvers. The piecewise stability factor curve
+k_12 (1, 1.5 - 0.05 rho S, 200 / (rho S)^2) is inverted analytically, so the largest member
+length or restraint spacing for a design action is found without iteration or rebuilding
+members. Solvers accept a MemberBatch (or a single member) and scalar or array actions;
+actions with a trailing load case axis give solutions of shape batch.shape + (n_cases,).
+
+Solutions are exact for the AS1720.1 formulas; the member classes round slenderness
+coefficients to 2 decimal places, so capacities re-evaluated at a solution may differ in the
+last significant figure.
+
+Functions:
+    calc_k12_inverse(): Largest rho S product for a required stability factor k_12.
+
+    max_length_for(): Largest member length L for which a capacity exceeds an action.
+
+    max_restraint_spacing_for(): Largest restraint spacing L_ay for which a capacity exceeds
+    an action.
+
+    required_section_modulus_for(): Section modulus Z_x required for a bending action.
+"""
+from __future__ import annotations
+
+import numpy as np
+
+from timberas.batch import MemberBatch
+from timberas.member import TimberMember, RestraintEdge
+
+
+def calc_k12_inverse(k_12: np.ndarray) -> np.ndarray:
+    """Largest product of material constant and slenderness coefficient (rho S) for which the
+    stability factor is at least k_12, Clause 3.2.4 and 3.3.3, AS1720.1:2010. Returns inf for
+    k_12 <= 0 and nan for k_12 > 1 (not achievable)."""
+    k_12 = np.asarray(k_12, dtype=float)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        return np.select(
+            [k_12 > 1, k_12 <= 0, k_12 == 1, k_12 >= 0.5],
+            [np.nan, np.inf, 10.0, (1.5 - k_12) / 0.05],
+            default=np.sqrt(200 / k_12),
+        )
+
+
+def _as_batch(member: MemberBatch | TimberMember, action: np.ndarray) -> MemberBatch:
+    """MemberBatch for a member, with a trailing load case axis if the action has more
+    dimensions than the batch."""
+    if isinstance(member, TimberMember):
+        member = MemberBatch.from_members([member])
+    if np.ndim(action) > len(member.shape):
+        member = member.with_cases()
+    return member
+
+
+def _k_12_required(batch: MemberBatch, action: np.ndarray, capacity: str) -> np.ndarray:
+    """Stability factor required for the capacity to equal the action."""
+    action = np.abs(np.asarray(action, dtype=float))
+    if capacity in ("N_dc", "N_dcx", "N_dcy"):
+        unstable = batch._k_common * batch.f_c * batch.A_c / 1000
+    elif capacity == "M_d":
+        unstable = batch._k_common * batch.k_9 * batch.f_b * batch.Z_x / 1e6
+    else:
+        raise ValueError(f"capacity {capacity} not supported, use N_dc or M_d")
+    return action / unstable
+
+
+def max_length_for(
+    member: MemberBatch | TimberMember,
+    action: np.ndarray,
+    capacity: str = "N_dc",
+    L_ay_follows_L: bool | np.ndarray = False,
+) -> np.ndarray:
+    """Largest member length L for which the design capacity is at least the design action.
+    Restraint spacings are held at the member values, unless L_ay_follows_L.
+
+    Args:
+        member: MemberBatch or single member.
+        action: Design action, N* (kN) for N_dc or M* (kNm) for M_d.
+        capacity: 'N_dc' (minimum of x- and y-axis buckling) or 'M_d'.
+        L_ay_follows_L: If True, the y-axis restraint spacing L_ay is equal to L (no
+            intermediate restraint). For M_d, L only enters through L_ay.
+
+    Returns:
+        np.ndarray: Largest length (mm), inf if not limited by stability, nan if the action
+        exceeds the capacity at any length.
+    """
+    batch = _as_batch(member, action)
+    k_req = _k_12_required(batch, action, capacity)
+    follows = np.asarray(L_ay_follows_L, dtype=bool)
+    if capacity == "M_d":
+        L_ay = max_restraint_spacing_for(batch, action, "M_d")
+        # with restraint held, L does not limit M_d if the member L_ay is sufficient
+        return np.where(follows, L_ay, np.where(batch.L_ay <= L_ay, np.inf, np.nan))
+
+    S_max = calc_k12_inverse(k_req) / batch.rho_c
+    with np.errstate(divide="ignore", invalid="ignore"):
+        # x-axis, S3 = g_13_x L / d
+        L_x = S_max * batch.d / batch.g_13_x
+        # y-axis, S4 = min(L_ay / b, g_13_y L / b)
+        L_y_fixed = np.where(batch.L_ay / batch.b <= S_max, np.inf, S_max * batch.b / batch.g_13_y)
+        L_y_follows = S_max * batch.b / np.minimum(1, batch.g_13_y)
+    L_y = np.where(follows, L_y_follows, L_y_fixed)
+    if capacity == "N_dcx":
+        return L_x
+    if capacity == "N_dcy":
+        return L_y
+    return np.minimum(L_x, L_y)
+
+
+def max_restraint_spacing_for(
+    member: MemberBatch | TimberMember,
+    action: np.ndarray,
+    capacity: str = "M_d",
+) -> np.ndarray:
+    """Largest y-axis restraint spacing L_ay for which the design capacity is at least the
+    design action, with member length L held at the member values.
+
+    For M_d, restraint at spacings up to L_CLR is continuous (Clause 3.2.3.2), so the
+    solution is the larger of L_CLR (if the continuous restraint S1 is sufficient) and the
+    discrete restraint solution of Eq 3.2(4) or 3.2(5).
+
+    Args:
+        member: MemberBatch or single member.
+        action: Design action, N* (kN) for N_dc or M* (kNm) for M_d.
+        capacity: 'M_d' or 'N_dc'.
+
+    Returns:
+        np.ndarray: Largest restraint spacing (mm), inf if not limited by L_ay, nan if no
+        restraint spacing gives the required capacity (or for tension_and_torsional
+        restraint, which has no discrete restraint formula).
+    """
+    batch = _as_batch(member, action)
+    k_req = _k_12_required(batch, action, capacity)
+    d, b = batch.d, batch.b
+    if capacity in ("N_dc", "N_dcy"):
+        S_max = calc_k12_inverse(k_req) / batch.rho_c
+        # S4 = min(L_ay / b, g_13_y L / b); N_dcx does not depend on L_ay
+        L_ay = np.where(batch.g_13_y * batch.L / b <= S_max, np.inf, S_max * b)
+        if capacity == "N_dc":
+            x_ok = batch.rho_c * batch.S3 <= calc_k12_inverse(k_req)
+            L_ay = np.where(x_ok, L_ay, np.nan)
+        return np.where(np.isnan(S_max), np.nan, L_ay)
+
+    S1_max = calc_k12_inverse(k_req) / batch.rho_b
+    edge = batch.restraint_edge
+    compression = (edge == RestraintEdge.COMPRESSION.value) | (edge == RestraintEdge.BOTH.value)
+    tension = edge == RestraintEdge.TENSION.value
+    d_on_b = d / b
+    with np.errstate(invalid="ignore", over="ignore"):
+        # discrete restraint, Eq 3.2(4) and 3.2(5) inverted
+        L_discrete = np.select(
+            [compression, tension],
+            [d * (S1_max / (1.25 * d_on_b)) ** 2, d * (S1_max / d_on_b**1.35) ** 4],
+            default=np.nan,
+        )
+        # continuous restraint, Cl 3.2.3.2(b) and Eq 3.2(7)
+        S1_continuous = np.select([compression, tension], [0.0, 2.25 * d_on_b], np.nan)
+    L_CLR = batch.L_CLR
+    L_ay = np.where(
+        L_discrete > L_CLR,
+        L_discrete,
+        np.where(S1_continuous <= S1_max, L_CLR, np.nan),
+    )
+    L_ay = np.where(np.isnan(S1_max), np.nan, L_ay)
+    # x-axis is the minor axis, k_12_bend = 1.0
+    return np.where((batch.I_x < batch.I_y) & (k_req <= 1), np.inf, L_ay)
+
+
+def required_section_modulus_for(
+    member: MemberBatch | TimberMember,
+    action: np.ndarray,
+) -> np.ndarray:
+    """Section modulus Z_x (mm3) required for a design bending moment M* (kNm), with the
+    member modification factors and stability factor k_12_bend held at the member values,
+    Clause 3.2.1.1, AS1720.1:2010."""
+    batch = _as_batch(member, action)
+    action = np.abs(np.asarray(action, dtype=float))
+    return action * 1e6 / (batch._k_common * batch.k_9 * batch.k_12_bend * batch.f_b)
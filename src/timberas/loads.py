@@ -0,0 +1,407 @@
+"""
+This module provides vectorised load combinations and utilisation checks. Design action
+effects are factored for every combination in a combination table in one pass, with the load
+duration factor k_1 and the ratio of temporary to total design action effect r for each
+combination, and checked against MemberBatch capacities evaluated for every combination.
+
+A combination table is a DataFrame with one row per combination, with columns:
+    name: combination name.
+    k_1: load duration factor for the combination (AS1720.1 Table 2.3, Appendix G).
+    limit_state: 'strength' or 'serviceability'.
+    remaining columns: load factor for each action type, e.g. G, Q, Wu, Ws.
+
+Classes:
+    CombinedActions: Factored design action effects and r ratios for each combination.
+
+    CombinationCheck: Capacities, utilisations and governing combination per member.
+
+Load cases which cannot govern may be skipped with check_combinations(prune=True). Capacities
+are proportional to k_1 and increase with r (through rho, Section E2), so bounds on each
+capacity are found from two evaluations per member at the lowest and highest r of its cases.
+A case is skipped where its upper utilisation bound is below the lower utilisation bound of
+another case of the same member, so the governing combination and utilisation are unchanged.
+M_d is not monotonic in r where the r range of a member crosses the continuous lateral
+restraint limit L_CLR (Clause 3.2.3.2), so every M_d case of such a member is evaluated.
+
+Functions:
+    as1170_combinations(): AS/NZS1170.0 combination table.
+
+    wall_frame_combinations(): AS1720.3 wall frame (stud) axial combination table.
+
+    combine_actions(): Factored design action effects for a combination table.
+
+    check_combinations(): Utilisation of a MemberBatch for all combinations.
+
+    utilisation_bounds(): Lower and upper utilisation bounds for all combinations.
+
+    dominated_cases(): Cases dominated by an earlier case of the same member.
+"""
+from __future__ import annotations
+
+from dataclasses import dataclass
+
+import numpy as np
+import pandas as pd
+
+from timberas.batch import MemberBatch, S1_CAPACITIES, round_sig_figs
+from timberas.AS1684_dicts import k1_lookup
+
+TABLE_COLUMNS = ("name", "k_1", "limit_state")
+
+# action types treated as permanent when calculating r, all others are temporary
+PERMANENT_ACTIONS = ("G",)
+
+
+def as1170_combinations(
+    psi_s: float = 0.7,
+    psi_l: float = 0.4,
+    psi_c: float = 0.4,
+    k_1_Q: float = 0.8,
+) -> pd.DataFrame:
+    """Combinations of permanent (G), imposed (Q), ultimate wind (Wu) and serviceability wind
+    (Ws) actions, AS/NZS1170.0 Clause 4.2.2 and Clause 4.3. Default combination factors are for
+    residential and office floors (Table 4.1).
+
+    Args:
+        psi_s: Short-term combination factor.
+        psi_l: Long-term combination factor.
+        psi_c: Combination factor for imposed action with wind.
+        k_1_Q: Load duration factor for the imposed action, defaults to 0.8 for 5 months
+            (AS1720.1 Table G1).
+
+    Returns:
+        pd.DataFrame: The combination table.
+    """
+    rows = [
+        ("1.35G", 0.57, "strength", 1.35, 0, 0, 0),
+        ("1.2G+1.5Q", k_1_Q, "strength", 1.2, 1.5, 0, 0),
+        ("1.2G+1.5psi_l.Q", 0.57, "strength", 1.2, 1.5 * psi_l, 0, 0),
+        ("1.2G+Wu+psi_c.Q", 1.0, "strength", 1.2, psi_c, 1, 0),
+        ("0.9G+Wu", 1.0, "strength", 0.9, 0, 1, 0),
+        ("G+psi_s.Q", np.nan, "serviceability", 1, psi_s, 0, 0),
+        ("G+psi_l.Q", np.nan, "serviceability", 1, psi_l, 0, 0),
+        ("G+Ws", np.nan, "serviceability", 1, 0, 0, 1),
+    ]
+    return pd.DataFrame(rows, columns=[*TABLE_COLUMNS, "G", "Q", "Wu", "Ws"])
+
+
+def wall_frame_combinations() -> pd.DataFrame:
+    """Wall frame axial load cases, Table 3.2.2.3, AS1720.3:2016, with k_1 from Table 3.2.2.4.
+    Action types are G, Q1, Q2, Q3, Wu_c (downwards wind) and Wu_t (upwards wind, negative).
+    Equivalent to wall_frame_design_load_cases_axial(), with each load case split into its
+    component combinations."""
+    rows = [
+        ("LC1 1.35G", k1_lookup("LC1"), 1.35, 0, 0, 0, 0, 0),
+        ("LC1 1.2G+1.5Q1", k1_lookup("LC1"), 1.2, 1.5, 0, 0, 0, 0),
+        ("LC2 1.2G+1.5Q3", k1_lookup("LC2"), 1.2, 0, 0, 1.5, 0, 0),
+        ("LC3 1.2G+1.5Q2", k1_lookup("LC3"), 1.2, 0, 1.5, 0, 0, 0),
+        ("LC4 1.2G+Wu+Q1", k1_lookup("LC4"), 1.2, 1, 0, 0, 1, 0),
+        ("LC4 1.2G+Q1", k1_lookup("LC4"), 1.2, 1, 0, 0, 0, 0),
+        ("LC5 0.9G+Wu", k1_lookup("LC5"), 0.9, 0, 0, 0, 0, 1),
+    ]
+    table = pd.DataFrame(
+        rows, columns=["name", "k_1", "G", "Q1", "Q2", "Q3", "Wu_c", "Wu_t"]
+    )
+    table.insert(2, "limit_state", "strength")
+    return table
+
+
+@dataclass
+class CombinedActions:
+    """Factored design action effects for each combination of a combination table.
+
+    Attributes:
+        names (np.ndarray): Combination names, shape (n_cases,).
+        k_1 (np.ndarray): Load duration factor per combination, shape (n_cases,).
+        limit_state (np.ndarray): Limit state per combination, shape (n_cases,).
+        actions (np.ndarray): Factored design action effects, shape (..., n_cases).
+        r (np.ndarray): Ratio of temporary to total design action effect, shape
+            (..., n_cases). Zero where the total design action effect is zero, and limited
+            to the range 0 to 1 where permanent and temporary effects have opposite signs.
+    """
+
+    names: np.ndarray
+    k_1: np.ndarray
+    limit_state: np.ndarray
+    actions: np.ndarray
+    r: np.ndarray
+
+    def select(self, limit_state: str) -> CombinedActions:
+        """Returns the combinations for one limit state."""
+        mask = self.limit_state == limit_state
+        return CombinedActions(
+            names=self.names[mask],
+            k_1=self.k_1[mask],
+            limit_state=self.limit_state[mask],
+            actions=self.actions[..., mask],
+            r=self.r[..., mask],
+        )
+
+
+def combine_actions(
+    combinations: pd.DataFrame | None = None,
+    permanent: tuple[str, ...] = PERMANENT_ACTIONS,
+    **actions: np.ndarray,
+) -> CombinedActions:
+    """Calculates factored design action effects and r ratios for all combinations in one
+    vectorised pass.
+
+    Args:
+        combinations: Combination table, defaults to as1170_combinations().
+        permanent: Action types treated as permanent when calculating r.
+        actions: Unfactored action effect arrays (or scalars) for each action type in the
+            combination table, e.g. G=..., Q=..., Wu=.... Action types not provided are zero.
+
+    Returns:
+        CombinedActions: Factored action effects with shape actions_shape + (n_cases,).
+
+    Raises:
+        ValueError: If an action type is not a column of the combination table.
+    """
+    if combinations is None:
+        combinations = as1170_combinations()
+    action_names = [col for col in combinations.columns if col not in TABLE_COLUMNS]
+    unknown = set(actions) - set(action_names)
+    if unknown:
+        raise ValueError(
+            f"action types {sorted(unknown)} not in combination table {action_names}"
+        )
+
+    values = np.broadcast_arrays(
+        *[np.asarray(actions.get(name, 0.0), dtype=float) for name in action_names]
+    )
+    values = np.stack(values, axis=-1)  # (..., n_actions)
+    factors = combinations[action_names].to_numpy(dtype=float)  # (n_cases, n_actions)
+    temporary = ~np.isin(action_names, permanent)
+
+    total = values @ factors.T
+    temp = values[..., temporary] @ factors[:, temporary].T
+    r = np.divide(temp, total, out=np.zeros_like(total), where=total != 0)
+
+    return CombinedActions(
+        names=combinations["name"].to_numpy(),
+        k_1=combinations["k_1"].to_numpy(dtype=float),
+        limit_state=combinations["limit_state"].to_numpy(),
+        actions=total,
+        r=np.clip(r, 0, 1),
+    )
+
+
+@dataclass
+class CombinationCheck:
+    """Member capacities and utilisations for each combination.
+
+    Attributes:
+        names (np.ndarray): Combination names, shape (n_cases,).
+        actions (np.ndarray): Factored design action effects, shape (..., n_cases).
+        capacities (np.ndarray): Design capacities, shape (..., n_cases).
+        utilisation (np.ndarray): |action| / capacity, shape (..., n_cases).
+        governing (np.ndarray): Index of the governing combination per member.
+        evaluated (np.ndarray): True for evaluated cases, shape (..., n_cases). Capacities
+            and utilisations of skipped cases are nan.
+    """
+
+    names: np.ndarray
+    actions: np.ndarray
+    capacities: np.ndarray
+    utilisation: np.ndarray
+    governing: np.ndarray
+    evaluated: np.ndarray | None = None
+
+    @property
+    def n_skipped(self) -> int:
+        """Number of member and case evaluations avoided by pruning."""
+        if self.evaluated is None:
+            return 0
+        return int(self.evaluated.size - np.count_nonzero(self.evaluated))
+
+    @property
+    def governing_name(self) -> np.ndarray:
+        """Name of the governing combination per member."""
+        return self.names[self.governing]
+
+    @property
+    def util_max(self) -> np.ndarray:
+        """Utilisation of the governing combination per member."""
+        return np.take_along_axis(
+            self.utilisation, self.governing[..., np.newaxis], axis=-1
+        )[..., 0]
+
+    @property
+    def passed(self) -> np.ndarray:
+        """True where the member passes all combinations."""
+        return self.util_max <= 1.0
+
+
+def check_combinations(
+    batch: MemberBatch,
+    combined: CombinedActions,
+    capacity: str = "N_dc",
+    negative_capacity: str | None = None,
+    limit_state: str = "strength",
+    prune: bool = False,
+) -> CombinationCheck:
+    """Evaluates member capacities with the k_1 and r of every combination and the utilisation
+    of each combination, without looping over combinations.
+
+    Args:
+        batch: Members to check, shape (n,).
+        combined: Factored actions from combine_actions(), shape (n, n_cases).
+        capacity: MemberBatch capacity to check positive actions against, e.g. 'N_dc', 'M_d'.
+        negative_capacity: Capacity to check negative actions against, e.g. 'N_dt' for
+            uplift. If None, negative actions are checked against capacity.
+        limit_state: Limit state of the combinations to check.
+        prune: If True, cases which cannot govern are not evaluated, see utilisation_bounds()
+            and dominated_cases().
+            The governing combination and its utilisation are the same as without pruning.
+
+    Returns:
+        CombinationCheck: Capacities, utilisations and governing combination per member.
+    """
+    combined = combined.select(limit_state)
+    if prune:
+        return _check_pruned(batch, combined, capacity, negative_capacity)
+    cases = batch.with_cases(k_1=combined.k_1, r=combined.r)
+    capacities = getattr(cases, capacity)
+    if negative_capacity is not None:
+        capacities = np.where(
+            combined.actions < 0, getattr(cases, negative_capacity), capacities
+        )
+    utilisation = np.abs(combined.actions) / capacities
+    return CombinationCheck(
+        names=combined.names,
+        actions=combined.actions,
+        capacities=capacities,
+        utilisation=utilisation,
+        governing=np.argmax(utilisation, axis=-1),
+    )
+
+
+def utilisation_bounds(
+    batch: MemberBatch,
+    combined: CombinedActions,
+    capacity: str = "N_dc",
+    negative_capacity: str | None = None,
+) -> tuple[np.ndarray, np.ndarray]:
+    """Lower and upper bounds of the utilisation of each member and combination, from two
+    evaluations per member. Unrounded capacities are proportional to k_1, and increase with
+    the ratio r used for rho (0.25 where r <= 0), so for each case the capacity lies between
+    k_1 times the capacities at the lowest and highest r of the member cases with k_1 = 1.
+    Rounding to significant figures preserves the order of values, so the bounds hold for
+    rounded capacities. L_CLR increases with r, so where lateral restraint is continuous at
+    one end of the r range and not the other, M_d may decrease with r; those cases are not
+    bounded (lower bound 0, upper bound inf).
+
+    Args:
+        batch: Members to check, shape (n,).
+        combined: Factored actions, shape (n, n_cases).
+        capacity: Capacity checked against positive actions.
+        negative_capacity: Capacity checked against negative actions, defaults to capacity.
+
+    Returns:
+        tuple[np.ndarray, np.ndarray]: Lower and upper utilisation bounds, shape (n, n_cases).
+    """
+    r_rho = np.where(combined.r > 0, combined.r, 0.25)
+    r_range = np.stack([r_rho.min(axis=-1), r_rho.max(axis=-1)], axis=-1)
+    values = {name: getattr(batch, name) for name in batch.input_names()}
+    ends = MemberBatch(
+        **{name: val[..., np.newaxis] for name, val in values.items()}
+        | {"k_1": 1.0, "r": r_range},
+        sig_figs=0,
+    )
+    # relative margin for floating point differences in the order of multiplication
+    margin = 1e-9
+
+    def bound(name: str, end: int, factor: float) -> np.ndarray:
+        val = combined.k_1 * getattr(ends, name)[..., end : end + 1] * factor
+        return round_sig_figs(val, batch.sig_figs) if batch.sig_figs else val
+
+    cap_lo = bound(capacity, 0, 1 - margin)
+    cap_hi = bound(capacity, 1, 1 + margin)
+    if negative_capacity is not None:
+        negative = combined.actions < 0
+        cap_lo = np.where(negative, bound(negative_capacity, 0, 1 - margin), cap_lo)
+        cap_hi = np.where(negative, bound(negative_capacity, 1, 1 + margin), cap_hi)
+    # M_d cases of members whose r range crosses L_CLR
+    crossing = (ends.CLR[..., 0] != ends.CLR[..., 1])[..., np.newaxis]
+    s1_case = np.full(combined.actions.shape, capacity in S1_CAPACITIES)
+    if negative_capacity is not None:
+        s1_case = np.where(negative, negative_capacity in S1_CAPACITIES, s1_case)
+    unbounded = crossing & s1_case
+    action = np.abs(combined.actions)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        util_lo = np.where(unbounded, 0.0, action / cap_hi)
+        util_hi = np.where(unbounded, np.inf, action / cap_lo)
+    return util_lo, util_hi
+
+
+def dominated_cases(
+    combined: CombinedActions, negative_capacity: str | None = None
+) -> np.ndarray:
+    """Cases dominated by an earlier case of the same member: a case checked against the same
+    capacity with an equal or larger action, equal or lower k_1 and equal or lower r (used for
+    rho) has an equal or higher utilisation, so the dominated case is not the first governing
+    case. For example, wall frame LC2 and LC3 with no Q3 or Q2 are dominated by LC1. This
+    does not hold for M_d where the r range of a member crosses L_CLR, see
+    utilisation_bounds().
+
+    Args:
+        combined: Factored actions, shape (n, n_cases).
+        negative_capacity: Capacity checked against negative actions, if any.
+
+    Returns:
+        np.ndarray: True for dominated cases, shape (n, n_cases).
+    """
+    action = np.abs(combined.actions)[..., :, np.newaxis]
+    r_rho = np.where(combined.r > 0, combined.r, 0.25)[..., :, np.newaxis]
+    k_1 = combined.k_1[:, np.newaxis]
+    # [..., j, i]: case j dominated by case i
+    dominated = (
+        (np.swapaxes(action, -1, -2) >= action)
+        & (k_1.T <= k_1)
+        & (np.swapaxes(r_rho, -1, -2) <= r_rho)
+    )
+    if negative_capacity is not None:
+        negative = (combined.actions < 0)[..., :, np.newaxis]
+        dominated &= np.swapaxes(negative, -1, -2) == negative
+    n_cases = len(combined.k_1)
+    earlier = np.arange(n_cases)[np.newaxis, :] < np.arange(n_cases)[:, np.newaxis]
+    return np.any(dominated & earlier, axis=-1)
+
+
+def _check_pruned(
+    batch: MemberBatch,
+    combined: CombinedActions,
+    capacity: str,
+    negative_capacity: str | None,
+) -> CombinationCheck:
+    """check_combinations() evaluating only cases which may govern."""
+    util_lo, util_hi = utilisation_bounds(batch, combined, capacity, negative_capacity)
+    # a case may govern unless its upper bound is below the lower bound of another case
+    best_lo = np.max(np.where(np.isnan(util_lo), -np.inf, util_lo), axis=-1, keepdims=True)
+    # dominance assumes capacity increases with r, which does not hold for unbounded cases
+    dominated = dominated_cases(combined, negative_capacity) & ~np.isposinf(util_hi)
+    evaluated = ~(util_hi < best_lo) & ~dominated
+    i_mem, i_case = np.nonzero(evaluated)
+
+    values = {name: getattr(batch, name)[i_mem] for name in batch.input_names()}
+    values |= {"k_1": combined.k_1[i_case], "r": combined.r[i_mem, i_case]}
+    pairs = MemberBatch(**values, sig_figs=batch.sig_figs)
+    actions = combined.actions[i_mem, i_case]
+    caps = getattr(pairs, capacity)
+    if negative_capacity is not None:
+        caps = np.where(actions < 0, getattr(pairs, negative_capacity), caps)
+
+    capacities = np.full(combined.actions.shape, np.nan)
+    capacities[i_mem, i_case] = caps
+    utilisation = np.full(combined.actions.shape, np.nan)
+    utilisation[i_mem, i_case] = np.abs(actions) / caps
+    governing = np.argmax(np.where(evaluated, utilisation, -np.inf), axis=-1)
+    return CombinationCheck(
+        names=combined.names,
+        actions=combined.actions,
+        capacities=capacities,
+        utilisation=utilisation,
+        governing=governing,
+        evaluated=evaluated,
+    )
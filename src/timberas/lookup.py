@@ -0,0 +1,270 @@
+"""
+This module provides precomputed capacity lookup tables for fast approximate design feedback.
+Capacities are precomputed with library_sweep() for each (section, grade, g_13, r) over a
+dense grid of member length L and restraint spacing L_ay, and queries are answered by
+bilinear interpolation.
+
+Error bound: with no grid load sharing (k_9 independent of L), member capacities do not
+increase with L or L_ay, except where M_d jumps at the continuous lateral restraint limit
+L_CLR (Clause 3.2.3.2). So within a grid cell the exact capacity lies between the values at
+the (L0, L_ay0) and (L1, L_ay1) corners, and the interpolation error is at most their
+difference. Queries in cells where this bound exceeds the table tolerance (e.g. across the
+k_12 breakpoints on a coarse grid), in cells containing L_CLR, or outside the grid, are
+evaluated exactly with MemberBatch (which reproduces the TimberMember capacities).
+
+Classes:
+    CapacityTable: Precomputed capacities with bounded-error interpolation.
+"""
+from __future__ import annotations
+
+import json
+import os
+from dataclasses import dataclass, field
+
+import numpy as np
+import pandas as pd
+
+from timberas.batch import MemberBatch, CAPACITY_NAMES, S1_CAPACITIES, _axis_value
+from timberas.material import GradeType, SIZED_MATERIALS, SizedMaterialCache
+from timberas.sweep import SweepResult, library_sweep, open_sweep
+
+TABLE_META_FILE = "table.json"
+TABLE_DIMS = ("sec", "mat", "g_13", "r", "L", "L_ay")
+
+
+@dataclass
+class CapacityTable:
+    """Precomputed member capacities over (sec, mat, g_13, r, L, L_ay) grids.
+
+    Attributes:
+        sweep (SweepResult): Tabulated capacities and L_CLR, dims TABLE_DIMS.
+        tolerance (float): Maximum relative interpolation error; queries with a larger error
+            bound are evaluated exactly.
+        member_inputs (dict): Member inputs shared by all tabulated members.
+        stats (dict): Number of interpolated and exact query points.
+        section_library (pd.DataFrame, optional): Sections of exact evaluation, defaults to
+            import_section_library().
+        material_library (pd.DataFrame, optional): Materials of exact evaluation, defaults to
+            import_material_library().
+    """
+
+    sweep: SweepResult
+    tolerance: float = 0.01
+    member_inputs: dict = field(default_factory=dict)
+    stats: dict = field(default_factory=lambda: {"interpolated": 0, "exact": 0}, repr=False)
+    section_library: pd.DataFrame | None = field(default=None, repr=False, compare=False)
+    material_library: pd.DataFrame | None = field(default=None, repr=False, compare=False)
+
+    def __post_init__(self):
+        # size-adjusted materials of exact evaluation, shared across queries
+        if self.material_library is None:
+            self._sized_materials = SIZED_MATERIALS
+        else:
+            self._sized_materials = SizedMaterialCache(library=self.material_library)
+
+    @classmethod
+    def build(
+        cls,
+        L: np.ndarray,
+        L_ay: np.ndarray,
+        g_13: np.ndarray = (1.0,),
+        r: np.ndarray = (0.25,),
+        sections: list[str] | None = None,
+        materials: list[str] | None = None,
+        outputs: tuple[str, ...] = ("N_dc", "M_d"),
+        member_inputs: dict | None = None,
+        tolerance: float = 0.01,
+        out_dir: str | None = None,
+        section_library: pd.DataFrame | None = None,
+        material_library: pd.DataFrame | None = None,
+    ) -> CapacityTable:
+        """Precomputes capacities for library section/grade pairs, see library_sweep().
+
+        Args:
+            L: Member length grid (mm), increasing. Geometric grids (np.geomspace) with a
+                step ratio of about tolerance / 4 keep most queries interpolated.
+            L_ay: Restraint spacing grid (mm), increasing.
+            g_13: Effective length factors tabulated.
+            r: Ratios of temporary to total design action effect tabulated.
+            sections: Section names, defaults to all library sections.
+            materials: Material names, defaults to all matched library materials.
+            outputs: Capacities tabulated, from CAPACITY_NAMES.
+            member_inputs: Member inputs shared by all members (not L, L_a, g_13, r, s).
+            tolerance: Maximum relative interpolation error.
+            out_dir: Optional directory the table is written to (memory-mapped).
+            section_library: DataFrame of sections, defaults to import_section_library().
+            material_library: DataFrame of materials, defaults to import_material_library().
+
+        Returns:
+            CapacityTable: The capacity table.
+        """
+        member_inputs = {} if member_inputs is None else dict(member_inputs)
+        if member_inputs.get("s", 0) != 0:
+            raise ValueError("capacity tables require k_9 independent of L (s = 0)")
+        if set(outputs) - set(CAPACITY_NAMES):
+            raise ValueError(f"outputs must be capacities from {CAPACITY_NAMES}")
+        member_inputs.setdefault("L_a", {"x": None, "y": None})
+        result = library_sweep(
+            sections=sections,
+            materials=materials,
+            outputs=tuple(outputs) + ("L_CLR",),
+            member_inputs=member_inputs,
+            section_library=section_library,
+            material_library=material_library,
+            out_dir=out_dir,
+            g_13=np.asarray(g_13, dtype=float),
+            r=np.asarray(r, dtype=float),
+            L=np.asarray(L, dtype=float),
+            L_ay=np.asarray(L_ay, dtype=float),
+        )
+        table = cls(
+            sweep=result,
+            tolerance=tolerance,
+            member_inputs=member_inputs,
+            section_library=section_library,
+            material_library=material_library,
+        )
+        if out_dir is not None:
+            table._write_meta(out_dir)
+        return table
+
+    def save(self, out_dir: str) -> None:
+        """Writes the table to out_dir, reloaded with CapacityTable.load()."""
+        if self.sweep.path is None or os.path.abspath(self.sweep.path) != os.path.abspath(
+            out_dir
+        ):
+            self.sweep.save(out_dir)
+        self._write_meta(out_dir)
+
+    def _write_meta(self, out_dir: str) -> None:
+        with open(os.path.join(out_dir, TABLE_META_FILE), "w", encoding="utf-8") as f:
+            json.dump({"tolerance": self.tolerance, "member_inputs": self.member_inputs}, f)
+
+    @classmethod
+    def load(
+        cls,
+        out_dir: str,
+        section_library: pd.DataFrame | None = None,
+        material_library: pd.DataFrame | None = None,
+    ) -> CapacityTable:
+        """Reloads a table written with CapacityTable.build(out_dir=...) or save(); arrays are
+        memory-mapped. Libraries are not saved with the table, so a table built from custom
+        libraries is reloaded with the same libraries for exact evaluation.
+
+        Args:
+            out_dir: Directory the table was written to.
+            section_library: DataFrame of sections, defaults to import_section_library().
+            material_library: DataFrame of materials, defaults to import_material_library().
+
+        Returns:
+            CapacityTable: The capacity table.
+        """
+        with open(os.path.join(out_dir, TABLE_META_FILE), encoding="utf-8") as f:
+            meta = json.load(f)
+        return cls(
+            sweep=open_sweep(out_dir),
+            section_library=section_library,
+            material_library=material_library,
+            **meta,
+        )
+
+    def _index(self, dim: str, value) -> int | None:
+        coords = self.sweep.coords[dim]
+        if coords.dtype.kind in "fiu":
+            match = np.flatnonzero(np.isclose(coords, value))
+        else:
+            match = np.flatnonzero(coords == value)
+        return int(match[0]) if len(match) else None
+
+    def query(
+        self,
+        sec: str,
+        mat: str,
+        L: np.ndarray,
+        L_ay: np.ndarray,
+        output: str = "N_dc",
+        g_13: float = 1.0,
+        r: float = 0.25,
+        return_bound: bool = False,
+    ) -> np.ndarray | tuple[np.ndarray, np.ndarray]:
+        """Capacity for a section/grade pair at lengths L and restraint spacings L_ay.
+
+        Args:
+            sec: Section name.
+            mat: Material name.
+            L: Member lengths (mm).
+            L_ay: Restraint spacings (mm), broadcast against L.
+            output: Tabulated capacity name.
+            g_13: Effective length factor; evaluated exactly if not tabulated.
+            r: Ratio of temporary to total design action effect; evaluated exactly if not
+                tabulated.
+            return_bound: If True, also returns the absolute error bound (0 where evaluated
+                exactly).
+
+        Returns:
+            np.ndarray: Capacities, and error bounds if return_bound.
+        """
+        L, L_ay = np.broadcast_arrays(np.asarray(L, dtype=float), np.asarray(L_ay, dtype=float))
+        value = np.full(L.shape, np.nan)
+        bound = np.zeros(L.shape)
+        exact = np.ones(L.shape, dtype=bool)
+
+        index = [self._index(dim, val) for dim, val in zip(TABLE_DIMS[:4], (sec, mat, g_13, r))]
+        if index[0] is None or index[1] is None:
+            raise KeyError(f"{sec}/{mat} not in capacity table")
+        if None not in index:
+            grid = self.sweep[output][tuple(index)]
+            L_grid, A_grid = self.sweep.coords["L"], self.sweep.coords["L_ay"]
+            i = np.clip(np.searchsorted(L_grid, L, side="right") - 1, 0, len(L_grid) - 2)
+            j = np.clip(np.searchsorted(A_grid, L_ay, side="right") - 1, 0, len(A_grid) - 2)
+            c00, c10 = grid[i, j], grid[i + 1, j]
+            c01, c11 = grid[i, j + 1], grid[i + 1, j + 1]
+            t = (L - L_grid[i]) / (L_grid[i + 1] - L_grid[i])
+            u = (L_ay - A_grid[j]) / (A_grid[j + 1] - A_grid[j])
+            value = (1 - t) * (1 - u) * c00 + t * (1 - u) * c10 + (1 - t) * u * c01 + t * u * c11
+            bound = np.maximum(value - c11, c00 - value)
+            inside = (
+                (L >= L_grid[0]) & (L <= L_grid[-1]) & (L_ay >= A_grid[0]) & (L_ay <= A_grid[-1])
+            )
+            exact = ~inside | (bound > self.tolerance * np.abs(c11)) | np.isnan(bound)
+            if output in S1_CAPACITIES:
+                L_CLR = self.sweep["L_CLR"][tuple(index)][0, 0]
+                exact |= (A_grid[j] <= L_CLR) & (L_CLR < A_grid[j + 1])
+            if np.isnan(grid[0, 0]):
+                # section/grade pair not matched or not evaluated
+                exact = np.zeros(L.shape, dtype=bool)
+
+        if np.any(exact):
+            value = np.where(exact, np.nan, value)
+            value[exact] = self._exact(sec, mat, L[exact], L_ay[exact], output, g_13, r)
+            bound = np.where(exact, 0.0, bound)
+        self.stats["exact"] += int(np.count_nonzero(exact))
+        self.stats["interpolated"] += int(exact.size - np.count_nonzero(exact))
+        return (value, bound) if return_bound else value
+
+    def _exact(self, sec, mat, L, L_ay, output, g_13, r) -> np.ndarray:
+        """Exact capacities with MemberBatch."""
+        grade_types = self._sized_materials.library.set_index("name")["grade_type"]
+        member_type = "glulam" if grade_types.get(mat) == GradeType.GLULAM.value else "board"
+        L_a = self.member_inputs.get("L_a")
+        records = [
+            {
+                **self.member_inputs,
+                "sec": sec,
+                "mat": mat,
+                "member_type": member_type,
+                "update_from_section_size": True,
+                "g_13": g_13,
+                "r": r,
+                "L": length,
+                "L_a": {
+                    "x": _axis_value(L_a, "x", "lateral restraint L_a", length, required=False),
+                    "y": spacing,
+                },
+            }
+            for length, spacing in zip(L, L_ay)
+        ]
+        batch = MemberBatch.from_records(
+            records, self.section_library, sized_materials=self._sized_materials
+        )
+        return getattr(batch, output)
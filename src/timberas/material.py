@@ -7,15 +7,28 @@ Classes:
 
     TimberMaterial: Represents a timber material based on AS1720. 
 
+    SharedTimberMaterial: Read-only, hashable TimberMaterial shared between members.
+
+    SizedMaterialCache: Bounded cache of shared size-adjusted materials.
+
 Functions:
     import_material_library(): Returns a DataFrame containing the material library defined
     in timberas/data/material_library.csv
+
+    size_adjusted_properties(): Returns strength properties adjusted for section size, for
+    arrays of section depths and breadths.
+
+    sized_material(): Returns a shared size-adjusted material from the default cache.
 """
 from __future__ import annotations
 import os
-from dataclasses import dataclass, field
+from collections import OrderedDict
+from dataclasses import dataclass, field, fields
 from enum import Enum
+from functools import lru_cache
+import numpy as np
 import pandas as pd
+from timberas.interning import InternTable, ValueObject, _normalise
 
 
 class GradeType(str, Enum):
@@ -117,61 +130,31 @@ class TimberMaterial:
 
     def update_from_section_size(self, d: float, b: float | None = None) -> None:
         """Updates the f_t property for large sections, including:
-          f_t, f_b, f_c, f_s for MGP sections with d>140mm (AS1720.1 Table H3.1, Note 4);
+          f_t, f_b, f_c, f_s for MGP sections with d>140mm (AS1720.1 Table H3.1, Note 4),
+          interpolated between the tabulated depths;
           f_b for F-grade sections with d > 300mm (AS1720.1 Table H2.1 Note 1);
           f_t for F-grade sections with d > 150mm (AS1720.1 Table H.2 Note 2);
-          f_t for Glulam sections with d > 150mm  (AS1720.1 Table 7.1 Note 1).
+          f_t for Glulam sections with d > 150mm  (AS1720.1 Table 7.1 Note 1);
+          f_t, f_b, f_c, f_s for A17 sections from the breadth and depth variants.
 
         Args:
             d: The depth of the timber section.
             b: The breadth of the timber section (required for A17 material).
         """
-        if self.grade_type == GradeType.MGP and d > 140:
-            match d:
-                case 190 | 240 | 290:
-                    new_mat = f"{self.name} {d}mm depth"
-                case _:
-                    raise ValueError(
-                        f"Section depth {d} > 140mm, please interpolate material properties "
-                        "for MGP section (table H3.1, Note 4)."
+        props = size_adjusted_properties(self, d, b)
+        new_name = str(props.pop("name"))
+        if new_name != self.name:
+            print(f"Material changed from {self.name} to {new_name}")
+            self.name = new_name
+        for prop, value in props.items():
+            original, value = getattr(self, prop), float(value)
+            if value != original:
+                setattr(self, prop, value)
+                if self.grade_type in (GradeType.F_GRADE, GradeType.GLULAM):
+                    print(
+                        f"{SIZE_FACTOR_NAMES[prop]} {prop} changed from {original} to {value}"
+                        f" due to section size, {SIZE_FACTOR_CLAUSES[self.grade_type, prop]}"
                     )
-            print(f"Material changed from {self.name} to {new_mat}")
-            new_mat = self.from_library(new_mat)
-            self.name = new_mat.name
-            self.f_b = new_mat.f_b
-            self.f_t = new_mat.f_t
-            self.f_c = new_mat.f_c
-            self.f_s = new_mat.f_s
-
-        elif self.grade_type == GradeType.F_GRADE:
-            if d > 150:
-                # Table H.2 Note 2
-                original_f_t = self.f_t
-                self.f_t = round(self.f_t * (150 / d) ** 0.167, 3)
-                print(
-                    f"Tensile strength f_t changed from {original_f_t} to {self.f_t}"
-                    " due to section size, Table H.2 Note 2"
-                )
-            if d > 300:
-                # Table H.2 Note 1
-                original_f_b = self.f_b
-                self.f_b = round(self.f_b * (300 / d) ** 0.167, 3)
-                print(
-                    f"Bending strength f_b changed from {original_f_b} to {self.f_b}"
-                    " due to section size, Table H.2 Note 1"
-                )
-        elif self.grade_type == GradeType.A_GRADE:
-            print(f"requires {d} and {b}")
-            raise NotImplementedError
-
-        elif self.grade_type == GradeType.GLULAM and d > 150:
-            # Table 7.1 Note
-            original_f_t = self.f_t
-            self.f_t = round(self.f_t * (150 / d) ** 0.167, 3)
-            print(
-                f"Tensile strength f_t changed from {original_f_t} to {self.f_t}"
-                " due to section size, Table 7.1 Note"
-            )
 
     @classmethod
     def from_dict(cls, input_dict: dict) -> TimberMaterial:
@@ -212,6 +195,279 @@ class TimberMaterial:
         return cls.from_dict(mat_dict)
 
 
+# tabulated depths for MGP properties, Table H3.1 Note 4, AS1720.1:2010
+MGP_DEPTHS = (140, 190, 240, 290)
+SIZE_FACTOR_PROPERTIES = ("f_t", "f_b", "f_c", "f_s")
+SIZE_FACTOR_NAMES = {
+    "f_b": "Bending strength",
+    "f_t": "Tensile strength",
+    "f_c": "Compressive strength",
+    "f_s": "Shear strength",
+}
+SIZE_FACTOR_CLAUSES = {
+    (GradeType.F_GRADE, "f_t"): "Table H.2 Note 2",
+    (GradeType.F_GRADE, "f_b"): "Table H.2 Note 1",
+    (GradeType.GLULAM, "f_t"): "Table 7.1 Note",
+}
+
+
+@lru_cache(maxsize=1)
+def _default_material_library() -> pd.DataFrame:
+    """Default material library, read once."""
+    return import_material_library()
+
+
+def _mgp_depth_table(grade: str, library: pd.DataFrame) -> np.ndarray:
+    """Properties of an MGP grade at each of MGP_DEPTHS, shape (len(MGP_DEPTHS), 4)."""
+    names = [grade] + [f"{grade} {d}mm depth" for d in MGP_DEPTHS[1:]]
+    rows = library.set_index("name").reindex(names)
+    if rows["f_b"].isna().any():
+        raise KeyError(f"MGP depth properties for {grade} not found in material library")
+    return rows[list(SIZE_FACTOR_PROPERTIES)].to_numpy(dtype=float)
+
+
+def _a_grade_table(grade: str, library: pd.DataFrame) -> pd.DataFrame:
+    """Breadth and depth variants of an A grade, parsed from library names of the form
+    '<grade> <b>mm breadth' (d <= 140mm) and '<grade> <b>mm breadth <d_min>-<d_max> depth'."""
+    rows = library.loc[library["grade"] == grade].copy()
+    parsed = rows["name"].str.extract(r"(\d+)mm breadth(?: (\d+)-(\d+) depth)?$")
+    rows["breadth"] = parsed[0].astype(float)
+    rows["d_max"] = parsed[2].astype(float).fillna(min(MGP_DEPTHS))
+    rows = rows.dropna(subset=["breadth"])
+    if rows.empty:
+        raise KeyError(f"breadth and depth variants for {grade} not found in material library")
+    return rows.sort_values(["breadth", "d_max"])
+
+
+def size_adjusted_properties(
+    mat: TimberMaterial,
+    d: np.ndarray,
+    b: np.ndarray | None = None,
+    library: pd.DataFrame | None = None,
+) -> dict[str, np.ndarray]:
+    """Strength properties f_b, f_t, f_c, f_s adjusted for section size, for arrays of section
+    depths and breadths, without modifying the material:
+      MGP: interpolated between the depths in MGP_DEPTHS (Table H3.1, Note 4);
+      F-grade: f_t x (150/d)^0.167 for d > 150mm, f_b x (300/d)^0.167 for d > 300mm (Table H2.1);
+      GL: f_t x (150/d)^0.167 for d > 150mm (Table 7.1);
+      A grade: breadth and depth variants in the material library. Breadths are rounded up to
+      the next variant, and depths between variants use the next deeper variant.
+
+    Args:
+        mat: The timber material.
+        d: Section depths (mm).
+        b: Section breadths (mm), required for A grade materials.
+        library: Material library for MGP and A grade variants, defaults to the package
+            library (read once).
+
+    Returns:
+        dict[str, np.ndarray]: Adjusted f_b, f_t, f_c, f_s and material 'name' arrays, with
+        the broadcast shape of d and b.
+
+    Raises:
+        ValueError: If section size is outside the range of the tabulated variants.
+    """
+    if library is None:
+        library = _default_material_library()
+    d = np.asarray(d, dtype=float)
+    b = np.asarray(np.nan if b is None else b, dtype=float)
+    d, b = np.broadcast_arrays(d, b)
+    props = {
+        prop: np.full(d.shape, float(getattr(mat, prop))) for prop in SIZE_FACTOR_PROPERTIES
+    }
+    name = np.full(d.shape, mat.name, dtype=object)
+
+    if mat.grade_type == GradeType.MGP:
+        if np.any(d > MGP_DEPTHS[-1]):
+            raise ValueError(
+                f"Section depth {d.max()} > {MGP_DEPTHS[-1]}mm, MGP properties not defined "
+                "(table H3.1, Note 4)."
+            )
+        table = _mgp_depth_table(mat.grade, library)
+        deep = d > MGP_DEPTHS[0]
+        for i, prop in enumerate(SIZE_FACTOR_PROPERTIES):
+            props[prop] = np.where(deep, np.interp(d, MGP_DEPTHS, table[:, i]), props[prop])
+        depth_names = np.vectorize(lambda val: f"{mat.grade} {val:g}mm depth", otypes=[object])
+        name = np.where(deep, depth_names(d), name)
+
+    elif mat.grade_type == GradeType.F_GRADE:
+        props["f_t"] = np.where(
+            d > 150, np.round(props["f_t"] * (150 / d) ** 0.167, 3), props["f_t"]
+        )
+        props["f_b"] = np.where(
+            d > 300, np.round(props["f_b"] * (300 / d) ** 0.167, 3), props["f_b"]
+        )
+
+    elif mat.grade_type == GradeType.GLULAM:
+        props["f_t"] = np.where(
+            d > 150, np.round(props["f_t"] * (150 / d) ** 0.167, 3), props["f_t"]
+        )
+
+    elif mat.grade_type == GradeType.A_GRADE:
+        if np.any(np.isnan(b)):
+            raise ValueError(f"section breadth b required for {mat.grade} material")
+        table = _a_grade_table(mat.grade, library)
+        breadths = np.unique(table["breadth"])
+        depths = np.unique(table["d_max"])
+        i_b = np.searchsorted(breadths, b)
+        i_d = np.searchsorted(depths, d)
+        if np.any(i_b == len(breadths)) or np.any(i_d == len(depths)):
+            raise ValueError(
+                f"Section size {d.max()}x{b.max()} outside the breadth and depth variants "
+                f"for {mat.grade}."
+            )
+        grid = table.set_index(["breadth", "d_max"]).reindex(
+            pd.MultiIndex.from_product([breadths, depths])
+        )
+        for prop in SIZE_FACTOR_PROPERTIES:
+            values = grid[prop].to_numpy(dtype=float).reshape(len(breadths), len(depths))
+            props[prop] = values[i_b, i_d]
+        name = grid["name"].to_numpy(dtype=object).reshape(len(breadths), len(depths))[i_b, i_d]
+        if np.any(np.isnan(props["f_b"])):
+            raise ValueError(f"Section size variant not defined for {mat.grade}.")
+
+    props["name"] = name
+    return props
+
+
+@dataclass(kw_only=True, eq=False)
+class SharedTimberMaterial(ValueObject, TimberMaterial):
+    """Read-only, hashable TimberMaterial compared by content, shared between members through
+    the MATERIALS intern table. Use dataclasses.replace() for a modified copy."""
+
+    def update_from_section_size(self, d: float, b: float | None = None) -> None:
+        raise AttributeError(f"{self.name} is a shared material and cannot be updated")
+
+    @classmethod
+    def from_material(cls, mat: TimberMaterial, **changes) -> SharedTimberMaterial:
+        """Returns the interned shared material with the attributes of mat and changes.
+
+        Args:
+            mat: The timber material.
+            changes: Attribute values which replace those of mat.
+
+        Returns:
+            SharedTimberMaterial: The interned material.
+        """
+        values = {key: getattr(mat, key) for key in TimberMaterial.__dataclass_fields__}
+        return MATERIALS.intern(cls(**(values | changes)))
+
+    @classmethod
+    def from_library(
+        cls, name: str, library: pd.DataFrame | None = None
+    ) -> SharedTimberMaterial:
+        """Returns the interned shared material from a material library, defaults to the
+        package library (read once)."""
+        if library is None:
+            library = _default_material_library()
+        return cls.from_material(TimberMaterial.from_library(name, library))
+
+
+MATERIALS = InternTable()
+
+
+class SizedMaterialCache:
+    """Least recently used cache of shared, read-only, size-adjusted materials keyed by
+    (material, d, b), so members of the same grade and section size share one material
+    object. Materials are created with size_adjusted_properties(), without reading the
+    library or printing for each member.
+
+    Attributes:
+        maxsize (int): Maximum number of size-adjusted materials held.
+        library (pd.DataFrame): Material library.
+        hits (int): Number of requests returned from the cache.
+        misses (int): Number of requests which created a material.
+        evictions (int): Number of materials removed to stay within maxsize.
+    """
+
+    def __init__(self, maxsize: int = 1024, library: pd.DataFrame | None = None):
+        self.maxsize = maxsize
+        self.library = _default_material_library() if library is None else library
+        self._base: dict[str, TimberMaterial] = {}
+        self._sized: OrderedDict[tuple, SharedTimberMaterial] = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def __len__(self) -> int:
+        return len(self._sized)
+
+    @property
+    def stats(self) -> dict[str, int]:
+        """Cache statistics."""
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+            "size": len(self._sized),
+            "maxsize": self.maxsize,
+        }
+
+    def clear(self) -> None:
+        """Removes all materials and resets statistics."""
+        self._base.clear()
+        self._sized.clear()
+        self.hits = self.misses = self.evictions = 0
+
+    def get(
+        self, mat: str | TimberMaterial, d: float, b: float | None = None
+    ) -> SharedTimberMaterial:
+        """Returns the shared material adjusted for section size.
+
+        Args:
+            mat: Material library name, or a TimberMaterial (keyed by all attribute values).
+            d: Section depth (mm).
+            b: Section breadth (mm), only used for A grade materials.
+
+        Returns:
+            SharedTimberMaterial: The read-only size-adjusted material.
+        """
+        if isinstance(mat, str):
+            if mat not in self._base:
+                self._base[mat] = TimberMaterial.from_library(mat, self.library)
+            key_mat, mat = mat, self._base[mat]
+        else:
+            # normalised content, so materials with nan attributes (e.g. density) are equal
+            key_mat = tuple(_normalise(getattr(mat, f.name)) for f in fields(mat) if f.init)
+        b_key = b if mat.grade_type == GradeType.A_GRADE else None
+        key = (key_mat, float(d), None if b_key is None else float(b_key))
+        if key in self._sized:
+            self.hits += 1
+            self._sized.move_to_end(key)
+            return self._sized[key]
+
+        self.misses += 1
+        props = size_adjusted_properties(mat, d, b_key, self.library)
+        sized = SharedTimberMaterial.from_material(
+            mat, **{prop: np.asarray(val).item() for prop, val in props.items()}
+        )
+        self._sized[key] = sized
+        if len(self._sized) > self.maxsize:
+            self._sized.popitem(last=False)
+            self.evictions += 1
+        return sized
+
+
+SIZED_MATERIALS = SizedMaterialCache()
+
+
+def sized_material(
+    mat: str | TimberMaterial, d: float, b: float | None = None
+) -> SharedTimberMaterial:
+    """Returns a shared, read-only material adjusted for section size from the default
+    SizedMaterialCache, SIZED_MATERIALS.
+
+    Args:
+        mat: Material library name or TimberMaterial.
+        d: Section depth (mm).
+        b: Section breadth (mm), required for A grade materials.
+
+    Returns:
+        SharedTimberMaterial: The read-only size-adjusted material.
+    """
+    return SIZED_MATERIALS.get(mat, d, b)
+
+
 def main():
     """Main Script"""
     material_library = import_material_library()
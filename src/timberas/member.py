@@ -3,12 +3,19 @@ TODO
 """
 from __future__ import annotations
 import math
+import sys
 from math import isnan, floor, log10
 from enum import IntEnum, Enum
 from dataclasses import dataclass, field
+from functools import lru_cache
+from typing import ClassVar
+from timberas import compiled
 from timberas.material import TimberMaterial
 from timberas.geometry import TimberSection
 from timberas.utils import nomenclature_AS1720 as NOMEN
+from timberas.interaction import InteractionCheck, interaction_ratios
+from timberas.serviceability import midspan_deflection, j_2_lookup
+from timberas.report import REPORT_FORMATS, write_report
 
 
 class EffectiveLengthFactor(float, Enum):
@@ -83,6 +90,134 @@ class RestraintEdge(str, Enum):
 #     ]
 #     return l
 
+@lru_cache(maxsize=1024)
+def rho_constants(
+    seasoned: bool, E: float, f_c: float, f_b: float, r: float
+) -> tuple[float, float]:
+    """Material constants for stability, rho_c and rho_b. Section E2, AS1720.1:2010.
+    Cached, as members of the same material and r share the same values.
+
+    Args:
+        seasoned: True for seasoned timber.
+        E, f_c, f_b: Material modulus of elasticity and characteristic strengths.
+        r: Ratio of temporary to total design action effect, 0.25 if not positive.
+
+    Returns:
+        tuple[float, float]: rho_c and rho_b.
+    """
+    r = r if r > 0 else 0.25
+    if seasoned:
+        rho_c = 11.39 * (E / f_c) ** (-0.408) * r ** (-0.074)
+        rho_b = 14.71 * (E / f_b) ** (-0.480) * r ** (-0.061)
+    else:
+        rho_c = 9.29 * (E / f_c) ** (-0.367) * r ** (-0.146)
+        rho_b = 11.63 * (E / f_b) ** (-0.435) * r ** (-0.110)
+    return rho_c, rho_b
+
+
+@dataclass(frozen=True)
+class MemberInputs:
+    """Member inputs normalised to per-axis values, with material stability constants.
+    Built once by TimberMember.inputs, and rebuilt only when the member inputs or material
+    change.
+
+    Attributes:
+        L_ax (float | None): Restraint spacing, x-axis; None if L_a has no 'x' key.
+        L_ay (float): Restraint spacing, y-axis.
+        L_a_phi (float | None): Torsional restraint spacing; None if not given.
+        g_13_x (float): Effective length factor, x-axis.
+        g_13_y (float): Effective length factor, y-axis.
+        restraint_edge (RestraintEdge): Restraint edge.
+        rho_c (float): Material constant for compression stability.
+        rho_b (float): Material constant for bending stability.
+        source (tuple): Inputs the values were normalised from, see source_of().
+    """
+
+    L_ax: float | None
+    L_ay: float
+    L_a_phi: float | None
+    g_13_x: float
+    g_13_y: float
+    restraint_edge: RestraintEdge
+    rho_c: float
+    rho_b: float
+    source: tuple = field(repr=False)
+
+    @staticmethod
+    def source_of(member: TimberMember) -> tuple:
+        """Member and material inputs the normalised values depend on."""
+        mat = member.mat
+        L_a, g_13 = member.L_a, member.g_13
+        return (
+            member.L,
+            dict(L_a) if isinstance(L_a, dict) else L_a,
+            dict(g_13) if isinstance(g_13, dict) else g_13,
+            member.restraint_edge,
+            member.r,
+            mat.seasoned,
+            mat.E,
+            mat.f_c,
+            mat.f_b,
+        )
+
+    @classmethod
+    def from_member(cls, member: TimberMember, source: tuple | None = None) -> MemberInputs:
+        """Normalises and validates member inputs.
+
+        Raises:
+            KeyError: If g_13 or L_a do not define a value for an axis used in design.
+            TypeError: If g_13 or L_a is not a float, int or dict (or None for L_a).
+            ValueError: If restraint_edge is not a RestraintEdge value.
+        """
+        source = cls.source_of(member) if source is None else source
+        L, L_a, g_13, restraint_edge, r, seasoned, E, f_c, f_b = source
+
+        if isinstance(g_13, float | int):
+            g_13_x = g_13_y = g_13
+        elif isinstance(g_13, dict):
+            if "x" not in g_13:
+                raise KeyError(
+                    "effective length factor g_13 not defined for x-axis compressive buckling"
+                )
+            if "y" not in g_13:
+                raise KeyError(
+                    "effective length factor g_13 not defined for y-axis compressive buckling"
+                )
+            g_13_x, g_13_y = g_13["x"], g_13["y"]
+        else:
+            raise TypeError(f"effective length factor g_13 {g_13!r} not a float or dict")
+
+        L_a_phi = None
+        if isinstance(L_a, float | int) or L_a is None:
+            L_ax = L_ay = L if L_a is None else L_a
+        elif isinstance(L_a, dict):
+            if "y" not in L_a:
+                raise KeyError(
+                    "lateral restraint for y-axis compressive buckling L_ay not defined"
+                )
+            L_ax = (L if L_a["x"] is None else L_a["x"]) if "x" in L_a else None
+            L_ay = L if L_a["y"] is None else L_a["y"]
+            L_a_phi = L_a.get("phi")
+        else:
+            raise TypeError(f"lateral restraint L_a {L_a!r} not a float, dict or None")
+
+        rho_c, rho_b = rho_constants(bool(seasoned), E, f_c, f_b, r)
+        return cls(
+            L_ax=L_ax,
+            L_ay=L_ay,
+            L_a_phi=L_a_phi,
+            g_13_x=g_13_x,
+            g_13_y=g_13_y,
+            restraint_edge=RestraintEdge(restraint_edge),
+            rho_c=rho_c,
+            rho_b=rho_b,
+            source=source,
+        )
+
+
+# design capacities, solved by TimberMember._<name>() methods
+CAPACITIES = ("N_dt", "N_dcx", "N_dcy", "N_dc", "M_d", "V_d")
+
 
 @dataclass
 class TimberMember:
@@ -114,30 +249,43 @@ class TimberMember:
 
     sig_figs: int = field(repr=False, default=4)
 
+    # evaluate capacities in one pass where available, see compiled.py
+    use_compiled: ClassVar[bool] = True
+
     def __post_init__(self):
         self.sec_name = self.sec.name
         self.mat_name = self.mat.name
         # self.mat.update_f_t(self.sec_type, self.d)
         self.solve_capacities()
 
-    def solve_capacities(self):
-        """Calculate tension, compression, and bending design capacities."""
-        self.N_dt = self._N_dt()
-        self.N_dcx = self._N_dcx()
-        self.N_dcy = self._N_dcy()
-        self.N_dc = self._N_dc()
-        self.M_d = self._M_d()
-        self.V_d = self._V_d()
+    def solve_capacities(self, capacities: tuple[str, ...] | None = None):
+        """Calculate tension, compression, and bending design capacities.
+
+        Args:
+            capacities: Capacity names to recalculate, defaults to all of CAPACITIES.
+        """
+        names = CAPACITIES if capacities is None else capacities
+        inputs = self.inputs
+        # inputs do not change while solving, so properties skip the change check
+        self._solving_inputs = inputs
+        try:
+            if self.use_compiled and type(self) in COMPILED_KINDS:
+                values = compiled.evaluate(self, inputs, names)
+                for name in names:
+                    setattr(self, name, values[name])
+            else:
+                for name in names:
+                    setattr(self, name, getattr(self, "_" + name)())
+        finally:
+            del self._solving_inputs
 
         # round to sig figs
-        if self.sig_figs:
-            for key, val in list(self.__dict__.items()):
+        sig_figs = self.sig_figs
+        if sig_figs:
+            attrs = self.__dict__
+            for key, val in list(attrs.items()):
                 if isinstance(val, (float, int)) and (not isnan(val)) and (val != 0):
-                    setattr(
-                        self,
-                        key,
-                        round(val, self.sig_figs - int(floor(log10(abs(val)))) - 1),
-                    )
+                    attrs[key] = round(val, sig_figs - floor(log10(abs(val))) - 1)
 
     def update_k_1(self, k_1: float) -> TimberSection:
         """Change k_1 factor and recalculate section capacities."""
@@ -158,7 +306,16 @@ class TimberMember:
         if not isinstance(attribute_names, list):
             attribute_names = [attribute_names]
 
-        if report_type == "print":
+        if report_type in REPORT_FORMATS:
+            write_report(
+                [self],
+                sys.stdout,
+                report_type,
+                attribute_names,
+                with_nomenclature=with_nomenclature,
+                with_clause=with_clause,
+            )
+        elif report_type == "print":
             # print out attributes
             for att in attribute_names:
                 # get attribute val from self, self.sec, or self.mat
@@ -184,6 +341,57 @@ class TimberMember:
                 else:
                     print(f"Unknown attribute {att}")
 
+    def check_interaction(self, M_star: float, N_star: float) -> InteractionCheck:
+        """Combined bending and axial actions check, Clause 3.5, AS1720.1:2010. Uses the
+        solved member capacities.
+
+        Args:
+            M_star: Design bending moment (kNm), major axis.
+            N_star: Design axial force (kN), positive in compression and negative in tension.
+
+        Returns:
+            InteractionCheck: Interaction ratios, see InteractionCheck.utilisation and
+            InteractionCheck.passed.
+        """
+        return interaction_ratios(
+            M_star,
+            N_star,
+            M_d=self.M_d,
+            N_dcx=self.N_dcx,
+            N_dcy=self.N_dcy,
+            N_dt=self.N_dt,
+            k_12_bend=self.k_12_bend,
+            Z_x=self.sec.Z_x,
+            A_t=self.sec.A_t,
+        )
+
+    def deflection(self, w: float, P: float = 0, duration: float = 1) -> float:
+        """Mid-span deflection (mm) of the member as a simply supported span of length L,
+        including creep factor j_2 for the load duration (Clause 2.4.1.2, AS1720.1:2010).
+
+        Args:
+            w: Uniformly distributed load (kN/m).
+            P: Mid-span point load (kN).
+            duration: Load duration (days), defaults to 1 day (short-term, j_2 = 1).
+
+        Returns:
+            float: The mid-span deflection.
+        """
+        j_2 = j_2_lookup(self.mat.seasoned, duration)
+        return float(midspan_deflection(w, self.L, self.mat.E, self.sec.I_x, P, j_2))
+
+    @property
+    def inputs(self) -> MemberInputs:
+        """Normalised member inputs, rebuilt if the member inputs or material have changed."""
+        attrs = self.__dict__
+        if "_solving_inputs" in attrs:
+            return attrs["_solving_inputs"]
+        source = MemberInputs.source_of(self)
+        inputs = attrs.get("_inputs")
+        if inputs is None or inputs.source != source:
+            inputs = self._inputs = MemberInputs.from_member(self, source)
+        return inputs
+
     @property
     def phi(self) -> float:
         """Table 2.1, AS1720.1:2010"""
@@ -291,90 +499,48 @@ class TimberMember:
     def rho_c(self) -> float:
         """Section E2, AS1720.1:2010"""
         # NOTE -> move to child class when other materials (LVL) added
-        r = self.r if self.r > 0 else 0.25
-        if self.mat.seasoned:
-            rho = 11.39 * (self.mat.E / self.mat.f_c) ** (-0.408) * r ** (-0.074)
-        else:
-            rho = 9.29 * (self.mat.E / self.mat.f_c) ** (-0.367) * r ** (-0.146)
-        return rho
+        return self.inputs.rho_c
 
     @property
     def g_13_x(self) -> float:
         """Effective length factor for compressive buckling, x-axis"""
-        # g_13 is float - use in x and y axes
-        if isinstance(self.g_13, float | int):
-            return self.g_13
-        # else g_13 is dictionary - use x axis key value only
-        if "x" in self.g_13:
-            return self.g_13["x"]
-        # raise error if not yet returned
-        raise KeyError(
-            "effective length factor g_13 not defined for x-axis compressive buckling"
-        )
+        return self.inputs.g_13_x
 
     @property
     def g_13_y(self) -> float:
         """Effective length factor for compressive buckling, y-axis"""
-        # g_13 is float - use in x and y axes
-        if isinstance(self.g_13, float | int):
-            return self.g_13
-        # else g_13 is dictionary - use y axis key value only
-        if "y" in self.g_13:
-            return self.g_13["y"]
-        # raise error if not yet returned
-        raise KeyError(
-            "effective length factor g_13 not defined for y-axis compressive buckling"
-        )
+        return self.inputs.g_13_y
 
     @property
     def L_ax(self) -> float:
         """distance between effective lateral restraint against buckling about x-axis."""
-        if isinstance(self.L_a, float | int) or (self.L_a is None):
-            l_ax = self.L_a
-        elif isinstance(self.L_a, dict) and "x" in self.L_a:
-            l_ax = self.L_a["x"]
-        else:  # raise error if not yet returned
+        l_ax = self.inputs.L_ax
+        if l_ax is None:
             raise KeyError(
                 "lateral restraint for x-axis compressive buckling L_ax not defined"
             )
-        if l_ax is None:
-            l_ax = self.L
         return l_ax
 
     @property
     def L_ay(self) -> float:
         """distance between effective lateral restraint against buckling about y-axis."""
-        if isinstance(self.L_a, float | int) or (self.L_a is None):
-            l_ay = self.L_a
-        elif isinstance(self.L_a, dict) and "y" in self.L_a:
-            l_ay = self.L_a["y"]
-        else:  # raise error if not yet returned
-            raise KeyError(
-                "lateral restraint for y-axis compressive buckling L_ay not defined"
-            )
-        if l_ay is None:
-            l_ay = self.L
-        return l_ay
+        return self.inputs.L_ay
 
     @property
     def L_a_phi(self) -> float:
         """distance between effective torsional restraint against buckling, Cl 3.2.3.2(b)."""
-        if isinstance(self.L_a, dict) and "phi" in self.L_a:
-            return self.L_a["phi"]
-        raise KeyError(
-            "no torsional restraint distance L_a_phi provided, i.e. not 'phi' key in L_a input"
-        )
+        l_a_phi = self.inputs.L_a_phi
+        if l_a_phi is None:
+            raise KeyError(
+                "no torsional restraint distance L_a_phi provided, i.e. not 'phi' key in L_a input"
+            )
+        return l_a_phi
 
     @property
     def rho_b(self) -> float:
         """Section E2, AS1720.1:2010"""
-        r = self.r if self.r > 0 else 0.25
         # NOTE - some of this term is a material attribute only
-        if self.mat.seasoned:
-            rho = 14.71 * (self.mat.E / self.mat.f_b) ** (-0.480) * r ** (-0.061)
-        else:
-            rho = 11.63 * (self.mat.E / self.mat.f_b) ** (-0.435) * r ** (-0.110)
-        return rho
+        return self.inputs.rho_b
 
     @property
     def L_CLR(self) -> float:
@@ -488,7 +654,7 @@ class RectangleMemberStabilityMixin:
 
         if self.CLR:
             # continuous restraint
-            match self.restraint_edge:
+            match self.inputs.restraint_edge:
                 case RestraintEdge.COMPRESSION | RestraintEdge.BOTH:
                     # continuous compression - Cl 3.2.3.2(b)
                     val = 0
@@ -501,7 +667,7 @@ class RectangleMemberStabilityMixin:
                     val = 1.5 * (self.sec.d / self.sec.b) / bot
         else:
             # discrete restraint
-            match self.restraint_edge:
+            match self.inputs.restraint_edge:
                 case RestraintEdge.COMPRESSION | RestraintEdge.BOTH:
                     # discrete compression - Cl 3.2.3.2(a), Eq 3.2(4)
                     val = (
@@ -616,3 +782,7 @@ class GlulamMember(RectangleMemberStabilityMixin, TimberMember):
     def k_9(self) -> float:
         """TODO"""
         return 1.0
+
+
+# member types evaluated with compiled.evaluate(), subclasses use the capacity methods
+COMPILED_KINDS = (BoardMember, GlulamMember)
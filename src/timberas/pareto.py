@@ -0,0 +1,307 @@
+"""
+This module provides a Pareto front search of library section/grade pairs, trading off member
+mass (A_g x density x L) against utilisation for given design actions, span and restraint
+inputs.
+
+Pairs are streamed lightest first (sections of each material in order of area, merged across
+materials), and evaluated in vectorised blocks with MemberBatch. A pair can only be on the
+front if its utilisation is lower than that of every lighter pair, so before evaluation each
+block is pruned with a lower bound on utilisation: the design actions over upper bounds of
+the capacities with k_12 = 1, k_6 = 1, the largest k_4 and the largest strengths of the grade
+(size-adjusted strengths are interpolated between the grade's tabulated values). Pairs with
+a bound not below the best utilisation found so far are dominated, and never evaluated.
+
+Library F-grades have no density; their pairs are excluded unless densities are given.
+
+Classes:
+    ParetoFront: Pareto-optimal section/grade pairs, with evaluation counts.
+
+Functions:
+    utilisation_lower_bound(): Lower bound on the utilisation of section/grade pairs.
+
+    pareto_front(): Pareto front of mass versus utilisation across the libraries.
+"""
+from __future__ import annotations
+
+import heapq
+from dataclasses import dataclass, field
+from typing import Iterator
+
+import numpy as np
+import pandas as pd
+
+from timberas.batch import MemberBatch, CAPACITY_NAMES, k_9_lookup
+from timberas.geometry import import_section_library
+from timberas.grouping import utilisation, _member_demands
+from timberas.material import GradeType, import_material_library
+from timberas.sweep import library_pairs, _is_valid
+
+PARETO_BLOCK_SIZE = 256
+# material columns bounded by the largest value of the grade
+BOUND_COLUMNS = ("f_b", "f_t", "f_s", "f_c", "phi_1", "phi_2", "phi_3")
+
+
+@dataclass
+class ParetoFront:
+    """Pareto-optimal section/grade pairs: no other pair is both lighter (or as light) and
+    less utilised.
+
+    Attributes:
+        front (pd.DataFrame): Pareto-optimal pairs, lightest first, with columns sec, mat,
+            mass (kg), utilisation and the member capacities.
+        n_candidates (int): Section/grade pairs considered.
+        n_evaluated (int): Pairs evaluated with MemberBatch.
+        n_pruned (int): Pairs skipped without evaluation, dominated by their lower bound.
+        n_excluded (int): Pairs without a density, or with undefined capacities.
+    """
+
+    front: pd.DataFrame
+    n_candidates: int = 0
+    n_evaluated: int = 0
+    n_pruned: int = 0
+    n_excluded: int = 0
+    demands: dict = field(default_factory=dict, repr=False)
+
+    def __len__(self) -> int:
+        return len(self.front)
+
+    @property
+    def counts(self) -> dict[str, int]:
+        """Candidate, evaluated, pruned and excluded pair counts."""
+        return {
+            "candidates": self.n_candidates,
+            "evaluated": self.n_evaluated,
+            "pruned": self.n_pruned,
+            "excluded": self.n_excluded,
+        }
+
+
+def _grade_bounds(materials: list[str], material_library: pd.DataFrame) -> pd.DataFrame:
+    """Largest BOUND_COLUMNS values of each material and the other rows of its grade."""
+    lib = material_library.drop_duplicates("name").set_index("name")
+    cols = list(BOUND_COLUMNS)
+    rows = lib.loc[materials, cols].astype(float)
+    grade_max = lib.groupby("grade")[cols].max().astype(float)
+    by_grade = grade_max.reindex(lib.loc[materials, "grade"]).to_numpy()
+    return pd.DataFrame(np.fmax(rows.to_numpy(), by_grade), index=materials, columns=cols)
+
+
+def utilisation_lower_bound(
+    demands: dict[str, float],
+    b: np.ndarray,
+    d: np.ndarray,
+    n: np.ndarray,
+    bounds: pd.DataFrame,
+    glulam: np.ndarray,
+    seasoned: np.ndarray,
+    member_inputs: dict,
+) -> np.ndarray:
+    """Lower bound on the utilisation of section/grade pairs, from capacity upper bounds with
+    k_12 = 1 (Clauses 3.2.4 and 3.3.3), k_6 = 1 and the largest k_4 (Table 2.5).
+
+    Args:
+        demands: Design actions N_c, N_t, M and V, see grouping.DEMANDS.
+        b, d, n: Section board breadth, depth and number of boards.
+        bounds: Largest strengths and capacity factors of each pair's grade, one row per pair.
+        glulam: True for glulam pairs (k_9 = 1).
+        seasoned: Material seasoning of each pair.
+        member_inputs: Member inputs shared by all pairs, see MemberBatch.from_records().
+
+    Returns:
+        np.ndarray: The utilisation lower bound of each pair.
+    """
+    phi = bounds[f"phi_{int(member_inputs.get('application_cat', 1))}"].to_numpy()
+    partial = member_inputs.get("consider_partial_seasoning", False) & ~seasoned
+    k_common = phi * member_inputs.get("k_1", 1.0) * np.where(partial, 1.15, 1.0)
+    n_com = np.where(n > 1, n, 1)
+    k_9 = np.where(
+        glulam,
+        1.0,
+        k_9_lookup(
+            n_com,
+            member_inputs.get("n_mem", 1),
+            member_inputs.get("s", 0),
+            member_inputs["L"],
+        ),
+    )
+    b_tot = n * b
+    capacity = {
+        "N_c": k_common * bounds["f_c"].to_numpy() * b_tot * d / 1000,
+        "N_t": k_common * bounds["f_t"].to_numpy() * b_tot * d / 1000,
+        "M": k_common * k_9 * bounds["f_b"].to_numpy() * b_tot * d**2 / 6 / 1e6,
+        "V": k_common * bounds["f_s"].to_numpy() * 2 / 3 * d * b_tot / 1e3,
+    }
+    with np.errstate(divide="ignore", invalid="ignore"):
+        ratios = [
+            np.where(demands[name] > 0, demands[name] / capacity[name], 0.0)
+            for name in capacity
+        ]
+    return np.max(ratios, axis=0)
+
+
+def _lightest_first(
+    pairs: np.ndarray, area: np.ndarray, mass_per_area: np.ndarray
+) -> Iterator[tuple[float, int, int]]:
+    """(mass, section index, material index) of matched pairs, lightest first, merged from
+    the sections of each material in order of area."""
+
+    def stream(j: int) -> Iterator[tuple[float, int, int]]:
+        i = np.flatnonzero(pairs[:, j])
+        for k in i[np.argsort(area[i], kind="stable")]:
+            yield area[k] * mass_per_area[j], int(k), j
+
+    return heapq.merge(*(stream(int(j)) for j in np.flatnonzero(~np.isnan(mass_per_area))))
+
+
+def _blocks(stream: Iterator, size: int) -> Iterator[list]:
+    block = []
+    for item in stream:
+        block.append(item)
+        if len(block) == size:
+            yield block
+            block = []
+    if block:
+        yield block
+
+
+def pareto_front(
+    L: float,
+    N_star: np.ndarray | None = None,
+    M_star: np.ndarray | None = None,
+    V_star: np.ndarray | None = None,
+    member_inputs: dict | None = None,
+    sections: list[str] | None = None,
+    materials: list[str] | None = None,
+    pairs: pd.DataFrame | None = None,
+    section_library: pd.DataFrame | None = None,
+    material_library: pd.DataFrame | None = None,
+    densities: dict[str, float] | None = None,
+    max_utilisation: float | None = None,
+    block_size: int = PARETO_BLOCK_SIZE,
+) -> ParetoFront:
+    """Pareto front of member mass versus utilisation across library section/grade pairs.
+
+    Example:
+        result = pareto_front(L=3600, M_star=4.5, V_star=5.0, member_inputs={"L_a": 600})
+        result.front  # sec, mat, mass and utilisation of the optimal pairs
+        result.counts  # pairs evaluated and pruned
+
+    Args:
+        L: Member length (mm).
+        N_star: Design axial force (kN), positive in compression; scalar or load cases.
+        M_star: Design bending moment (kNm); scalar or load cases.
+        V_star: Design shear force (kN); scalar or load cases.
+        member_inputs: Member inputs shared by all pairs (e.g. L_a, g_13, restraint_edge),
+            see MemberBatch.from_records().
+        sections: Section names, defaults to all sections in the library.
+        materials: Material names, defaults to all materials in library_pairs().
+        pairs: Boolean DataFrame of section/material pairs, defaults to library_pairs().
+        section_library: DataFrame of sections, defaults to import_section_library().
+        material_library: DataFrame of materials, defaults to import_material_library().
+        densities: Densities (kg/m^3) by material name, for materials without a library
+            density.
+        max_utilisation: Optional largest utilisation of front pairs, e.g. 1.0 for passing
+            pairs only.
+        block_size: Number of pairs bounded and evaluated together.
+
+    Returns:
+        ParetoFront: The front, lightest first, with evaluation counts.
+    """
+    if section_library is None:
+        section_library = import_section_library()
+    if material_library is None:
+        material_library = import_material_library()
+    if pairs is None:
+        pairs = library_pairs(section_library, material_library)
+    sections = list(pairs.index) if sections is None else list(sections)
+    materials = list(pairs.columns) if materials is None else list(materials)
+    matched = pairs.reindex(index=sections, columns=materials, fill_value=False).to_numpy(
+        dtype=bool
+    )
+    member_inputs = {**(member_inputs or {}), "L": L}
+    actions = (
+        None if val is None else np.reshape(val, (1, -1)) for val in (N_star, M_star, V_star)
+    )
+    demands = {name: float(val[0]) for name, val in _member_demands(1, *actions).items()}
+
+    sec_lib = section_library.drop_duplicates("name").set_index("name").loc[sections]
+    mat_lib = material_library.drop_duplicates("name").set_index("name").loc[materials]
+    b, d, n = (sec_lib[col].to_numpy(dtype=float) for col in ("b", "d", "n"))
+    area = n * b * d
+    density = mat_lib["density"].astype(float).to_numpy()
+    if densities:
+        density = np.where(
+            np.isnan(density), [densities.get(m, np.nan) for m in materials], density
+        )
+    # kg per mm^2 of section area, for the member length
+    mass_per_area = density * 1e-9 * L
+    glulam = (mat_lib["grade_type"] == GradeType.GLULAM.value).to_numpy()
+    seasoned = mat_lib["seasoned"].astype(bool).to_numpy()
+    bounds = _grade_bounds(materials, material_library)
+
+    result = ParetoFront(front=pd.DataFrame(), demands=demands)
+    result.n_candidates = int(matched.sum())
+    result.n_excluded = int(matched[:, np.isnan(mass_per_area)].sum())
+    best = np.inf
+    rows = []
+    for block in _blocks(_lightest_first(matched, area, mass_per_area), block_size):
+        mass = np.array([item[0] for item in block])
+        i = np.array([item[1] for item in block])
+        j = np.array([item[2] for item in block])
+        bound = utilisation_lower_bound(
+            demands, b[i], d[i], n[i], bounds.iloc[j], glulam[j], seasoned[j], member_inputs
+        )
+        keep = bound < best
+        if max_utilisation is not None:
+            keep &= bound <= max_utilisation
+        result.n_pruned += int(np.count_nonzero(~keep))
+        records = [
+            {
+                **member_inputs,
+                "sec": sections[i_k],
+                "mat": materials[j_k],
+                "member_type": "glulam" if glulam[j_k] else "board",
+                "update_from_section_size": True,
+            }
+            for i_k, j_k in zip(i[keep], j[keep])
+        ]
+        mass, i, j = mass[keep], i[keep], j[keep]
+        if not records:
+            continue
+        try:
+            batch = MemberBatch.from_records(records, section_library, material_library)
+        except (ValueError, KeyError, NotImplementedError):
+            # drop pairs which cannot be evaluated, e.g. material size factors not defined
+            valid = np.array(
+                [_is_valid(rec, section_library, material_library) for rec in records]
+            )
+            result.n_excluded += int(np.count_nonzero(~valid))
+            records = [rec for rec, ok in zip(records, valid) if ok]
+            mass, i, j = mass[valid], i[valid], j[valid]
+            if not records:
+                continue
+            batch = MemberBatch.from_records(records, section_library, material_library)
+        result.n_evaluated += len(records)
+        util = utilisation(batch, demands)
+        result.n_excluded += int(np.count_nonzero(np.isnan(util)))
+        for k in np.flatnonzero(~np.isnan(util)):
+            if util[k] < best and (max_utilisation is None or util[k] <= max_utilisation):
+                best = util[k]
+                rows.append(
+                    {
+                        "sec": sections[i[k]],
+                        "mat": materials[j[k]],
+                        "mass": mass[k],
+                        "utilisation": util[k],
+                        **{name: getattr(batch, name)[k] for name in CAPACITY_NAMES},
+                    }
+                )
+
+    front = pd.DataFrame(rows, columns=["sec", "mat", "mass", "utilisation", *CAPACITY_NAMES])
+    # pairs of equal mass found later in a block with lower utilisation
+    front = front.sort_values(["mass", "utilisation"], kind="stable")
+    on_front = front["utilisation"].to_numpy() < np.minimum.accumulate(
+        np.concatenate([[np.inf], front["utilisation"].to_numpy()[:-1]])
+    )
+    result.front = front[on_front].reset_index(drop=True)
+    return result
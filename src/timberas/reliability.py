@@ -0,0 +1,239 @@
+"""
+This module provides Monte Carlo reliability analysis of member design capacities. Material
+properties and section dimensions are sampled as random factors on the nominal
+TimberMaterial/TimberSection values held in a MemberBatch, propagated through the vectorised
+capacity formulas, and compared with sampled load effects to estimate failure probabilities.
+
+Samples are evaluated in chunks, each with its own random generator spawned from one seed, so
+results are reproducible and independent of chunk scheduling, and chunks may be spread across
+a process pool.
+
+The DEFAULT_VARIABLES distributions are indicative only - calibration work should provide
+distributions for the grades and populations considered.
+
+Classes:
+    Distribution: Random variable distribution defined by mean and coefficient of variation.
+
+    ReliabilityResult: Failure counts, failure probability and capacity statistics.
+
+Functions:
+    sample_batch(): MemberBatch with sampled material properties and dimensions.
+
+    failure_probability(): Monte Carlo estimate of the failure probability of members.
+"""
+from __future__ import annotations
+
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass
+from statistics import NormalDist
+import math
+
+import numpy as np
+
+from timberas.batch import MemberBatch
+from timberas.member import TimberMember
+
+DISTRIBUTION_KINDS = ("normal", "lognormal", "gumbel", "deterministic")
+EULER_GAMMA = 0.5772156649
+
+
+@dataclass
+class Distribution:
+    """Random variable distribution defined by its mean and coefficient of variation. For
+    material properties and dimensions the variable is a factor on the nominal value; for load
+    effects it is the load effect itself.
+
+    Attributes:
+        kind (str): One of DISTRIBUTION_KINDS.
+        mean (float | np.ndarray): Mean value, broadcast against the member batch shape.
+        cov (float | np.ndarray): Coefficient of variation.
+    """
+
+    kind: str = "lognormal"
+    mean: float | np.ndarray = 1.0
+    cov: float | np.ndarray = 0.0
+
+    def __post_init__(self):
+        if self.kind not in DISTRIBUTION_KINDS:
+            raise ValueError(f"kind {self.kind} not in {DISTRIBUTION_KINDS}")
+
+    def sample(self, rng: np.random.Generator, size: tuple) -> np.ndarray:
+        """Draws samples with shape size; mean and cov broadcast against size[:-1].
+
+        Args:
+            rng: Random number generator.
+            size: Sample shape, member batch shape + (n_samples,).
+
+        Returns:
+            np.ndarray: The samples.
+        """
+        mean = np.asarray(self.mean, dtype=float)[..., np.newaxis]
+        std = mean * np.asarray(self.cov, dtype=float)[..., np.newaxis]
+        if self.kind == "deterministic":
+            return np.broadcast_to(mean, size)
+        if self.kind == "normal":
+            return mean + std * rng.standard_normal(size)
+        if self.kind == "lognormal":
+            sigma = np.sqrt(np.log1p((std / mean) ** 2))
+            return np.exp(np.log(mean) - sigma**2 / 2 + sigma * rng.standard_normal(size))
+        # gumbel (type I largest)
+        scale = std * math.sqrt(6) / math.pi
+        return rng.gumbel(mean - EULER_GAMMA * scale, scale, size)
+
+
+# Indicative variability of in-grade properties relative to the characteristic values
+DEFAULT_VARIABLES = {
+    "f_b": Distribution("lognormal", 1.5, 0.25),
+    "f_c": Distribution("lognormal", 1.3, 0.20),
+    "f_t": Distribution("lognormal", 1.6, 0.30),
+    "E": Distribution("lognormal", 1.0, 0.15),
+    "d": Distribution("normal", 1.0, 0.01),
+    "b": Distribution("normal", 1.0, 0.01),
+}
+
+
+@dataclass
+class ReliabilityResult:
+    """Monte Carlo results per member.
+
+    Attributes:
+        n_samples (int): Number of samples per member.
+        n_failures (np.ndarray): Number of samples with load effect greater than capacity.
+        capacity_mean (np.ndarray): Mean sampled capacity.
+        capacity_std (np.ndarray): Standard deviation of sampled capacity.
+    """
+
+    n_samples: int
+    n_failures: np.ndarray
+    capacity_mean: np.ndarray
+    capacity_std: np.ndarray
+
+    @property
+    def p_f(self) -> np.ndarray:
+        """Estimated probability of failure."""
+        return self.n_failures / self.n_samples
+
+    @property
+    def p_f_std_error(self) -> np.ndarray:
+        """Standard error of the failure probability estimate."""
+        return np.sqrt(self.p_f * (1 - self.p_f) / self.n_samples)
+
+    @property
+    def beta(self) -> np.ndarray:
+        """Reliability index, beta = -Phi^-1(p_f). inf where no failures were sampled."""
+        inv_cdf = np.vectorize(
+            lambda p: math.inf if p <= 0 else -math.inf if p >= 1 else -NormalDist().inv_cdf(p)
+        )
+        return inv_cdf(self.p_f).astype(float)
+
+
+def sample_batch(
+    batch: MemberBatch,
+    variables: dict[str, Distribution],
+    rng: np.random.Generator,
+    n_samples: int,
+) -> MemberBatch:
+    """MemberBatch with n_samples sampled members on a trailing axis. Each variable is a
+    factor on a MemberBatch input; section areas and second moments of area are scaled with
+    sampled breadth b and depth d. Sampled capacities are not rounded (sig_figs=0).
+
+    Args:
+        batch: MemberBatch of nominal members.
+        variables: Distributions of factors, keyed by MemberBatch input name.
+        rng: Random number generator.
+        n_samples: Number of samples per member.
+
+    Returns:
+        MemberBatch: The sampled members, shape batch.shape + (n_samples,).
+    """
+    size = batch.shape + (n_samples,)
+    factors = {name: variables[name].sample(rng, size) for name in sorted(variables)}
+    unknown = set(factors) - set(MemberBatch.input_names())
+    if unknown:
+        raise KeyError(f"variables {sorted(unknown)} are not MemberBatch inputs")
+    inputs = {
+        name: getattr(batch, name)[..., np.newaxis] * factor for name, factor in factors.items()
+    }
+    f_b, f_d = factors.get("b", 1.0), factors.get("d", 1.0)
+    for name, scale in (
+        ("A_t", f_b * f_d),
+        ("A_c", f_b * f_d),
+        ("I_x", f_b * f_d**3),
+        ("I_y", f_b**3 * f_d),
+    ):
+        inputs.setdefault(name, getattr(batch, name)[..., np.newaxis] * scale)
+    values = {name: getattr(batch, name)[..., np.newaxis] for name in batch.input_names()}
+    return MemberBatch(**(values | inputs), sig_figs=0)
+
+
+def _run_chunk(
+    batch: MemberBatch,
+    capacity: str,
+    load: Distribution,
+    variables: dict[str, Distribution],
+    seed: np.random.SeedSequence,
+    n_samples: int,
+) -> tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """Failure count, sum and sum of squares of capacity for one chunk of samples."""
+    rng = np.random.default_rng(seed)
+    sampled = sample_batch(batch, variables, rng, n_samples)
+    resistance = getattr(sampled, capacity)
+    effect = load.sample(rng, resistance.shape)
+    return (
+        np.count_nonzero(effect > resistance, axis=-1),
+        resistance.sum(axis=-1),
+        (resistance**2).sum(axis=-1),
+    )
+
+
+def failure_probability(
+    member: MemberBatch | TimberMember,
+    load: Distribution,
+    capacity: str = "M_d",
+    n_samples: int = 1_000_000,
+    variables: dict[str, Distribution] | None = None,
+    seed: int = 0,
+    chunk_size: int = 100_000,
+    jobs: int = 1,
+    include_phi: bool = False,
+) -> ReliabilityResult:
+    """Monte Carlo estimate of the probability that a sampled load effect exceeds the sampled
+    member capacity, for each member in a batch.
+
+    Args:
+        member: MemberBatch or single member with nominal properties.
+        load: Distribution of the load effect, in the units of the capacity (kN or kNm).
+        capacity: Capacity checked, one of CAPACITY_NAMES.
+        n_samples: Number of samples per member.
+        variables: Distributions of factors on MemberBatch inputs, defaults to
+            DEFAULT_VARIABLES.
+        seed: Seed for the random generators of all chunks.
+        chunk_size: Number of samples per member evaluated at once.
+        jobs: Number of worker processes. Results do not depend on jobs.
+        include_phi: If False, capacities are evaluated with phi = 1.
+
+    Returns:
+        ReliabilityResult: Failure counts and capacity statistics per member.
+    """
+    batch = MemberBatch.from_members([member]) if isinstance(member, TimberMember) else member
+    if not include_phi:
+        values = {name: getattr(batch, name) for name in batch.input_names()}
+        batch = MemberBatch(**(values | {"phi": 1.0}), sig_figs=0)
+    variables = DEFAULT_VARIABLES if variables is None else variables
+    sizes = [min(chunk_size, n_samples - start) for start in range(0, n_samples, chunk_size)]
+    seeds = np.random.SeedSequence(seed).spawn(len(sizes))
+    args = [(batch, capacity, load, variables, s, n) for s, n in zip(seeds, sizes)]
+    if jobs == 1:
+        chunks = [_run_chunk(*arg) for arg in args]
+    else:
+        with ProcessPoolExecutor(max_workers=jobs) as pool:
+            chunks = list(pool.map(_run_chunk, *zip(*args)))
+
+    failures, total, total_sq = (sum(values) for values in zip(*chunks))
+    mean = total / n_samples
+    return ReliabilityResult(
+        n_samples=n_samples,
+        n_failures=failures,
+        capacity_mean=mean,
+        capacity_std=np.sqrt(np.maximum(total_sq / n_samples - mean**2, 0)),
+    )
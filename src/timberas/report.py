@@ -0,0 +1,286 @@
+"""
+This module provides a streaming calculation report writer for large member sets. The
+attribute list, the source of each attribute (member, material or section) and the
+nomenclature_AS1720 labels are resolved once per member class, and members are written one
+row at a time through buffered I/O, so reports for many members use constant memory.
+
+Report formats:
+    markdown: Markdown table, one row per member.
+    html: HTML table, one row per member.
+    csv: CSV file with a header row of attribute names.
+    json: JSON array of one object per member.
+
+Classes:
+    ReportField: Report column, with the attribute source and label.
+
+    ReportWriter: Streaming member report writer.
+
+Functions:
+    resolve_fields(): Resolves report columns for a member.
+
+    write_report(): Writes a report for an iterable of members.
+"""
+from __future__ import annotations
+
+import csv
+import html
+import json
+import math
+from dataclasses import dataclass
+from enum import Enum
+from typing import IO, Iterable
+
+from timberas.utils import nomenclature_AS1720 as NOMEN
+
+REPORT_FORMATS = ("markdown", "html", "csv", "json")
+SOURCES = ("member", "mat", "sec")
+DEFAULT_ATTRIBUTES = (
+    "sec_name",
+    "mat_name",
+    "L",
+    "k_1",
+    "N_dt",
+    "N_dc",
+    "M_d",
+    "V_d",
+)
+
+
+@dataclass(frozen=True)
+class ReportField:
+    """Report column.
+
+    Attributes:
+        name (str): Attribute name.
+        source (str): Object the attribute is read from, one of SOURCES.
+        label (str): Column label, attribute name with nomenclature and clause if requested.
+    """
+
+    name: str
+    source: str
+    label: str
+
+
+def resolve_fields(
+    member,
+    attribute_names: str | list[str] | None = None,
+    with_nomenclature: bool = False,
+    with_clause: bool = False,
+) -> list[ReportField]:
+    """Resolves report columns for a member. Each attribute is read from the member, or else
+    the member material or section, as in TimberMember.report(). Unknown attributes are
+    reported once and dropped.
+
+    Args:
+        member: Member used to resolve attribute sources.
+        attribute_names: Attribute name or names, defaults to DEFAULT_ATTRIBUTES.
+        with_nomenclature: If True, labels include the nomenclature_AS1720 description.
+        with_clause: If True, labels include the nomenclature_AS1720 clause.
+
+    Returns:
+        list[ReportField]: The report columns.
+    """
+    if attribute_names is None:
+        attribute_names = list(DEFAULT_ATTRIBUTES)
+    if not isinstance(attribute_names, list):
+        attribute_names = [attribute_names]
+    objects = {"member": member, "mat": member.mat, "sec": member.sec}
+
+    report_fields = []
+    for att in attribute_names:
+        source = next((src for src in SOURCES if hasattr(objects[src], att)), None)
+        if source is None:
+            print(f"Unknown attribute {att}")
+            continue
+        label = att
+        if att in NOMEN:
+            nom, clause = NOMEN[att]
+            if with_nomenclature:
+                label = label + " " + nom
+            if with_clause:
+                label = label + " " + clause
+        report_fields.append(ReportField(att, source, label))
+    return report_fields
+
+
+def _value(val):
+    """Converts an attribute value to a JSON/CSV compatible value."""
+    if isinstance(val, Enum):
+        return val.value
+    if isinstance(val, (bool, int, str)) or val is None:
+        return val
+    try:
+        val = float(val)
+    except (TypeError, ValueError):
+        return str(val)
+    return None if math.isnan(val) else val
+
+
+class ReportWriter:
+    """Streaming member report writer. Columns are resolved once per member class, and the
+    report columns are those of the first member written.
+
+    Example:
+        with ReportWriter("members.md", "markdown", with_nomenclature=True) as writer:
+            for member in members:
+                writer.write(member)
+
+    Attributes:
+        report_type (str): Report format, one of REPORT_FORMATS.
+        n_written (int): Number of members written.
+    """
+
+    def __init__(
+        self,
+        file: str | IO[str],
+        report_type: str = "markdown",
+        attribute_names: str | list[str] | None = None,
+        with_nomenclature: bool = False,
+        with_clause: bool = False,
+        buffer_size: int = 1 << 16,
+        title: str | None = None,
+    ):
+        if report_type not in REPORT_FORMATS:
+            raise ValueError(f"report_type {report_type} not in {REPORT_FORMATS}")
+        self.report_type = report_type
+        self.attribute_names = attribute_names
+        self.with_nomenclature = with_nomenclature
+        self.with_clause = with_clause
+        self.title = title
+        self.n_written = 0
+        self._owns_file = isinstance(file, str)
+        self._file = (
+            open(file, "w", buffering=buffer_size, newline="", encoding="utf-8")
+            if self._owns_file
+            else file
+        )
+        self._fields: dict[type, dict[str, ReportField]] = {}
+        self._header: list[ReportField] | None = None
+        self._csv = csv.writer(self._file) if report_type == "csv" else None
+
+    def __enter__(self) -> ReportWriter:
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
+
+    def fields(self, member) -> dict[str, ReportField]:
+        """Report columns for the member class by attribute name, resolved on first use."""
+        cls = type(member)
+        if cls not in self._fields:
+            self._fields[cls] = {
+                fld.name: fld
+                for fld in resolve_fields(
+                    member, self.attribute_names, self.with_nomenclature, self.with_clause
+                )
+            }
+        return self._fields[cls]
+
+    def write(self, member) -> None:
+        """Writes one member row. Columns are those of the first member written; attributes
+        a member does not have are left blank."""
+        report_fields = self.fields(member)
+        if self._header is None:
+            self._header = list(report_fields.values())
+            self._write_header()
+        objects = {"member": member, "mat": member.mat, "sec": member.sec}
+        values = []
+        for name in (fld.name for fld in self._header):
+            fld = report_fields.get(name)
+            values.append(None if fld is None else _value(getattr(objects[fld.source], name)))
+        self._write_row(values)
+        self.n_written += 1
+
+    def write_all(self, members: Iterable) -> int:
+        """Writes a row for each member of an iterable (e.g. a generator), returning the
+        number of members written."""
+        for member in members:
+            self.write(member)
+        return self.n_written
+
+    def close(self) -> None:
+        """Writes the report footer and closes the file if opened by the writer."""
+        if self._file is None:
+            return
+        if self._header is None:
+            self._header = []
+            self._write_header()
+        self._write_footer()
+        if self._owns_file:
+            self._file.close()
+        else:
+            self._file.flush()
+        self._file = None
+
+    def _write_header(self) -> None:
+        labels = [fld.label for fld in self._header]
+        write = self._file.write
+        if self.report_type == "markdown":
+            if self.title:
+                write(f"# {self.title}\n\n")
+            write("| " + " | ".join(labels) + " |\n")
+            write("|" + "---|" * len(labels) + "\n")
+        elif self.report_type == "html":
+            if self.title:
+                write(f"<h1>{html.escape(self.title)}</h1>\n")
+            write("<table>\n<thead>\n<tr>")
+            write("".join(f"<th>{html.escape(label)}</th>" for label in labels))
+            write("</tr>\n</thead>\n<tbody>\n")
+        elif self.report_type == "csv":
+            self._csv.writerow([fld.name for fld in self._header])
+        else:
+            write("[")
+
+    def _write_row(self, values: list) -> None:
+        write = self._file.write
+        if self.report_type == "markdown":
+            cells = ["" if val is None else str(val).replace("|", "\\|") for val in values]
+            write("| " + " | ".join(cells) + " |\n")
+        elif self.report_type == "html":
+            cells = ("" if val is None else html.escape(str(val)) for val in values)
+            write("<tr>" + "".join(f"<td>{cell}</td>" for cell in cells) + "</tr>\n")
+        elif self.report_type == "csv":
+            self._csv.writerow(["" if val is None else val for val in values])
+        else:
+            row = dict(zip((fld.name for fld in self._header), values))
+            write(("\n" if self.n_written == 0 else ",\n") + json.dumps(row))
+
+    def _write_footer(self) -> None:
+        if self.report_type == "html":
+            self._file.write("</tbody>\n</table>\n")
+        elif self.report_type == "json":
+            self._file.write("\n]\n")
+
+
+def write_report(
+    members: Iterable,
+    file: str | IO[str],
+    report_type: str = "markdown",
+    attribute_names: str | list[str] | None = None,
+    with_nomenclature: bool = False,
+    with_clause: bool = False,
+    title: str | None = None,
+) -> int:
+    """Writes a calculation report for an iterable of members.
+
+    Args:
+        members: Members, e.g. a generator of TimberMember objects.
+        file: Output file path or text stream.
+        report_type: Report format, one of REPORT_FORMATS.
+        attribute_names: Attribute name or names, defaults to DEFAULT_ATTRIBUTES.
+        with_nomenclature: If True, labels include the nomenclature_AS1720 description.
+        with_clause: If True, labels include the nomenclature_AS1720 clause.
+        title: Optional report title (markdown and html).
+
+    Returns:
+        int: The number of members written.
+    """
+    with ReportWriter(
+        file,
+        report_type,
+        attribute_names,
+        with_nomenclature=with_nomenclature,
+        with_clause=with_clause,
+        title=title,
+    ) as writer:
+        return writer.write_all(members)
@@ -0,0 +1,277 @@
+"""
+This module provides analytic sensitivity gradients of member design capacities, i.e. the
+partial derivatives of N_dt, N_dcx, N_dcy, N_dc, M_d and V_d with respect to section
+dimensions (d, b), member length L, restraint spacing L_ay, modulus of elasticity E and the
+characteristic strengths, for continuous section sizing and reliability work. Gradients are
+found by the chain rule through the rectangular member formulas (Clauses 3.2, 3.3 and 3.4,
+AS1720.1:2010) in one vectorised pass, without rebuilding members for finite differences.
+
+The capacities are piecewise smooth. Gradients are those of the branch evaluated at the member
+(k_12 segment, continuous or discrete lateral restraint, governing axis of N_dc, governing term
+of S4), and slenderness coefficients are differentiated before rounding to 2 decimal places.
+The bending capacity M_d is discontinuous at the continuous lateral restraint limit L_CLR
+(Clause 3.2.3.2), where the gradient does not describe the jump.
+
+Section areas and moduli are scaled with the rectangular section dimensions, A_c, A_t and
+A_s in proportion to b d and Z_x to b d^2. The modification factors k_1, k_4 and k_6 are held
+constant (k_4 is piecewise constant in b and d), and k_9 depends on L only through the member
+spacing s, see capacity_gradients().
+
+Classes:
+    CapacityGradients: Unrounded capacities and their partial derivatives.
+
+Functions:
+    calc_k12_derivative(): Derivative of the stability factor k_12 with respect to rho S.
+
+    capacity_gradients(): Partial derivatives of member design capacities.
+"""
+from __future__ import annotations
+
+import math
+from dataclasses import dataclass
+
+import numpy as np
+import pandas as pd
+
+from timberas.batch import MemberBatch, CAPACITY_NAMES, calc_k12, g3_lookup
+from timberas.member import TimberMember, BoardMember, RestraintEdge
+
+GRADIENT_VARIABLES = ("d", "b", "L", "L_ay", "E", "f_b", "f_t", "f_s", "f_c")
+
+
+def calc_k12_derivative(rho_times_s: np.ndarray) -> np.ndarray:
+    """Derivative of the stability factor k_12 with respect to rho S, on the k_12 segment used
+    by calc_k12() (Clause 3.2.4 and 3.3.3, AS1720.1:2010)."""
+    rho_times_s = np.asarray(rho_times_s, dtype=float)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        return np.where(
+            rho_times_s <= 10,
+            0.0,
+            np.where(rho_times_s <= 20, -0.05, -400 / rho_times_s**3),
+        )
+
+
+@dataclass
+class CapacityGradients:
+    """Unrounded design capacities and their partial derivatives.
+
+    Attributes:
+        values (dict[str, np.ndarray]): Capacities by name, CAPACITY_NAMES.
+        gradients (dict[str, dict[str, np.ndarray]]): Partial derivatives by capacity name
+            and variable name, e.g. gradients['M_d']['d'] in kNm/mm.
+        variables (tuple[str, ...]): Variable names, from GRADIENT_VARIABLES.
+    """
+
+    values: dict
+    gradients: dict
+    variables: tuple[str, ...] = GRADIENT_VARIABLES
+
+    def __getitem__(self, key: tuple[str, str]) -> np.ndarray:
+        """Partial derivative of a capacity with respect to a variable, grads['N_dc', 'L']."""
+        output, variable = key
+        return self.gradients[output][variable]
+
+    def jacobian(self, output: str) -> np.ndarray:
+        """Partial derivatives of a capacity with a trailing axis over variables."""
+        return np.stack(
+            [np.asarray(self.gradients[output][v], dtype=float) for v in self.variables], -1
+        )
+
+    def elasticities(self, output: str, inputs: dict[str, np.ndarray]) -> dict[str, np.ndarray]:
+        """Relative sensitivities (x / C) dC/dx of a capacity, for variable values x.
+
+        Args:
+            output: Capacity name.
+            inputs: Variable values by name, e.g. {'d': batch.d, 'L': batch.L}.
+
+        Returns:
+            dict[str, np.ndarray]: Elasticities by variable name.
+        """
+        value = np.asarray(self.values[output], dtype=float)
+        with np.errstate(divide="ignore", invalid="ignore"):
+            return {
+                v: np.asarray(inputs[v]) * self.gradients[output][v] / value
+                for v in self.variables
+                if v in inputs
+            }
+
+    def to_frame(self) -> pd.DataFrame:
+        """Capacities and gradients, one row per member, columns '<capacity>' and
+        'd<capacity>/d<variable>'."""
+        cols = {}
+        for name, value in self.values.items():
+            cols[name] = np.ravel(value)
+            for v in self.variables:
+                cols[f"d{name}/d{v}"] = np.ravel(self.gradients[name][v])
+        return pd.DataFrame(cols)
+
+
+def _zero(batch: MemberBatch) -> np.ndarray:
+    return np.zeros(batch.shape)
+
+
+def _slenderness_partials(batch: MemberBatch) -> dict[str, dict[str, np.ndarray]]:
+    """Partial derivatives of the unrounded rho_c, rho_b, S1, S3 and S4."""
+    d, b, L, L_ay = batch.d, batch.b, batch.L, batch.L_ay
+    seasoned = batch.seasoned
+    p_c = np.where(seasoned, -0.408, -0.367)
+    p_b = np.where(seasoned, -0.480, -0.435)
+    rho_c, rho_b = batch.rho_c, batch.rho_b
+    partials = {
+        name: {v: _zero(batch) for v in GRADIENT_VARIABLES}
+        for name in ("rho_c", "rho_b", "S1", "S3", "S4")
+    }
+
+    # Section E2, rho = C (E / f)^p r^q
+    partials["rho_c"]["E"] = p_c * rho_c / batch.E
+    partials["rho_c"]["f_c"] = -p_c * rho_c / batch.f_c
+    partials["rho_b"]["E"] = p_b * rho_b / batch.E
+    partials["rho_b"]["f_b"] = -p_b * rho_b / batch.f_b
+
+    # Clause 3.3.2.2, S3 = g_13_x L / d, S4 = min(L_ay / b, g_13_y L / b)
+    S3 = batch.g_13_x * L / d
+    partials["S3"]["L"] = batch.g_13_x / d
+    partials["S3"]["d"] = -S3 / d
+    spacing = L_ay / b <= batch.g_13_y * L / b
+    S4 = np.minimum(L_ay / b, batch.g_13_y * L / b)
+    partials["S4"]["L_ay"] = np.where(spacing, 1 / b, 0.0)
+    partials["S4"]["L"] = np.where(spacing, 0.0, batch.g_13_y / b)
+    partials["S4"]["b"] = -S4 / b
+
+    # Clause 3.2.3.2, S1 for continuous and discrete lateral restraint
+    edge = batch.restraint_edge
+    compression = (edge == RestraintEdge.COMPRESSION.value) | (edge == RestraintEdge.BOTH.value)
+    tension = edge == RestraintEdge.TENSION.value
+    torsional = edge == RestraintEdge.TENSION_AND_TORSIONAL.value
+    clr = batch.CLR
+    with np.errstate(divide="ignore", invalid="ignore"):
+        torsional_bot2 = (math.pi * d / batch.L_a_phi) ** 2 + 0.4
+        S1 = np.select(
+            [clr & tension, clr & torsional, ~clr & compression, ~clr & tension],
+            [
+                2.25 * d / b,  # Eq 3.2(7)
+                1.5 * (d / b) / torsional_bot2**0.5,  # Eq 3.2(8)
+                1.25 * d / b * (L_ay / d) ** 0.5,  # Eq 3.2(4)
+                (d / b) ** 1.35 * (L_ay / d) ** 0.25,  # Eq 3.2(5)
+            ],
+        )
+        # S1 is proportional to d^e_d b^e_b L_ay^e_L (and the torsional term in d)
+        e_d = np.select(
+            [clr & tension, clr & torsional, ~clr & compression, ~clr & tension],
+            [1.0, 1 - (math.pi * d / batch.L_a_phi) ** 2 / torsional_bot2, 0.5, 1.1],
+        )
+        e_b = np.select([clr & compression], [0.0], -np.where(~clr & tension, 1.35, 1.0))
+        e_L = np.select([~clr & compression, ~clr & tension], [0.5, 0.25])
+        partials["S1"]["d"] = e_d * S1 / d
+        partials["S1"]["b"] = e_b * S1 / b
+        partials["S1"]["L_ay"] = np.where(e_L != 0, e_L * S1 / L_ay, 0.0)
+    return partials
+
+
+def _k_9_derivative(batch: MemberBatch, s: np.ndarray, n_mem: np.ndarray) -> np.ndarray:
+    """Derivative of k_9 = max(g_31 + (g_32 - g_31)(1 - 2 s / L), 1) with respect to L,
+    Clause 2.4.5.3, AS1720.1:2010."""
+    n_com = np.maximum(batch.n, 1)
+    g_31 = g3_lookup(n_com)
+    g_32 = g3_lookup(n_com * np.asarray(n_mem))
+    s = np.asarray(s, dtype=float)
+    k_9 = g_31 + (g_32 - g_31) * (1 - (2 * s / batch.L))
+    return np.where(k_9 > 1, (g_32 - g_31) * 2 * s / batch.L**2, 0.0)
+
+
+def capacity_gradients(
+    member: MemberBatch | TimberMember,
+    s: np.ndarray | None = None,
+    n_mem: np.ndarray | None = None,
+) -> CapacityGradients:
+    """Partial derivatives of design capacities with respect to GRADIENT_VARIABLES.
+
+    Args:
+        member: MemberBatch, or a single BoardMember or GlulamMember. Gradients of a single
+            member are floats.
+        s: Member spacing (mm) for the L derivative of k_9. Defaults to the spacing of a
+            BoardMember, otherwise 0 (k_9 independent of L). The k_9 values are taken from
+            the batch.
+        n_mem: Number of members in the parallel system, for the L derivative of k_9.
+
+    Returns:
+        CapacityGradients: Unrounded capacities and their partial derivatives. Units are
+        kN or kNm per mm (d, b, L, L_ay) or per MPa (E, f_b, f_t, f_s, f_c).
+    """
+    single = isinstance(member, TimberMember)
+    if single:
+        if isinstance(member, BoardMember):
+            s = member.s if s is None else s
+            n_mem = member.n_mem if n_mem is None else n_mem
+        batch = MemberBatch.from_members([member], sig_figs=0)
+    else:
+        batch = member
+    s = 0.0 if s is None else s
+    n_mem = 1 if n_mem is None else n_mem
+
+    partials = _slenderness_partials(batch)
+    d, b = batch.d, batch.b
+    k_common = batch._k_common
+    rho_c, rho_b = batch.rho_c, batch.rho_b
+    A_c, A_t, Z_x, A_s = batch.A_c, batch.A_t, batch.Z_x, batch.A_s
+    f_c, f_b = batch.f_c, batch.f_b
+    x_c3, x_c4 = rho_c * batch.S3, rho_c * batch.S4
+    minor_x = batch.I_x < batch.I_y
+    x_b = rho_b * batch.S1
+    k_12_x, k_12_y = calc_k12(x_c3), calc_k12(x_c4)
+    k_12_bend = np.where(minor_x, 1.0, calc_k12(x_b))
+    dk_x, dk_y = calc_k12_derivative(x_c3), calc_k12_derivative(x_c4)
+    dk_b = np.where(minor_x, 0.0, calc_k12_derivative(x_b))
+    dk_9 = _k_9_derivative(batch, s, n_mem)
+
+    values = {
+        "N_dt": k_common * batch.f_t * A_t / 1000,
+        "N_dcx": k_common * k_12_x * f_c * A_c / 1000,
+        "N_dcy": k_common * k_12_y * f_c * A_c / 1000,
+        "M_d": k_common * batch.k_9 * k_12_bend * f_b * Z_x / 1e6,
+        "V_d": k_common * batch.f_s * A_s / 1e3,
+    }
+    values["N_dc"] = np.minimum(values["N_dcx"], values["N_dcy"])
+    x_governs = values["N_dcx"] <= values["N_dcy"]
+
+    gradients = {name: {} for name in CAPACITY_NAMES}
+    with np.errstate(divide="ignore", invalid="ignore"):
+        for v in GRADIENT_VARIABLES:
+            # section properties: areas ~ b d, Z_x ~ b d^2
+            dA = {"d": 1 / d, "b": 1 / b}.get(v, 0.0)
+            dZ = {"d": 2 / d, "b": 1 / b}.get(v, 0.0)
+            gradients["N_dt"][v] = values["N_dt"] * (dA + (v == "f_t") / batch.f_t)
+            gradients["V_d"][v] = values["V_d"] * (dA + (v == "f_s") / batch.f_s)
+
+            rel_c = dA + (v == "f_c") / f_c
+            drho_c = partials["rho_c"][v]
+            dk_12_x = dk_x * (drho_c * batch.S3 + rho_c * partials["S3"][v])
+            dk_12_y = dk_y * (drho_c * batch.S4 + rho_c * partials["S4"][v])
+            unstable_c = k_common * f_c * A_c / 1000
+            gradients["N_dcx"][v] = unstable_c * (dk_12_x + k_12_x * rel_c)
+            gradients["N_dcy"][v] = unstable_c * (dk_12_y + k_12_y * rel_c)
+            gradients["N_dc"][v] = np.where(
+                x_governs, gradients["N_dcx"][v], gradients["N_dcy"][v]
+            )
+
+            dk_12_bend = dk_b * (partials["rho_b"][v] * batch.S1 + rho_b * partials["S1"][v])
+            dk_9_v = dk_9 if v == "L" else 0.0
+            unstable_b = k_common * f_b * Z_x / 1e6
+            gradients["M_d"][v] = unstable_b * (
+                dk_9_v * k_12_bend
+                + batch.k_9 * dk_12_bend
+                + batch.k_9 * k_12_bend * (dZ + (v == "f_b") / f_b)
+            )
+
+    if single:
+        values = {name: float(np.ravel(val)[0]) for name, val in values.items()}
+        gradients = {
+            name: {v: float(np.ravel(val)[0]) for v, val in grads.items()}
+            for name, grads in gradients.items()
+        }
+    else:
+        gradients = {
+            name: {v: np.broadcast_to(val, batch.shape) for v, val in grads.items()}
+            for name, grads in gradients.items()
+        }
+    return CapacityGradients(values=values, gradients=gradients)
@@ -0,0 +1,374 @@
+"""
+This module provides a local asyncio design-check service. Member-check requests are received as
+JSON lines over a TCP socket, coalesced into micro-batches, and evaluated with a vectorised
+MemberBatch. Each request receives its design capacities and latency metrics.
+
+Each request is a JSON object containing MemberBatch.from_records() record keys and an optional
+'id', e.g.:
+    {"id": 1, "sec": "90x45", "mat": "MGP10", "L": 2700, "g_13": 0.9, "k_1": 0.8}
+
+Each response is a JSON object:
+    {"id": 1, "ok": true, "result": {"N_dt": ..., ...}, "latency": {...}}
+    {"id": 2, "ok": false, "error": "KeyError: ..."}
+
+Classes:
+    DesignCheckService: Request queue and micro-batch evaluation of member checks.
+
+    DesignCheckClient: JSON-lines client for a running design-check server.
+
+Functions:
+    serve(): Starts a JSON-lines TCP server for a DesignCheckService.
+
+    main(): Command line entry point, runs a design-check server.
+"""
+from __future__ import annotations
+
+import argparse
+import asyncio
+import itertools
+import json
+import time
+from dataclasses import dataclass, field
+
+import pandas as pd
+
+from timberas.batch import MemberBatch
+from timberas.geometry import import_section_library
+from timberas.material import SizedMaterialCache, import_material_library
+
+
+@dataclass
+class _PendingCheck:
+    """A queued member-check request and the future its result is returned through."""
+
+    request: dict
+    future: asyncio.Future
+    t_submit: float = field(default_factory=time.perf_counter)
+
+
+class DesignCheckService:
+    """Coalesces concurrent member-check requests into micro-batches for vectorised evaluation.
+
+    Requests are queued by submit(). A batching task collects up to max_batch_size requests,
+    waiting at most max_wait seconds after the first request of a batch, and evaluates the batch
+    with MemberBatch.from_records() in a worker thread. If a batch fails, its requests are
+    re-evaluated individually so that an invalid request only fails itself. Size-adjusted
+    materials are shared across batches through one SizedMaterialCache.
+
+    If the batching task is stopped, or fails unexpectedly, while a batch is in progress, the
+    requests of that batch fail with an exception rather than waiting indefinitely, and an
+    unexpected failure does not stop the batching task.
+
+    Backpressure is applied by a bounded queue - submit() waits while max_queue requests are
+    already pending.
+
+    Attributes:
+        max_batch_size (int): Maximum number of requests per micro-batch.
+        max_wait (float): Maximum time (s) to wait for a micro-batch to fill.
+        max_queue (int): Maximum number of pending requests before submit() waits.
+        stats (dict): Counts of requests, batches, errors and the largest batch size.
+    """
+
+    def __init__(
+        self,
+        max_batch_size: int = 256,
+        max_wait: float = 0.002,
+        max_queue: int = 4096,
+        section_library: pd.DataFrame | None = None,
+        material_library: pd.DataFrame | None = None,
+    ):
+        self.max_batch_size = max_batch_size
+        self.max_wait = max_wait
+        self.max_queue = max_queue
+        self.section_library = (
+            import_section_library() if section_library is None else section_library
+        )
+        self.material_library = (
+            import_material_library() if material_library is None else material_library
+        )
+        self.sized_materials = SizedMaterialCache(library=self.material_library)
+        self.stats = {"requests": 0, "batches": 0, "errors": 0, "max_batch_size": 0}
+        self._queue: asyncio.Queue | None = None
+        self._task: asyncio.Task | None = None
+
+    async def start(self) -> DesignCheckService:
+        """Starts the batching task on the running event loop."""
+        if self._task is None:
+            self._queue = asyncio.Queue(maxsize=self.max_queue)
+            self._task = asyncio.create_task(self._run())
+        return self
+
+    async def stop(self) -> None:
+        """Stops the batching task, failing any requests still in the queue."""
+        if self._task is None:
+            return
+        self._task.cancel()
+        try:
+            await self._task
+        except asyncio.CancelledError:
+            pass
+        self._task = None
+        while not self._queue.empty():
+            pending = self._queue.get_nowait()
+            pending.future.set_exception(RuntimeError("design check service stopped"))
+
+    async def __aenter__(self) -> DesignCheckService:
+        return await self.start()
+
+    async def __aexit__(self, *exc) -> None:
+        await self.stop()
+
+    async def submit(self, request: dict) -> dict:
+        """Submits one member-check request and waits for its response.
+
+        Args:
+            request: Member input record, see MemberBatch.from_records(), with optional 'id'.
+
+        Returns:
+            dict: Response with 'id', 'ok', and 'result' and 'latency' or 'error'.
+        """
+        if self._task is None:
+            raise RuntimeError("design check service not started, use start()")
+        pending = _PendingCheck(request, asyncio.get_running_loop().create_future())
+        await self._queue.put(pending)
+        return await pending.future
+
+    async def _run(self) -> None:
+        while True:
+            batch: list[_PendingCheck] = []
+            try:
+                await self._run_batch(batch)
+            except asyncio.CancelledError:
+                _fail(batch, RuntimeError("design check service stopped"))
+                raise
+            except Exception as err:  # pylint: disable=broad-except
+                # keep the batching task alive, failing only the requests of this batch. A
+                # new exception is used, as err holds the frames of this task in its traceback
+                self.stats["errors"] += sum(not p.future.done() for p in batch)
+                _fail(batch, RuntimeError(f"design check failed: {type(err).__name__}: {err}"))
+
+    async def _run_batch(self, batch: list[_PendingCheck]) -> None:
+        """Collects one micro-batch into batch, evaluates it and resolves its futures."""
+        loop = asyncio.get_running_loop()
+        batch.append(await self._queue.get())
+        deadline = loop.time() + self.max_wait
+        while len(batch) < self.max_batch_size:
+            if self._queue.empty():
+                timeout = deadline - loop.time()
+                if timeout <= 0:
+                    break
+                try:
+                    batch.append(await asyncio.wait_for(self._queue.get(), timeout))
+                except asyncio.TimeoutError:
+                    break
+            else:
+                batch.append(self._queue.get_nowait())
+
+        t_start = time.perf_counter()
+        responses = await loop.run_in_executor(None, self.evaluate, [p.request for p in batch])
+        t_end = time.perf_counter()
+
+        self.stats["requests"] += len(batch)
+        self.stats["batches"] += 1
+        self.stats["max_batch_size"] = max(self.stats["max_batch_size"], len(batch))
+        for pending, response in zip(batch, responses):
+            if not response["ok"]:
+                self.stats["errors"] += 1
+            else:
+                response["latency"] = {
+                    "queue_ms": 1000 * (t_start - pending.t_submit),
+                    "eval_ms": 1000 * (t_end - t_start),
+                    "total_ms": 1000 * (t_end - pending.t_submit),
+                    "batch_size": len(batch),
+                }
+            if not pending.future.done():
+                pending.future.set_result(response)
+
+    def evaluate(self, requests: list[dict]) -> list[dict]:
+        """Evaluates a list of member-check requests as one vectorised batch.
+
+        Args:
+            requests: Member input records, see MemberBatch.from_records().
+
+        Returns:
+            list[dict]: Responses in the same order as requests. Requests in a failed batch are
+            evaluated individually and invalid requests are returned with an 'error'.
+        """
+        try:
+            batch = MemberBatch.from_records(
+                requests, self.section_library, sized_materials=self.sized_materials
+            )
+        except Exception as err:  # pylint: disable=broad-except
+            if len(requests) > 1:
+                return [self.evaluate([req])[0] for req in requests]
+            return [
+                {
+                    "id": _request_id(requests[0]),
+                    "ok": False,
+                    "error": f"{type(err).__name__}: {err}",
+                }
+            ]
+        results = batch.results()
+        return [
+            {
+                "id": req.get("id"),
+                "ok": True,
+                "result": {name: float(val[i]) for name, val in results.items()},
+            }
+            for i, req in enumerate(requests)
+        ]
+
+
+def _fail(batch: list[_PendingCheck], err: BaseException) -> None:
+    """Fails the unresolved requests of a batch."""
+    for pending in batch:
+        if not pending.future.done():
+            pending.future.set_exception(err)
+
+
+def _request_id(request):
+    return request.get("id") if isinstance(request, dict) else None
+
+
+async def serve(
+    service: DesignCheckService,
+    host: str = "127.0.0.1",
+    port: int = 0,
+    max_in_flight: int = 256,
+) -> asyncio.AbstractServer:
+    """Starts a JSON-lines TCP server for a started DesignCheckService. Requests on a connection
+    are evaluated concurrently and responses are written as they complete, so they may be
+    returned out of order - match them by 'id'. At most max_in_flight requests per connection
+    are pending before reading from that connection pauses.
+
+    Args:
+        service: The design check service to submit requests to.
+        host: Host address to bind to, defaults to localhost only.
+        port: Port to bind to, 0 selects a free port.
+        max_in_flight: Maximum number of pending requests per connection.
+
+    Returns:
+        asyncio.AbstractServer: The running server, see server.sockets for the bound port.
+    """
+
+    async def handle(reader: asyncio.StreamReader, writer: asyncio.StreamWriter):
+        slots = asyncio.Semaphore(max_in_flight)
+        tasks = set()
+
+        async def respond(line: bytes):
+            try:
+                try:
+                    request = json.loads(line)
+                except json.JSONDecodeError as err:
+                    response = {"id": None, "ok": False, "error": f"JSONDecodeError: {err}"}
+                else:
+                    try:
+                        response = await service.submit(request)
+                    except Exception as err:  # pylint: disable=broad-except
+                        # e.g. a stopped service, or a failed batch
+                        response = {
+                            "id": _request_id(request),
+                            "ok": False,
+                            "error": f"{type(err).__name__}: {err}",
+                        }
+                writer.write(json.dumps(response).encode() + b"\n")
+                await writer.drain()
+            finally:
+                slots.release()
+
+        try:
+            while line := await reader.readline():
+                if not line.strip():
+                    continue
+                await slots.acquire()
+                task = asyncio.create_task(respond(line))
+                tasks.add(task)
+                task.add_done_callback(tasks.discard)
+            if tasks:
+                await asyncio.gather(*tasks, return_exceptions=True)
+        finally:
+            writer.close()
+
+    return await asyncio.start_server(handle, host, port)
+
+
+class DesignCheckClient:
+    """JSON-lines client for a design-check server. Requests may be sent concurrently from
+    multiple tasks, responses are matched to requests by 'id'.
+
+    Example:
+        client = await DesignCheckClient.connect("127.0.0.1", port)
+        response = await client.check({"sec": "90x45", "mat": "MGP10", "L": 2400})
+        await client.close()
+    """
+
+    def __init__(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter):
+        self._reader = reader
+        self._writer = writer
+        self._ids = itertools.count()
+        self._pending: dict = {}
+        self._listener = asyncio.create_task(self._listen())
+
+    @classmethod
+    async def connect(cls, host: str = "127.0.0.1", port: int = 8765) -> DesignCheckClient:
+        """Opens a connection to a design-check server."""
+        reader, writer = await asyncio.open_connection(host, port)
+        return cls(reader, writer)
+
+    async def check(self, request: dict) -> dict:
+        """Sends one member-check request and waits for its response. An 'id' is assigned if
+        the request does not contain one."""
+        request = dict(request)
+        request.setdefault("id", f"client-{next(self._ids)}")
+        future = asyncio.get_running_loop().create_future()
+        self._pending[request["id"]] = future
+        self._writer.write(json.dumps(request).encode() + b"\n")
+        await self._writer.drain()
+        return await future
+
+    async def close(self) -> None:
+        """Closes the connection."""
+        self._writer.close()
+        await self._writer.wait_closed()
+        self._listener.cancel()
+
+    async def _listen(self) -> None:
+        while line := await self._reader.readline():
+            response = json.loads(line)
+            future = self._pending.pop(response["id"], None)
+            if future is not None and not future.done():
+                future.set_result(response)
+        for future in self._pending.values():
+            if not future.done():
+                future.set_exception(ConnectionError("design check server disconnected"))
+
+
+def main(argv: list[str] | None = None) -> None:
+    """Runs a design-check server until interrupted."""
+    parser = argparse.ArgumentParser(description="timberas design-check server")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--max-batch-size", type=int, default=256)
+    parser.add_argument("--max-wait-ms", type=float, default=2.0)
+    parser.add_argument("--max-queue", type=int, default=4096)
+    args = parser.parse_args(argv)
+
+    async def run():
+        async with DesignCheckService(
+            max_batch_size=args.max_batch_size,
+            max_wait=args.max_wait_ms / 1000,
+            max_queue=args.max_queue,
+        ) as service:
+            server = await serve(service, args.host, args.port)
+            print(f"timberas design-check server on {args.host}:{args.port}")
+            async with server:
+                await server.serve_forever()
+
+    try:
+        asyncio.run(run())
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == "__main__":
+    main()
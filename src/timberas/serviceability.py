@@ -0,0 +1,190 @@
+"""
+This module provides vectorised serviceability (deflection) checks for simply supported
+members. Mid-span deflections are evaluated from material modulus of elasticity E and section
+second moment of area I_x for arrays of members and a table of deflection cases, including the
+creep factor j_2 for long-term loads.
+
+A deflection case table is a DataFrame with one row per case, with columns:
+    name: case name.
+    G, Q: load factor for permanent and imposed loads.
+    duration: load duration (days), used for the creep factor j_2.
+    span_ratio: deflection limit as span / span_ratio.
+    max_deflection: absolute deflection limit (mm), nan for no absolute limit.
+
+Classes:
+    DeflectionCheck: Deflections, limits and governing case per member.
+
+Functions:
+    j_2_lookup(): Creep factor j_2 for load duration, Clause 2.4.1.2.
+
+    midspan_deflection(): Mid-span deflection of a simply supported member.
+
+    deflection_cases(): Default deflection case table for floor joists.
+
+    check_deflection(): Deflection checks for arrays of members and a case table.
+"""
+from __future__ import annotations
+
+from dataclasses import dataclass
+
+import numpy as np
+import pandas as pd
+
+# Table 2.4, AS1720.1:2010 - j_2 for loads of duration 12 months or more
+J_2_LONG_TERM = {True: 2.0, False: 3.0}
+
+
+def j_2_lookup(seasoned: np.ndarray, duration: np.ndarray) -> np.ndarray:
+    """Duration of load factor for creep deflection j_2, Clause 2.4.1.2 and Table 2.4,
+    AS1720.1:2010. j_2 = 1 for loads of 1 day or less and 2 (seasoned) or 3 (unseasoned) for
+    loads of 12 months or more, interpolated on log(duration) in between.
+
+    Args:
+        seasoned: Boolean array of material seasoning.
+        duration: Load duration (days).
+
+    Returns:
+        np.ndarray: The creep factor j_2.
+    """
+    seasoned = np.asarray(seasoned, dtype=bool)
+    j_2_long = np.where(seasoned, J_2_LONG_TERM[True], J_2_LONG_TERM[False])
+    with np.errstate(divide="ignore"):
+        frac = np.log10(np.asarray(duration, dtype=float)) / np.log10(365)
+    return 1 + (j_2_long - 1) * np.clip(frac, 0, 1)
+
+
+def midspan_deflection(
+    w: np.ndarray,
+    L: np.ndarray,
+    E: np.ndarray,
+    I: np.ndarray,
+    P: np.ndarray = 0.0,
+    j_2: np.ndarray = 1.0,
+) -> np.ndarray:
+    """Mid-span deflection of a simply supported member under a uniformly distributed load and
+    a mid-span point load, delta = j_2 (5 w L^4 / (384 E I) + P L^3 / (48 E I)).
+
+    Args:
+        w: Uniformly distributed load (kN/m, equal to N/mm).
+        L: Span (mm).
+        E: Modulus of elasticity (MPa).
+        I: Second moment of area (mm4).
+        P: Mid-span point load (kN).
+        j_2: Creep factor.
+
+    Returns:
+        np.ndarray: Mid-span deflection (mm).
+    """
+    L = np.asarray(L, dtype=float)
+    EI = np.asarray(E, dtype=float) * I
+    udl = 5 * np.asarray(w) * L**4 / (384 * EI)
+    point = 1e3 * np.asarray(P) * L**3 / (48 * EI)
+    return j_2 * (udl + point)
+
+
+def deflection_cases() -> pd.DataFrame:
+    """Deflection cases for floor joists: long-term permanent load (span/300, 15 mm),
+    short-term imposed load (span/360, 9 mm), and long-term permanent and long-term imposed
+    load (span/300)."""
+    rows = [
+        ("G long-term", 1.0, 0.0, 18250, 300, 15.0),
+        ("Q short-term", 0.0, 1.0, 1, 360, 9.0),
+        ("G+psi_l.Q long-term", 1.0, 0.4, 18250, 300, np.nan),
+    ]
+    return pd.DataFrame(
+        rows, columns=["name", "G", "Q", "duration", "span_ratio", "max_deflection"]
+    )
+
+
+@dataclass
+class DeflectionCheck:
+    """Mid-span deflections and deflection limits for each case.
+
+    Attributes:
+        names (np.ndarray): Case names, shape (n_cases,).
+        j_2 (np.ndarray): Creep factors, shape (..., n_cases).
+        deflection (np.ndarray): Mid-span deflections (mm), shape (..., n_cases).
+        limit (np.ndarray): Deflection limits (mm), shape (..., n_cases).
+    """
+
+    names: np.ndarray
+    j_2: np.ndarray
+    deflection: np.ndarray
+    limit: np.ndarray
+
+    @property
+    def ratio(self) -> np.ndarray:
+        """Deflection / limit for each case."""
+        return self.deflection / self.limit
+
+    @property
+    def governing(self) -> np.ndarray:
+        """Index of the governing case per member."""
+        return np.argmax(self.ratio, axis=-1)
+
+    @property
+    def governing_name(self) -> np.ndarray:
+        """Name of the governing case per member."""
+        return self.names[self.governing]
+
+    @property
+    def util_max(self) -> np.ndarray:
+        """Deflection / limit ratio of the governing case per member."""
+        return np.max(self.ratio, axis=-1)
+
+    @property
+    def passed(self) -> np.ndarray:
+        """True where the member passes all deflection cases."""
+        return self.util_max <= 1.0
+
+
+def check_deflection(
+    L: np.ndarray,
+    E: np.ndarray,
+    I: np.ndarray,
+    G: np.ndarray,
+    Q: np.ndarray = 0.0,
+    spacing: np.ndarray | None = None,
+    seasoned: np.ndarray = True,
+    cases: pd.DataFrame | None = None,
+) -> DeflectionCheck:
+    """Evaluates mid-span deflections of simply supported members for every deflection case in
+    one vectorised pass.
+
+    Args:
+        L: Spans (mm), shape (n,).
+        E: Modulus of elasticity (MPa), e.g. MemberBatch.E or TimberMaterial.E.
+        I: Second moment of area (mm4), e.g. MemberBatch.I_x or TimberSection.I_x.
+        G: Permanent loads, as area loads (kPa) if spacing is provided, else as line loads
+            (kN/m).
+        Q: Imposed loads, as area loads (kPa) if spacing is provided, else as line loads
+            (kN/m).
+        spacing: Member spacing (mm), converts area loads to line loads.
+        seasoned: Boolean array of material seasoning, for creep factor j_2.
+        cases: Deflection case table, defaults to deflection_cases().
+
+    Returns:
+        DeflectionCheck: Deflections and limits with shape (n, n_cases).
+    """
+    if cases is None:
+        cases = deflection_cases()
+    L, E, I, G, Q, seasoned = (
+        np.asarray(val)[..., np.newaxis] for val in (L, E, I, G, Q, seasoned)
+    )
+    if spacing is not None:
+        width = np.asarray(spacing, dtype=float)[..., np.newaxis] / 1e3
+        G, Q = G * width, Q * width
+
+    w = G * cases["G"].to_numpy(dtype=float) + Q * cases["Q"].to_numpy(dtype=float)
+    j_2 = j_2_lookup(seasoned, cases["duration"].to_numpy(dtype=float))
+    deflection = midspan_deflection(w, L, E, I, j_2=j_2)
+    limit = np.fmin(
+        L / cases["span_ratio"].to_numpy(dtype=float),
+        cases["max_deflection"].to_numpy(dtype=float),
+    )
+    return DeflectionCheck(
+        names=cases["name"].to_numpy(),
+        j_2=np.broadcast_to(j_2, deflection.shape),
+        deflection=deflection,
+        limit=np.broadcast_to(limit, deflection.shape),
+    )
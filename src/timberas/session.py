@@ -0,0 +1,318 @@
+"""
+This module provides an interactive design session, which tracks the sections, materials and
+parameters each member depends on. After an edit, only the affected members, and only the
+capacities depending on the edited attributes, are recalculated, and a change event is sent to
+the session subscribers.
+
+Edits are made through DesignSession.edit(), or made directly to members, sections and
+materials and then found by DesignSession.sync().
+
+Classes:
+    CapacityChange: Change of one member capacity.
+
+    ChangeEvent: Edit applied to a session, with the recalculated members and capacity changes.
+
+    DesignSession: Members with change propagation from shared sections, materials and
+    parameters.
+
+Functions:
+    affected_capacities(): Capacities depending on edited member, section or material
+    attributes.
+"""
+from __future__ import annotations
+
+from dataclasses import dataclass, field, fields
+from math import nan
+from typing import Callable
+
+from timberas.geometry import TimberSection
+from timberas.material import TimberMaterial
+from timberas.member import TimberMember, CAPACITIES
+
+# member, material (mat.) and section (sec.) attributes used by all capacities:
+# phi (Table 2.1), k_1, k_4 (Table 2.5) and k_6 (Clause 2.4.3)
+_COMMON = {
+    "application_cat",
+    "k_1",
+    "consider_partial_seasoning",
+    "high_temp_latitude",
+    "mat.seasoned",
+    "mat.phi_1",
+    "mat.phi_2",
+    "mat.phi_3",
+    "sec.b",
+    "sec.d",
+}
+_COMPRESSION = {"mat.f_c", "mat.E", "sec.A_c", "r", "L", "g_13"}
+
+# attributes each capacity depends on
+CAPACITY_DEPENDENCIES = {
+    "N_dt": _COMMON | {"mat.f_t", "sec.A_t"},
+    "N_dcx": _COMMON | _COMPRESSION,
+    "N_dcy": _COMMON | _COMPRESSION | {"L_a"},
+    "N_dc": _COMMON | _COMPRESSION | {"L_a"},
+    "M_d": _COMMON
+    | {
+        "mat.f_b",
+        "mat.E",
+        "sec.n",
+        "sec.shape_type",
+        "sec.I_x",
+        "sec.I_y",
+        "L",
+        "L_a",
+        "r",
+        "restraint_edge",
+        "n_mem",
+        "s",
+    },
+    "V_d": _COMMON | {"mat.f_s", "sec.n"},
+}
+# attributes not used by any capacity
+NON_CAPACITY_ATTRIBUTES = {
+    "sec.name",
+    "sec.A_g",
+    "mat.name",
+    "mat.grade",
+    "mat.grade_type",
+    "mat.G",
+    "mat.density",
+}
+# section attributes recalculated by solve_shape() when section dimensions change
+SECTION_DIMENSIONS = {"shape_type", "b", "d", "n"}
+SECTION_PROPERTIES = ("A_g", "A_t", "A_c", "I_x", "I_y")
+
+
+def affected_capacities(attribute_names: set[str]) -> tuple[str, ...]:
+    """Capacities depending on edited attributes, see CAPACITY_DEPENDENCIES.
+
+    Args:
+        attribute_names: Member attribute names, and material and section attribute names
+            prefixed with 'mat.' and 'sec.'. Other attributes (e.g. sig_figs) affect all
+            capacities.
+
+    Returns:
+        tuple[str, ...]: Affected capacity names, in CAPACITIES order.
+    """
+    known = set().union(*CAPACITY_DEPENDENCIES.values()) | NON_CAPACITY_ATTRIBUTES
+    if set(attribute_names) - known:
+        return CAPACITIES
+    return tuple(
+        name for name in CAPACITIES if CAPACITY_DEPENDENCIES[name] & set(attribute_names)
+    )
+
+
+@dataclass(frozen=True)
+class CapacityChange:
+    """Change of one member capacity.
+
+    Attributes:
+        member (int): Member index in the session.
+        name (str): Capacity name.
+        old (float): Previous value.
+        new (float): Recalculated value.
+    """
+
+    member: int
+    name: str
+    old: float
+    new: float
+
+
+@dataclass
+class ChangeEvent:
+    """Edit applied to a session.
+
+    Attributes:
+        source (object): Edited member, section or material.
+        changes (dict): Edited attribute names and new values.
+        recalculated (list[int]): Indices of recalculated members.
+        capacities (tuple[str, ...]): Recalculated capacities.
+        changed (list[CapacityChange]): Capacities with changed values.
+    """
+
+    source: object
+    changes: dict
+    recalculated: list[int] = field(default_factory=list)
+    capacities: tuple[str, ...] = ()
+    changed: list[CapacityChange] = field(default_factory=list)
+
+
+# member attributes which are not dataclass fields, e.g. BoardMember k_9 parameters
+SNAPSHOT_ATTRIBUTES = ("n_mem", "s")
+
+
+def _snapshot(obj) -> dict:
+    snapshot = {f.name: getattr(obj, f.name) for f in fields(obj) if f.init}
+    if isinstance(obj, TimberMember):
+        for name in SNAPSHOT_ATTRIBUTES:
+            if hasattr(obj, name):
+                snapshot[name] = getattr(obj, name)
+    return snapshot
+
+
+def _changed(before: dict, after: dict) -> dict:
+    """Changed snapshot values, with member sections and materials compared by identity."""
+    changes = {}
+    for key, val in after.items():
+        old = before.get(key)
+        if key in ("sec", "mat"):
+            same = val is old
+        else:
+            same = val == old or (val != val and old != old)
+        if not same:
+            changes[key] = val
+    return changes
+
+
+class DesignSession:
+    """Container of members with change propagation. Tracks the members using each section
+    and material object (by identity), so an edit to a shared section or material, or to a
+    member parameter, recalculates only the affected members and capacities, and sends a
+    ChangeEvent to each subscriber.
+
+    Example:
+        session = DesignSession(members)
+        session.subscribe(lambda event: print(event.changed))
+        session.edit(mgp10, f_b=16.0)
+
+    Attributes:
+        members (list[TimberMember]): Members in the session.
+        events (list[ChangeEvent]): Change events, most recent last, if keep_events.
+    """
+
+    def __init__(self, members: list[TimberMember] | None = None, keep_events: bool = False):
+        self.members: list[TimberMember] = []
+        self.keep_events = keep_events
+        self.events: list[ChangeEvent] = []
+        self._subscribers: list[Callable[[ChangeEvent], None]] = []
+        self._users: dict[int, set[int]] = {}
+        self._objects: dict[int, object] = {}
+        self._snapshots: dict[int, dict] = {}
+        for member in members or []:
+            self.add(member)
+
+    def __len__(self) -> int:
+        return len(self.members)
+
+    def add(self, member: TimberMember) -> int:
+        """Adds a solved member to the session, returning its index."""
+        index = len(self.members)
+        self.members.append(member)
+        self._track(index)
+        return index
+
+    def _track(self, index: int) -> None:
+        member = self.members[index]
+        for obj in (member, member.sec, member.mat):
+            self._objects[id(obj)] = obj
+            self._snapshots[id(obj)] = _snapshot(obj)
+        for obj in (member.sec, member.mat):
+            self._users.setdefault(id(obj), set()).add(index)
+
+    def users(self, obj: TimberSection | TimberMaterial) -> list[TimberMember]:
+        """Members using a section or material object."""
+        return [self.members[i] for i in sorted(self._users.get(id(obj), ()))]
+
+    def subscribe(self, callback: Callable[[ChangeEvent], None]) -> None:
+        """Registers a callback receiving a ChangeEvent after each edit."""
+        self._subscribers.append(callback)
+
+    def unsubscribe(self, callback: Callable[[ChangeEvent], None]) -> None:
+        """Removes a registered callback."""
+        self._subscribers.remove(callback)
+
+    def edit(
+        self, obj: TimberMember | TimberSection | TimberMaterial, **changes
+    ) -> ChangeEvent:
+        """Edits a member, section or material in the session and recalculates the affected
+        capacities of the affected members. Section dimension edits (shape_type, b, d, n)
+        recalculate the section properties not in changes, see SharedTimberSection.
+
+        Args:
+            obj: Member, or section or material used by session members.
+            changes: Attribute names and new values.
+
+        Returns:
+            ChangeEvent: The applied edit, also sent to subscribers.
+        """
+        if id(obj) not in self._objects:
+            raise KeyError(f"{type(obj).__name__} {getattr(obj, 'name', '')} not in session")
+        if isinstance(obj, TimberSection) and SECTION_DIMENSIONS & changes.keys():
+            changes = dict.fromkeys(SECTION_PROPERTIES, nan) | changes
+        for key, val in changes.items():
+            if not hasattr(obj, key):
+                raise AttributeError(f"{type(obj).__name__} has no attribute {key}")
+            setattr(obj, key, val)
+        if isinstance(obj, TimberSection):
+            obj.solve_shape()
+        return self._propagate(obj)
+
+    def sync(self) -> list[ChangeEvent]:
+        """Finds edits made directly to session members, sections and materials since they
+        were added or last synchronised, and recalculates the affected capacities. Section
+        properties are not recalculated, call TimberSection.solve_shape() after changing
+        section dimensions.
+
+        Returns:
+            list[ChangeEvent]: Events for edited objects.
+        """
+        events = []
+        for key in list(self._objects):
+            obj = self._objects.get(key)
+            if obj is not None and _changed(self._snapshots[key], _snapshot(obj)):
+                events.append(self._propagate(obj))
+        return events
+
+    def _propagate(self, obj) -> ChangeEvent:
+        before = self._snapshots[id(obj)]
+        changes = _changed(before, _snapshot(obj))
+        if isinstance(obj, TimberMember):
+            indices = [i for i, member in enumerate(self.members) if member is obj]
+            prefix = ""
+        else:
+            indices = sorted(self._users.get(id(obj), ()))
+            prefix = "sec." if isinstance(obj, TimberSection) else "mat."
+        self._snapshots[id(obj)] = _snapshot(obj)
+
+        event = ChangeEvent(source=obj, changes=changes)
+        if isinstance(obj, TimberMember) and {"sec", "mat"} & changes.keys():
+            # member uses a different section or material: recalculate all capacities
+            for i in indices:
+                self._retrack(i, before)
+            capacities = CAPACITIES
+        else:
+            capacities = affected_capacities({prefix + key for key in changes})
+        if indices and capacities:
+            for i in indices:
+                member = self.members[i]
+                old = {name: getattr(member, name) for name in capacities}
+                member.solve_capacities(capacities)
+                if member is obj:
+                    # inputs are rounded by solve_capacities()
+                    self._snapshots[id(member)] = _snapshot(member)
+                event.changed += [
+                    CapacityChange(i, name, old[name], getattr(member, name))
+                    for name in capacities
+                    if old[name] != getattr(member, name)
+                ]
+            event.recalculated = indices
+            event.capacities = capacities
+        if self.keep_events:
+            self.events.append(event)
+        for callback in self._subscribers:
+            callback(event)
+        return event
+
+    def _retrack(self, index: int, before: dict) -> None:
+        member = self.members[index]
+        for key in ("sec", "mat"):
+            old = before[key]
+            users = self._users.get(id(old), set())
+            users.discard(index)
+            if not users:
+                self._users.pop(id(old), None)
+                self._objects.pop(id(old), None)
+                self._snapshots.pop(id(old), None)
+        member.sec_name, member.mat_name = member.sec.name, member.mat.name
+        self._track(index)
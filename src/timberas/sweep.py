@@ -0,0 +1,545 @@
+"""
+This module provides parametric sweeps of member design capacities, e.g. for capacity versus
+length or capacity versus restraint spacing design charts. Swept parameters are evaluated as
+one vectorised MemberBatch grid and returned as labelled N-dimensional arrays.
+
+Sweep axes are MemberBatch numeric inputs (e.g. L, L_ay, r, k_1) or:
+    g_13: sweeps g_13_x and g_13_y together.
+    L_a: sweeps L_ax and L_ay together.
+Restraint spacings which default to the member length (L_a or an axis of L_a is None) follow
+a swept L.
+
+Sweeps given an out_dir are written chunk by chunk (along the first sweep axis) into
+numpy.memmap-backed .npy files, one per output, with a JSON metadata sidecar (SWEEP_META_FILE),
+so sweeps larger than memory can be evaluated, resumed after interruption, and reopened
+lazily with open_sweep() without recomputation. The sidecar records a fingerprint of the
+resolved member inputs (template, sections and materials) and the chunk size, and a sweep is
+only resumed when both match; otherwise it is recomputed from the start.
+
+Classes:
+    SweepResult: Labelled N-dimensional arrays of sweep outputs.
+
+Functions:
+    sweep(): Sweeps the parameters of a member template.
+
+    library_pairs(): Matches library sections to library materials.
+
+    library_sweep(): Sweeps parameters for every section/grade pair in the libraries.
+
+    open_sweep(): Opens a sweep written to disk, with memory-mapped output arrays.
+"""
+from __future__ import annotations
+
+import hashlib
+import json
+import os
+from dataclasses import dataclass, field
+from typing import Callable
+
+import numpy as np
+import pandas as pd
+
+from timberas.batch import MemberBatch, CAPACITY_NAMES, k_9_lookup, _axis_value
+from timberas.geometry import import_section_library
+from timberas.material import GradeType, import_material_library
+from timberas.member import TimberMember, BoardMember
+
+AXIS_ALIASES = {"g_13": ("g_13_x", "g_13_y"), "L_a": ("L_ax", "L_ay")}
+SWEEP_META_FILE = "sweep.json"
+# default number of grid cells evaluated per chunk for sweeps written to disk
+CHUNK_CELLS = 1 << 22
+
+
+@dataclass
+class SweepResult:
+    """Labelled N-dimensional arrays of sweep outputs.
+
+    Attributes:
+        dims (tuple[str, ...]): Dimension names, in array axis order.
+        coords (dict[str, np.ndarray]): Coordinate values for each dimension.
+        values (dict[str, np.ndarray]): Output arrays, each with shape given by dims.
+            Read-only memory-mapped arrays for sweeps opened from disk.
+        path (str | None): Directory of a sweep written to disk.
+    """
+
+    dims: tuple[str, ...]
+    coords: dict[str, np.ndarray]
+    values: dict[str, np.ndarray] = field(repr=False)
+    path: str | None = None
+
+    def __getitem__(self, name: str) -> np.ndarray:
+        return self.values[name]
+
+    @property
+    def shape(self) -> tuple[int, ...]:
+        """Shape of the output arrays."""
+        return tuple(len(self.coords[dim]) for dim in self.dims)
+
+    def sel(self, **coords) -> SweepResult:
+        """Selects a single coordinate value along one or more dimensions, removing those
+        dimensions, e.g. result.sel(L=2400, mat="MGP10")."""
+        index = []
+        for dim in self.dims:
+            if dim not in coords:
+                index.append(slice(None))
+                continue
+            coord = self.coords[dim]
+            if coord.dtype.kind in "fiu":
+                match = np.flatnonzero(np.isclose(coord, coords[dim]))
+            else:
+                match = np.flatnonzero(coord == coords[dim])
+            if len(match) == 0:
+                raise KeyError(f"{coords[dim]} not in {dim} coordinates")
+            index.append(match[0])
+        dims = tuple(dim for dim in self.dims if dim not in coords)
+        return SweepResult(
+            dims=dims,
+            coords={dim: self.coords[dim] for dim in dims},
+            values={name: val[tuple(index)] for name, val in self.values.items()},
+        )
+
+    def save(self, out_dir: str) -> None:
+        """Writes the output arrays (.npy) and metadata sidecar to out_dir, in the format
+        read by open_sweep()."""
+        os.makedirs(out_dir, exist_ok=True)
+        for name, val in self.values.items():
+            np.save(os.path.join(out_dir, f"{name}.npy"), np.asarray(val, dtype=np.float64))
+        _write_meta(
+            os.path.join(out_dir, SWEEP_META_FILE),
+            {
+                "dims": list(self.dims),
+                "coords": {dim: np.asarray(val).tolist() for dim, val in self.coords.items()},
+                "outputs": list(self.values),
+                "shape": list(self.shape),
+                "dtype": "float64",
+                "complete": True,
+            },
+        )
+
+    def to_frame(self, dropna: bool = True) -> pd.DataFrame:
+        """Returns a long-form DataFrame with one row per grid point and one column per
+        dimension and output, e.g. for plotting design charts.
+
+        Args:
+            dropna: If True, drops grid points where all outputs are nan.
+        """
+        grid = np.meshgrid(*[self.coords[dim] for dim in self.dims], indexing="ij")
+        frame = pd.DataFrame({dim: g.ravel() for dim, g in zip(self.dims, grid)})
+        for name, val in self.values.items():
+            frame[name] = np.asarray(val).ravel()
+        if dropna:
+            frame = frame.dropna(subset=list(self.values), how="all")
+        return frame.reset_index(drop=True)
+
+
+def _grid_batch(
+    batch: MemberBatch,
+    axes: dict[str, np.ndarray],
+    follow_L: tuple[str, ...] = (),
+    k_9: Callable | None = None,
+) -> MemberBatch:
+    """Returns a MemberBatch with one additional trailing dimension per sweep axis.
+
+    Args:
+        batch: Base batch, with shape (...).
+        axes: Sweep axis coordinates.
+        follow_L: Restraint spacing inputs (L_ax, L_ay) which are equal to L.
+        k_9: Optional function of L returning k_9, used when L is swept.
+    """
+    names = MemberBatch.input_names()
+    extra = (1,) * len(axes)
+    values = {name: getattr(batch, name).reshape(batch.shape + extra) for name in names}
+    swept = set()
+    for i, (axis, coords) in enumerate(axes.items()):
+        targets = AXIS_ALIASES.get(axis, (axis,))
+        if any(name not in names or name == "restraint_edge" for name in targets):
+            raise ValueError(f"{axis} is not a numeric member input and cannot be swept")
+        shape = [1] * (batch.d.ndim + len(axes))
+        shape[batch.d.ndim + i] = -1
+        coords = np.asarray(coords, dtype=float).reshape(shape)
+        for name in targets:
+            values[name] = coords
+            swept.add(name)
+    if "L" in swept:
+        for name in follow_L:
+            if name not in swept:
+                values[name] = values["L"]
+        if k_9 is not None and "k_9" not in swept:
+            values["k_9"] = k_9(values["L"])
+    return MemberBatch(**values, sig_figs=batch.sig_figs)
+
+
+def _fingerprint(batch: MemberBatch, *extra) -> str:
+    """Fingerprint of the resolved inputs of a base batch and other sweep parameters."""
+    digest = hashlib.sha256()
+    for name in batch.input_names():
+        val = np.ascontiguousarray(getattr(batch, name))
+        digest.update(f"{name}{val.dtype}{val.shape}".encode())
+        digest.update(val.tobytes())
+    digest.update(repr(extra).encode())
+    return digest.hexdigest()
+
+
+def _follow_L(L_a) -> tuple[str, ...]:
+    """Restraint spacing inputs which default to the member length L."""
+    return tuple(
+        name
+        for name, axis in (("L_ax", "x"), ("L_ay", "y"))
+        if _axis_value(L_a, axis, "lateral restraint L_a", required=False) is None
+    )
+
+
+def sweep(
+    template: TimberMember,
+    outputs: tuple[str, ...] = CAPACITY_NAMES,
+    out_dir: str | None = None,
+    chunk_size: int | None = None,
+    **axes: np.ndarray,
+) -> SweepResult:
+    """Evaluates a member template over the full grid of swept parameters.
+
+    Example:
+        result = sweep(member, L=np.arange(600, 6001, 100), L_ay=[450, 600, 900])
+        result["N_dc"]  # shape (55, 3)
+
+    Args:
+        template: BoardMember or GlulamMember defining the non-swept inputs.
+        outputs: MemberBatch attributes to return, e.g. capacities, k_12_c, S3.
+        out_dir: Optional directory to write memory-mapped outputs to, see module
+            documentation.
+        chunk_size: Number of first sweep axis coordinates evaluated per chunk when writing
+            to out_dir, defaults to about CHUNK_CELLS grid cells per chunk.
+        axes: Sweep axis coordinates, see module documentation for axis names.
+
+    Returns:
+        SweepResult: Outputs with one dimension per sweep axis, in the order given.
+    """
+    base = MemberBatch.from_members([template], sig_figs=template.sig_figs)
+    base = MemberBatch(
+        **{name: getattr(base, name)[0] for name in base.input_names()},
+        sig_figs=base.sig_figs,
+    )
+    k_9, k_9_inputs = None, None
+    if isinstance(template, BoardMember) and template.s != 0:
+        n_com, n_mem, s = template.n_com, template.n_mem, template.s
+
+        def k_9(L: np.ndarray) -> np.ndarray:
+            return k_9_lookup(n_com, n_mem, s, L)
+
+        k_9_inputs = (n_com, n_mem, s)
+    follow_L = _follow_L(template.L_a)
+
+    def evaluate(chunk_axes: dict) -> dict[str, np.ndarray]:
+        grid = _grid_batch(base, chunk_axes, follow_L, k_9)
+        return {out: np.broadcast_to(getattr(grid, out), grid.shape) for out in outputs}
+
+    return _run_sweep(
+        dims=tuple(axes),
+        coords={axis: np.asarray(coords) for axis, coords in axes.items()},
+        outputs=outputs,
+        axes=axes,
+        evaluate=evaluate,
+        out_dir=out_dir,
+        chunk_size=chunk_size,
+        fingerprint=_fingerprint(base, follow_L, k_9_inputs) if out_dir else None,
+    )
+
+
+def library_pairs(
+    section_library: pd.DataFrame | None = None,
+    material_library: pd.DataFrame | None = None,
+) -> pd.DataFrame:
+    """Matches library sections to library materials with the section 'material' column:
+    'seasoned softwood' sections to MGP and seasoned softwood F-grades, 'unseasoned hardwood'
+    sections to unseasoned hardwood F-grades, and 'glulam' sections to GL grades. Size
+    adjusted materials (e.g. 'MGP10 190mm depth') and A-grades are excluded.
+
+    Returns:
+        pd.DataFrame: Boolean DataFrame, index of section names and columns of material
+        names, True where the pair is matched.
+    """
+    if section_library is None:
+        section_library = import_section_library()
+    if material_library is None:
+        material_library = import_material_library()
+    mats = material_library[~material_library["name"].str.contains(" depth| breadth")]
+    mat_type = np.select(
+        [
+            mats["grade_type"] == GradeType.GLULAM.value,
+            mats["grade_type"] == GradeType.MGP.value,
+            mats["name"].str.contains("Softwood"),
+            mats["name"].str.contains("Hardwood"),
+        ],
+        ["glulam", "seasoned softwood", "softwood", "hardwood"],
+        default="",
+    )
+    mat_type = np.where(
+        np.isin(mat_type, ["softwood", "hardwood"]),
+        np.where(mats["seasoned"].astype(bool), "seasoned ", "unseasoned ")
+        + mat_type.astype(object),
+        mat_type,
+    )
+    matched = section_library["material"].to_numpy()[:, np.newaxis] == mat_type
+    return pd.DataFrame(
+        matched, index=section_library["name"], columns=mats["name"].to_numpy()
+    )
+
+
+def library_sweep(
+    sections: list[str] | None = None,
+    materials: list[str] | None = None,
+    outputs: tuple[str, ...] = CAPACITY_NAMES,
+    pairs: pd.DataFrame | None = None,
+    section_library: pd.DataFrame | None = None,
+    material_library: pd.DataFrame | None = None,
+    member_inputs: dict | None = None,
+    out_dir: str | None = None,
+    chunk_size: int | None = None,
+    **axes: np.ndarray,
+) -> SweepResult:
+    """Evaluates a parameter sweep for every section/grade pair in the libraries, e.g.
+    brochure-style capacity versus length chart data. Material properties are updated from
+    section size, and GL grades use GlulamMember formulas.
+
+    Example:
+        charts = library_sweep(L=np.arange(600, 6001, 100), member_inputs={"g_13": 0.9})
+        charts.sel(sec="90x45", mat="MGP10")["N_dc"]  # capacity vs length
+        charts.to_frame()  # long-form chart data for all pairs
+
+    Args:
+        sections: Section names, defaults to all sections in the library.
+        materials: Material names, defaults to all materials in library_pairs().
+        outputs: MemberBatch attributes to return.
+        pairs: Boolean DataFrame of section/material pairs to evaluate, defaults to
+            library_pairs(). Unmatched pairs are nan.
+        section_library: DataFrame of sections, defaults to import_section_library().
+        material_library: DataFrame of materials, defaults to import_material_library().
+        member_inputs: Member inputs shared by all pairs, see MemberBatch.from_records().
+        out_dir: Optional directory to write memory-mapped outputs to, see module
+            documentation.
+        chunk_size: Number of first sweep axis coordinates evaluated per chunk when writing
+            to out_dir, defaults to about CHUNK_CELLS grid cells per chunk.
+        axes: Sweep axis coordinates, see module documentation for axis names.
+
+    Returns:
+        SweepResult: Outputs with dimensions ('sec', 'mat', *axes).
+    """
+    if section_library is None:
+        section_library = import_section_library()
+    if material_library is None:
+        material_library = import_material_library()
+    if pairs is None:
+        pairs = library_pairs(section_library, material_library)
+    sections = list(pairs.index) if sections is None else list(sections)
+    materials = list(pairs.columns) if materials is None else list(materials)
+    pairs = pairs.reindex(index=sections, columns=materials, fill_value=False)
+    member_inputs = {} if member_inputs is None else member_inputs
+
+    grade_types = material_library.set_index("name")["grade_type"]
+    i_sec, i_mat = np.nonzero(pairs.to_numpy(dtype=bool))
+    records = [
+        {
+            **member_inputs,
+            "sec": sections[i],
+            "mat": materials[j],
+            "member_type": (
+                "glulam" if grade_types[materials[j]] == GradeType.GLULAM.value else "board"
+            ),
+            "update_from_section_size": True,
+        }
+        for i, j in zip(i_sec, i_mat)
+    ]
+    try:
+        base = MemberBatch.from_records(records, section_library, material_library)
+    except (ValueError, KeyError, NotImplementedError):
+        # drop pairs which cannot be evaluated, e.g. material size factors not defined
+        valid = np.array([_is_valid(rec, section_library, material_library) for rec in records])
+        records = [rec for rec, ok in zip(records, valid) if ok]
+        i_sec, i_mat = i_sec[valid], i_mat[valid]
+        base = MemberBatch.from_records(records, section_library, material_library)
+
+    k_9 = None
+    if member_inputs.get("s", 0) != 0:
+        n_com = np.where(base.n > 1, base.n, 1)
+        glulam = np.array([rec["member_type"] == "glulam" for rec in records])
+
+        def k_9(L: np.ndarray) -> np.ndarray:
+            return np.where(
+                glulam.reshape(base.shape + (1,) * len(axes)),
+                1.0,
+                k_9_lookup(
+                    n_com.reshape(base.shape + (1,) * len(axes)),
+                    member_inputs.get("n_mem", 1),
+                    member_inputs["s"],
+                    L,
+                ),
+            )
+
+    follow_L = _follow_L(member_inputs.get("L_a"))
+
+    def evaluate(chunk_axes: dict) -> dict[str, np.ndarray]:
+        grid = _grid_batch(base, chunk_axes, follow_L, k_9)
+        axis_shape = tuple(len(coords) for coords in chunk_axes.values())
+        values = {}
+        for out in outputs:
+            val = np.full((len(sections), len(materials)) + axis_shape, np.nan)
+            val[i_sec, i_mat] = np.broadcast_to(getattr(grid, out), grid.shape)
+            values[out] = val
+        return values
+
+    return _run_sweep(
+        dims=("sec", "mat", *axes),
+        coords={
+            "sec": np.array(sections),
+            "mat": np.array(materials),
+            **{axis: np.asarray(coords) for axis, coords in axes.items()},
+        },
+        outputs=outputs,
+        axes=axes,
+        evaluate=evaluate,
+        out_dir=out_dir,
+        chunk_size=chunk_size,
+        fingerprint=(
+            _fingerprint(
+                base,
+                i_sec.tolist(),
+                i_mat.tolist(),
+                follow_L,
+                member_inputs.get("n_mem", 1) if k_9 else None,
+                member_inputs.get("s", 0) if k_9 else None,
+            )
+            if out_dir
+            else None
+        ),
+    )
+
+
+def _is_valid(record: dict, section_library: pd.DataFrame, material_library: pd.DataFrame):
+    """True if a member record can be evaluated."""
+    try:
+        MemberBatch.from_records([record], section_library, material_library)
+    except (ValueError, KeyError, NotImplementedError):
+        return False
+    return True
+
+
+def _run_sweep(
+    dims: tuple[str, ...],
+    coords: dict[str, np.ndarray],
+    outputs: tuple[str, ...],
+    axes: dict[str, np.ndarray],
+    evaluate: Callable[[dict], dict[str, np.ndarray]],
+    out_dir: str | None = None,
+    chunk_size: int | None = None,
+    fingerprint: str | None = None,
+) -> SweepResult:
+    """Evaluates a sweep in memory, or chunk by chunk along the first sweep axis into
+    memory-mapped arrays in out_dir. Completed chunks are recorded in the metadata sidecar,
+    and skipped if the same sweep (same coordinates, fingerprint and chunk size) is run again.
+
+    Args:
+        dims: Output dimension names, ending with the sweep axes.
+        coords: Coordinates for each dimension.
+        outputs: Output names.
+        axes: Sweep axis coordinates.
+        evaluate: Function of sweep axis coordinates returning output arrays.
+        out_dir: Directory for memory-mapped outputs, or None to evaluate in memory.
+        chunk_size: Number of first sweep axis coordinates per chunk.
+        fingerprint: Fingerprint of the non-swept inputs, see _fingerprint().
+    """
+    if out_dir is None:
+        return SweepResult(dims=dims, coords=coords, values=evaluate(axes))
+
+    shape = tuple(len(coords[dim]) for dim in dims)
+    if axes:
+        lead, lead_axis = next(iter(axes)), len(dims) - len(axes)
+        n_lead = shape[lead_axis]
+        if chunk_size is None:
+            cells = max(int(np.prod(shape)) // max(n_lead, 1), 1)
+            chunk_size = max(CHUNK_CELLS // cells, 1)
+        starts = range(0, n_lead, chunk_size)
+    else:
+        starts = range(1)
+    meta = {
+        "dims": list(dims),
+        "coords": {dim: np.asarray(val).tolist() for dim, val in coords.items()},
+        "outputs": list(outputs),
+        "shape": list(shape),
+        "dtype": "float64",
+        "fingerprint": fingerprint,
+        "chunk_size": chunk_size,
+    }
+    os.makedirs(out_dir, exist_ok=True)
+    meta_path = os.path.join(out_dir, SWEEP_META_FILE)
+    previous = {}
+    if os.path.exists(meta_path):
+        with open(meta_path, encoding="utf-8") as f:
+            previous = json.load(f)
+    resume = {key: previous.get(key) for key in meta} == meta
+    completed = previous.get("completed_chunks", 0) if resume else 0
+    mode = "r+" if resume else "w+"
+    arrays = {
+        out: np.lib.format.open_memmap(
+            os.path.join(out_dir, f"{out}.npy"), mode=mode, dtype=np.float64, shape=shape
+        )
+        for out in outputs
+    }
+
+    for k, start in enumerate(starts):
+        if k < completed:
+            continue
+        chunk_axes, index = dict(axes), (...,)
+        if axes:
+            stop = min(start + chunk_size, n_lead)
+            chunk_axes[lead] = np.asarray(axes[lead])[start:stop]
+            index = (slice(None),) * lead_axis + (slice(start, stop),)
+        for out, val in evaluate(chunk_axes).items():
+            arrays[out][index] = val
+            arrays[out].flush()
+        meta["completed_chunks"] = k + 1
+        _write_meta(meta_path, meta)
+    meta["completed_chunks"] = len(starts)
+    meta["complete"] = True
+    _write_meta(meta_path, meta)
+    del arrays
+    return open_sweep(out_dir)
+
+
+def _write_meta(path: str, meta: dict) -> None:
+    """Writes the sweep metadata sidecar, replacing the previous file atomically."""
+    tmp = path + ".tmp"
+    with open(tmp, "w", encoding="utf-8") as f:
+        json.dump(meta, f)
+    os.replace(tmp, path)
+
+
+def open_sweep(out_dir: str, mode: str = "r") -> SweepResult:
+    """Opens a sweep written to disk by sweep() or library_sweep() with out_dir. Output arrays
+    are memory-mapped, so slicing reads only the data required.
+
+    Args:
+        out_dir: Sweep directory.
+        mode: numpy.memmap mode, 'r' (read-only) or 'r+'.
+
+    Returns:
+        SweepResult: The sweep outputs.
+
+    Raises:
+        ValueError: If the sweep in out_dir did not complete.
+    """
+    with open(os.path.join(out_dir, SWEEP_META_FILE), encoding="utf-8") as f:
+        meta = json.load(f)
+    if not meta.get("complete", False):
+        raise ValueError(
+            f"sweep in {out_dir} is incomplete ({meta.get('completed_chunks', 0)} chunks), "
+            "repeat the sweep with the same out_dir to resume"
+        )
+    return SweepResult(
+        dims=tuple(meta["dims"]),
+        coords={dim: np.asarray(val) for dim, val in meta["coords"].items()},
+        values={
+            out: np.load(os.path.join(out_dir, f"{out}.npy"), mmap_mode=mode)
+            for out in meta["outputs"]
+        },
+        path=out_dir,
+    )
@@ -0,0 +1,95 @@
+import unittest
+import numpy as np
+from timberas.geometry import TimberSection
+from timberas.material import TimberMaterial
+from timberas.member import BoardMember, GlulamMember, RestraintEdge
+from timberas.batch import MemberBatch, round_sig_figs
+
+
+class TestMemberBatch(unittest.TestCase):
+    """unit tests for MemberBatch class"""
+
+    def setUp(self):
+        self.records = [
+            {"sec": "190x35", "mat": "MGP10", "application_cat": 2, "k_1": 0.57},
+            {
+                "sec": "2/90x45",
+                "mat": "F7 Unseasoned Softwood",
+                "consider_partial_seasoning": True,
+                "k_1": 0.8,
+                "r": 0,
+                "g_13": {"x": 0.7, "y": 1.0},
+                "L": 3300,
+                "L_a": {"x": None, "y": 1650},
+            },
+            {
+                "sec": "Nominal 250x50",
+                "mat": "F11 Unseasoned Hardwood",
+                "application_cat": 2,
+                "k_1": 0.94,
+                "r": 0,
+                "L": 2700,
+                "L_a": {"x": None, "y": 450},
+                "restraint_edge": RestraintEdge.COMPRESSION,
+            },
+            {
+                "sec": "GL395x85",
+                "mat": "GL12",
+                "member_type": "glulam",
+                "application_cat": 2,
+                "L": 4000,
+                "L_a": 2000,
+            },
+            # stud with y-axis restraint only, no x key in L_a
+            {"sec": "90x45", "mat": "MGP10", "g_13": 0.9, "L": 2700, "L_a": {"y": 900}},
+        ]
+
+    def members(self):
+        members = []
+        for rec in self.records:
+            rec = dict(rec)
+            sec = TimberSection.from_library(rec.pop("sec"))
+            mat = TimberMaterial.from_library(rec.pop("mat"))
+            member_class = GlulamMember if rec.pop("member_type", "") else BoardMember
+            members.append(member_class(sec=sec, mat=mat, **rec))
+        return members
+
+    def test_from_records(self):
+        """capacities match member classes"""
+        batch = MemberBatch.from_records(self.records)
+        for i, member in enumerate(self.members()):
+            for name, val in batch.results().items():
+                self.assertEqual(val[i], getattr(member, name), f"{name} member {i}")
+
+    def test_from_members(self):
+        """capacities match member classes"""
+        members = self.members()
+        batch = MemberBatch.from_members(members)
+        np.testing.assert_array_equal(batch.M_d, [m.M_d for m in members])
+        np.testing.assert_array_equal(batch.N_dc, [m.N_dc for m in members])
+
+    def test_broadcast(self):
+        """scalar and array inputs are broadcast to a grid"""
+        batch = MemberBatch.from_records(self.records[:1])
+        inputs = {name: getattr(batch, name)[0] for name in batch.input_names()}
+        inputs["L"] = np.array([[1000], [2000], [3000]])
+        inputs["L_ay"] = np.array([500, 1000])
+        inputs["L_ax"] = inputs["L"]
+        grid = MemberBatch(**inputs)
+        self.assertEqual(grid.shape, (3, 2))
+        self.assertTrue(np.all(np.diff(grid.N_dcy, axis=1) <= 0))
+
+    def test_invalid_record(self):
+        with self.assertRaises(KeyError):
+            MemberBatch.from_records([{"sec": "unknown", "mat": "MGP10"}])
+        with self.assertRaises(ValueError):
+            MemberBatch.from_records([{"sec": "90x35", "mat": "MGP10", "restraint_edge": "x"}])
+
+    def test_round_sig_figs(self):
+        np.testing.assert_array_equal(
+            round_sig_figs([126.35, 0.0, 12345.6, np.nan], 4), [126.3, 0.0, 12350, np.nan]
+        )
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,83 @@
+import unittest
+import numpy as np
+from timberas.geometry import TimberSection
+from timberas.material import TimberMaterial
+from timberas.member import BoardMember, GlulamMember
+from timberas.candidates import (
+    SectionCandidates,
+    lamination_depths,
+    generate_sections,
+    candidate_batch,
+)
+
+CAPACITIES = ("N_dt", "N_dcx", "N_dcy", "N_dc", "M_d", "V_d")
+
+
+class TestCandidates(unittest.TestCase):
+    """unit tests for generated candidate sections"""
+
+    def test_generate_sections(self):
+        depths = lamination_depths(4, 8)
+        np.testing.assert_array_equal(depths, [180, 225, 270, 315, 360])
+        with self.assertRaises(ValueError):
+            lamination_depths(5, 4)
+        blocks = list(generate_sections(depths, [65, 85.3], [1, 2], block_size=7, prefix="GL"))
+        self.assertEqual([len(block) for block in blocks], [7, 7, 6])
+        frame = blocks[0].to_frame()
+        self.assertEqual(list(frame["name"][:2]), ["GL180x65", "GL2/180x65"])
+        self.assertEqual(list(frame["shape_type"][:2]), ["single_board", "multi_board"])
+        # section properties rounded as TimberSection
+        for block in blocks:
+            for k in range(len(block)):
+                sec = TimberSection(
+                    shape_type=block.shape_type[k],
+                    b=float(block.b[k]),
+                    d=float(block.d[k]),
+                    n=int(block.n[k]),
+                )
+                self.assertEqual(
+                    (sec.A_g, sec.A_t, sec.A_c, sec.I_x, sec.I_y),
+                    (block.A_g[k], block.A_t[k], block.A_c[k], block.I_x[k], block.I_y[k]),
+                )
+                self.assertEqual(sec.b_tot, block.b_tot[k])
+                self.assertAlmostEqual(sec.Z_x, block.Z_x[k])
+                self.assertAlmostEqual(sec.A_s, block.A_s[k])
+        with self.assertRaises(ValueError):
+            SectionCandidates(b=[45, 0], d=90)
+
+    def test_candidate_batch_glulam(self):
+        mat = TimberMaterial.from_library("GL12")
+        block = next(generate_sections(lamination_depths(4, 12), [65, 85], block_size=100))
+        batch = candidate_batch(block, mat, member_type="glulam", L=6000, L_a=1200, k_1=0.8)
+        for k in range(len(block)):
+            sec = TimberSection(shape_type="single_board", b=block.b[k], d=block.d[k])
+            member = GlulamMember(sec=sec, mat=mat, L=6000, L_a=1200, k_1=0.8)
+            member.solve_capacities()
+            for name in CAPACITIES:
+                self.assertEqual(getattr(batch, name)[k], getattr(member, name))
+
+    def test_candidate_batch_board(self):
+        mat = TimberMaterial.from_library("F17 Unseasoned Hardwood")
+        block = SectionCandidates(b=[35, 45, 35], d=[90, 140, 190], n=[1, 2, 3])
+        L_a = {"x": None, "y": 900}
+        batch = candidate_batch(
+            block, mat, L=3000, L_a=L_a, consider_partial_seasoning=True, n_mem=5, s=600
+        )
+        for k in range(len(block)):
+            sec = TimberSection(
+                shape_type=block.shape_type[k], b=block.b[k], d=block.d[k], n=block.n[k]
+            )
+            member = BoardMember(
+                sec=sec, mat=mat, L=3000, L_a=L_a, consider_partial_seasoning=True
+            )
+            member.n_mem = 5
+            member.s = 600
+            member.solve_capacities()
+            self.assertEqual(batch.k_9[k], member.k_9)
+            self.assertEqual(batch.k_4[k], member.k_4)
+            for name in CAPACITIES:
+                self.assertEqual(getattr(batch, name)[k], getattr(member, name))
+
+
+if __name__ == "__main__":
+    unittest.main()
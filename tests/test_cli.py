@@ -0,0 +1,66 @@
+import json
+import os
+import tempfile
+import unittest
+import pandas as pd
+from timberas.cli import run_check, schedule_records, check_schedule
+
+
+class TestCheckSchedule(unittest.TestCase):
+    """unit tests for timberas check command functions"""
+
+    def setUp(self):
+        self.schedule = pd.DataFrame(
+            {
+                "id": ["S1", "S2", "S3", "S4", "S5"],
+                "sec": ["90x45", "90x45", "2/90x45", "190x45", "unknown"],
+                "mat": ["MGP10", "MGP10", "MGP12", "MGP10", "MGP10"],
+                "L": [2400, 2700, 2700, 3600, 2400],
+                "L_ay": [None, 1350, 900, None, None],
+                "g_13": [0.9, 0.9, 0.9, 1.0, 1.0],
+                "k_1": [0.8, 0.8, 1.0, 0.57, 0.8],
+                "N_star_c": [5.0, 5.0, 10.0, 0.0, 1.0],
+                "M_star": [0.5, 0.5, 1.0, 2.0, 1.0],
+            }
+        )
+
+    def test_schedule_records(self):
+        records = schedule_records(self.schedule)
+        self.assertEqual(records[0]["L"], 2400)
+        self.assertNotIn("L_a", records[0])
+        self.assertEqual(records[1]["L_a"], {"x": None, "y": 1350})
+
+    def test_check_schedule(self):
+        out = check_schedule(self.schedule)
+        self.assertAlmostEqual(out.loc[0, "util_N_dc"], 5.0 / out.loc[0, "N_dc"])
+        self.assertTrue(out.loc[3, "passed"])
+        self.assertIn("KeyError", out.loc[4, "error"])
+
+    def test_run_check_resume(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            schedule_path = os.path.join(tmp, "schedule.csv")
+            self.schedule.to_csv(schedule_path, index=False)
+            out_dir = os.path.join(tmp, "out")
+            run_check(schedule_path, out_dir, chunk_size=2)
+            full = pd.read_csv(os.path.join(out_dir, "results.csv"))
+            self.assertEqual(len(full), 5)
+
+            # simulate a run stopped after the first chunk
+            checkpoint_path = os.path.join(out_dir, "checkpoint.json")
+            with open(checkpoint_path, encoding="utf-8") as file:
+                checkpoint = json.load(file)
+            checkpoint.update(completed=[0], n_members=2, complete=False)
+            with open(checkpoint_path, "w", encoding="utf-8") as file:
+                json.dump(checkpoint, file)
+            os.remove(os.path.join(out_dir, "part-000001.csv"))
+
+            checkpoint = run_check(schedule_path, out_dir, chunk_size=2)
+            self.assertEqual(checkpoint["completed"], [0, 1, 2])
+            self.assertEqual(checkpoint["n_members"], 5)
+            pd.testing.assert_frame_equal(
+                pd.read_csv(os.path.join(out_dir, "results.csv")), full
+            )
+
+
+if __name__ == "__main__":
+    unittest.main()
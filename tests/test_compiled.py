@@ -0,0 +1,90 @@
+import io
+import unittest
+from contextlib import redirect_stdout
+from itertools import product
+from timberas import compiled
+from timberas.geometry import TimberSection
+from timberas.material import TimberMaterial
+from timberas.member import BoardMember, GlulamMember, RestraintEdge, CAPACITIES
+
+
+def solve(cls, use_compiled, **kwargs):
+    """capacities and printed notes of a member solved with or without compiled.evaluate()"""
+    cls.use_compiled = use_compiled
+    out = io.StringIO()
+    try:
+        with redirect_stdout(out):
+            mem = cls(**kwargs)
+    except Exception as err:  # pylint: disable=broad-except
+        return type(err), str(err), out.getvalue()
+    finally:
+        cls.use_compiled = True
+    return [repr(getattr(mem, name)) for name in CAPACITIES], out.getvalue()
+
+
+class TestCompiledEvaluators(unittest.TestCase):
+    """unit tests for single-pass member capacity evaluation"""
+
+    def test_board_configurations(self):
+        secs = [TimberSection.from_library(name) for name in ("90x45", "2/125x38")]
+        # flat board, x-axis is the minor axis
+        secs.append(TimberSection(shape_type="single_board", b=90, d=35))
+        mats = [
+            TimberMaterial.from_library(name)
+            for name in ("MGP10", "F17 Unseasoned Softwood")
+        ]
+        for sec, mat, edge, L_a, g_13, partial in product(
+            secs,
+            mats,
+            list(RestraintEdge),
+            (None, 600, {"x": None, "y": 450, "phi": 900}),
+            (1, {"x": 0.7, "y": 2.2}),
+            (False, True),
+        ):
+            kwargs = dict(
+                sec=sec, mat=mat, L=3600, restraint_edge=edge, L_a=L_a, g_13=g_13,
+                consider_partial_seasoning=partial, high_temp_latitude=True, n_mem=4, s=600,
+            )
+            self.assertEqual(
+                solve(BoardMember, False, **kwargs), solve(BoardMember, True, **kwargs)
+            )
+
+    def test_glulam_unrounded(self):
+        sec = TimberSection.from_library("2/125x38")
+        mat = TimberMaterial.from_library("GL18")
+        for L, r in product((300, 2400, 9000), (0, 0.25, 1.0)):
+            kwargs = dict(sec=sec, mat=mat, L=L, r=r, L_a={"x": None, "y": 1200}, sig_figs=0)
+            self.assertEqual(
+                solve(GlulamMember, False, **kwargs), solve(GlulamMember, True, **kwargs)
+            )
+
+    def test_fallback_errors(self):
+        sec = TimberSection.from_library("90x45")
+        mat = TimberMaterial.from_library("MGP10")
+        for kwargs in (
+            dict(application_cat=4),
+            dict(g_13={"y": 1.0}),
+            dict(restraint_edge=RestraintEdge.TENSION_AND_TORSIONAL, L_a=1200),
+        ):
+            result = solve(BoardMember, True, sec=sec, mat=mat, L=2400, **kwargs)
+            self.assertTrue(issubclass(result[0], Exception))
+            self.assertEqual(result, solve(BoardMember, False, sec=sec, mat=mat, L=2400, **kwargs))
+
+    def test_evaluate_names(self):
+        """only the requested capacities are evaluated"""
+        mem = BoardMember(
+            sec=TimberSection.from_library("90x45"),
+            mat=TimberMaterial.from_library("MGP10"),
+            L=2400,
+        )
+        mem.restraint_edge = RestraintEdge.TENSION_AND_TORSIONAL
+        mem.L_a = 1200
+        values = compiled.evaluate(mem, mem.inputs, ("N_dc", "V_d"))
+        self.assertEqual(set(values), {"N_dcx", "N_dcy", "N_dc", "V_d"})
+        self.assertEqual(values["N_dc"], mem._N_dc())  # pylint: disable=protected-access
+        # continuous torsional restraint without L_a_phi
+        with self.assertRaises(KeyError):
+            compiled.evaluate(mem, mem.inputs, ("M_d",))
+
+if __name__ == "__main__":
+    unittest.main()
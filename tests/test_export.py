@@ -0,0 +1,68 @@
+import importlib.util
+import os
+import tempfile
+import unittest
+import numpy as np
+from timberas.batch import MemberBatch
+from timberas.geometry import TimberSection
+from timberas.material import TimberMaterial
+from timberas.member import BoardMember
+from timberas.export import batch_columns, to_frame, to_arrow, arrow_to_frame, write_parquet
+
+HAS_PYARROW = importlib.util.find_spec("pyarrow") is not None
+
+
+class TestExport(unittest.TestCase):
+    """unit tests for columnar export"""
+
+    def setUp(self):
+        self.batch = MemberBatch.from_records(
+            [
+                dict(sec="190x45", mat="MGP10", L=3000),
+                dict(sec="240x45", mat="MGP12", L=2400, restraint_edge="compression"),
+            ]
+        )
+
+    def test_batch_columns(self):
+        cols = batch_columns(self.batch)
+        for name in ("k_4", "k_9", "k_12_c", "S1", "rho_b", "N_dc", "restraint_edge"):
+            self.assertEqual(len(cols[name]), 2)
+        np.testing.assert_array_equal(cols["M_d"], self.batch.M_d)
+        frame = to_frame(self.batch, groups=("capacities",))
+        self.assertEqual(list(frame.columns), ["N_dt", "N_dcx", "N_dcy", "N_dc", "M_d", "V_d"])
+        self.assertTrue(np.shares_memory(frame["N_dc"].to_numpy(), self.batch.N_dc))
+
+    def test_id_columns(self):
+        cols = batch_columns(self.batch, ids=["B1", "B2"], groups=("factors",))
+        self.assertEqual(list(cols)[0], "id")
+        self.assertEqual(list(cols["id"]), ["B1", "B2"])
+        np.testing.assert_array_equal(cols["S2"], [0, 0])
+        with self.assertRaises(ValueError):
+            batch_columns(self.batch, ids=["B1"])
+        members = [
+            BoardMember(
+                sec=TimberSection.from_library(sec), mat=TimberMaterial.from_library(mat), L=3000
+            )
+            for sec, mat in (("190x45", "MGP10"), ("90x45", "MGP12"))
+        ]
+        frame = to_frame(members, columns=["M_d"])
+        self.assertEqual(list(frame.columns), ["sec", "mat", "M_d"])
+        self.assertEqual(list(frame["sec"]), ["190x45", "90x45"])
+        self.assertEqual(list(frame["mat"]), ["MGP10", "MGP12"])
+
+    @unittest.skipUnless(HAS_PYARROW, "pyarrow not installed")
+    def test_arrow(self):
+        table = to_arrow(self.batch)
+        self.assertEqual(table.num_rows, 2)
+        np.testing.assert_array_equal(arrow_to_frame(table)["N_dc"], self.batch.N_dc)
+        with tempfile.TemporaryDirectory() as tmp:
+            write_parquet(self.batch, os.path.join(tmp, "members.parquet"))
+
+    @unittest.skipIf(HAS_PYARROW, "pyarrow installed")
+    def test_arrow_missing(self):
+        with self.assertRaises(ImportError):
+            to_arrow(self.batch)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,83 @@
+import unittest
+import numpy as np
+from timberas.geometry import TimberSection
+from timberas.material import TimberMaterial
+from timberas.member import BoardMember
+from timberas.grid import GridSystems, grid_k_9, system_members, check_grids
+
+
+class TestGrid(unittest.TestCase):
+    """unit tests for vectorised grid system strength sharing"""
+
+    def setUp(self):
+        self.records = [
+            {"sec": "190x45", "mat": "MGP10", "L": 3600, "L_a": 450, "s": 450, "width": 4800},
+            {
+                "sec": "2/90x45",
+                "mat": "MGP12",
+                "L": 2400,
+                "L_a": {"x": None, "y": 600},
+                "s": 600,
+                "n_mem": 3,
+            },
+            {"sec": "140x35", "mat": "MGP10", "L": 3000, "L_a": 450, "s": 2000, "n_mem": 12},
+            {"sec": "90x35", "mat": "MGP10", "L": 2400, "L_a": 600},
+        ]
+
+    def test_grid_k_9(self):
+        factors = grid_k_9([1, 2, 1, 12], [11, 3, 12, 1], [450, 600, 2000, 0], 3600)
+        np.testing.assert_allclose(factors["g_31"], [1.0, 1.14, 1.0, 1.33])
+        np.testing.assert_allclose(factors["g_32"], [1.33, 1.28, 1.33, 1.33])
+        # k_9 not less than 1
+        np.testing.assert_allclose(factors["k_9"], [1.2475, 1.2333333, 1.0, 1.33])
+        np.testing.assert_array_equal(system_members([4800, 4799, 0], 450), [11, 11, 1])
+        with self.assertRaises(ValueError):
+            system_members(4800, 0)
+
+    def test_k_9_matches_member(self):
+        systems = GridSystems.from_records(self.records)
+        np.testing.assert_array_equal(systems.n_mem, [11, 3, 12, 1])
+        np.testing.assert_array_equal(systems.n_com, [1, 2, 1, 1])
+        batch = systems.batch()
+        for i, rec in enumerate(self.records):
+            member = BoardMember(
+                sec=TimberSection.from_library(rec["sec"]),
+                mat=TimberMaterial.from_library(rec["mat"]),
+                L=rec["L"],
+                L_a=rec["L_a"],
+            )
+            member.n_mem = int(systems.n_mem[i])
+            member.s = rec.get("s", 0)
+            member.solve_capacities()
+            self.assertAlmostEqual(systems.g_31[i], member.g_31)
+            self.assertAlmostEqual(systems.g_32[i], member.g_32)
+            self.assertAlmostEqual(systems.k_9[i], member.k_9)
+            self.assertEqual(batch.M_d[i], member.M_d)
+        with self.assertRaises(ValueError):
+            GridSystems.from_records([{**self.records[1], "width": 1200}])
+
+    def test_check_grids(self):
+        systems = GridSystems.from_records(self.records)
+        w_star = np.array([[3.0, 4.0], [2.0, 2.0], [1.0, 1.5], [0.5, 0.5]])
+        check = check_grids(systems, w_star=w_star, N_star=[0, 0, 0, 2.0])
+        w = w_star.max(axis=1) * systems.s / 1e3
+        np.testing.assert_allclose(check.demands["M"], w * (systems.L / 1e3) ** 2 / 8)
+        np.testing.assert_allclose(check.demands["V"], w * systems.L / 1e3 / 2)
+        self.assertEqual(check.demands["N_c"][3], 2.0)
+        self.assertEqual(check.utilisation.shape, (4,))
+        self.assertAlmostEqual(check.utilisation[0], check.demands["M"][0] / check.batch.M_d[0])
+        frame = check.to_frame()
+        self.assertEqual(list(frame["passed"]), list(check.utilisation <= 1))
+        # per-system M_star and V_star added to each w_star load case
+        M_star, V_star = np.array([1.0, 0.0, 0.5, 2.0]), np.array([0.0, 1.0, 0.0, 0.5])
+        check = check_grids(systems, w_star=w_star, M_star=M_star, V_star=V_star)
+        np.testing.assert_allclose(check.demands["M"], w * (systems.L / 1e3) ** 2 / 8 + M_star)
+        np.testing.assert_allclose(check.demands["V"], w * systems.L / 1e3 / 2 + V_star)
+        # load cases of M_star with a scalar w_star
+        check = check_grids(systems, w_star=1.0, M_star=np.outer(M_star, [1.0, 2.0]))
+        w = systems.s / 1e3
+        np.testing.assert_allclose(check.demands["M"], w * (systems.L / 1e3) ** 2 / 8 + 2 * M_star)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,98 @@
+import unittest
+import numpy as np
+from timberas.batch import MemberBatch
+from timberas.grouping import (
+    group_members,
+    demand_envelope,
+    check_groups,
+    optimize_groups,
+    utilisation,
+)
+
+
+class TestGrouping(unittest.TestCase):
+    """unit tests for member grouping with demand envelopes"""
+
+    def setUp(self):
+        rng = np.random.default_rng(0)
+        n = 300
+        L = rng.choice([2400, 3000, 3600], n) * rng.uniform(0.97, 1.0, n)
+        L_ay = np.minimum(L, rng.choice([600, 900], n))
+        self.records = [
+            {"mat": "MGP10", "L": float(l), "L_a": {"x": None, "y": float(a)}, "k_1": 0.8}
+            for l, a in zip(L, L_ay)
+        ]
+        self.N_star = rng.uniform(-5, 10, (n, 2))
+        self.M_star = rng.uniform(0, 2, n)
+
+    def test_group_members(self):
+        groups = group_members(self.records, tolerance=0.05)
+        # 3 lengths x 2 restraint spacings, each spread over at most two bins
+        self.assertLessEqual(groups.n_groups, 12)
+        self.assertEqual(groups.sizes.sum(), len(self.records))
+        env = groups.envelope()
+        for g in range(groups.n_groups):
+            members = groups.members(g)
+            self.assertEqual(env["L"][g], groups.inputs["L"][members].max())
+            self.assertLess(env["L"][g] / groups.inputs["L"][members].min(), 1.05)
+        demands = demand_envelope(groups, self.N_star, self.M_star)
+        members = groups.members(0)
+        self.assertEqual(demands["N_c"][0], self.N_star[members].max())
+        self.assertEqual(demands["N_t"][0], -self.N_star[members].min())
+        self.assertEqual(demands["V"][0], 0)
+
+    def test_optimize_groups(self):
+        groups = group_members(self.records, tolerance=0.05)
+        design = optimize_groups(groups, self.N_star, self.M_star)
+        self.assertTrue(np.all(design.passed))
+        self.assertGreater(design.work["reduction"], 5)
+        sections = design.member_sections
+        # every member passes with its group section
+        batch = MemberBatch.from_records(
+            [rec | {"sec": sec} for rec, sec in zip(self.records, sections)]
+        )
+        demands = {
+            "N_c": np.maximum(self.N_star.max(axis=1), 0),
+            "N_t": np.maximum(-self.N_star.min(axis=1), 0),
+            "M": self.M_star,
+            "V": np.zeros(len(self.records)),
+        }
+        np.testing.assert_allclose(utilisation(batch, demands), design.utilisation)
+        # checking the grouped design gives the same result
+        checked = group_members(
+            [rec | {"sec": sec} for rec, sec in zip(self.records, sections)], tolerance=0.05
+        )
+        check = check_groups(checked, self.N_star, self.M_star)
+        self.assertTrue(np.all(check.member_passed))
+        np.testing.assert_allclose(check.member_utilisation, design.utilisation)
+
+    def test_check_groups_members(self):
+        """a member failing at L_CLR fails although its group representative passes"""
+        records = [
+            {"sec": "240x35", "mat": "MGP15", "L": 4000, "L_a": {"x": None, "y": L_ay}}
+            for L_ay in (380, 400)
+        ]
+        groups = group_members(records)
+        self.assertEqual(groups.n_groups, 1)
+        check = check_groups(groups, M_star=[9.95, 9.95])
+        self.assertLess(check.utilisation[0], 1.0)
+        np.testing.assert_array_equal(check.member_passed, [False, True])
+        self.assertFalse(check.passed[0])
+
+    def test_optimize_groups_unassigned(self):
+        """members of a group with no passing section are split and selected alone"""
+        records = [{"mat": "MGP10", "L": 2400, "L_a": 600} for _ in range(10)]
+        M_star = np.full(10, 0.5)
+        M_star[0] = 500.0
+        groups = group_members(records)
+        self.assertEqual(groups.n_groups, 1)
+        design = optimize_groups(groups, M_star=M_star)
+        sections = design.member_sections
+        self.assertIsNone(sections[0])
+        self.assertFalse(design.passed[0])
+        self.assertTrue(all(sec is not None for sec in sections[1:]))
+        self.assertTrue(np.all(design.passed[1:]))
+
+
+if __name__ == "__main__":
+    unittest.main()
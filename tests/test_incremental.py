@@ -0,0 +1,70 @@
+import os
+import tempfile
+import unittest
+import numpy as np
+from timberas.batch import MemberBatch
+from timberas.geometry import import_section_library
+from timberas.incremental import ResultStore, library_diff
+from timberas.material import import_material_library
+
+
+class TestIncremental(unittest.TestCase):
+    """unit tests for incremental recalculation after library edits"""
+
+    def setUp(self):
+        self.records = [
+            {"sec": "90x45", "mat": "MGP10", "L": 2400},
+            {"sec": "190x45", "mat": "MGP10", "L": 3600, "update_from_section_size": True},
+            {"sec": "90x45", "mat": "MGP12", "L": 2400},
+            {"sec": "2/90x45", "mat": "F17 Seasoned Hardwood", "L": 3000},
+        ]
+        self.store = ResultStore(self.records)
+
+    def test_library_diff(self):
+        old = import_material_library()
+        new = old.copy()
+        new.loc[new["name"] == "MGP10 190mm depth", "f_b"] = 15.0
+        new = new.loc[new["name"] != "MGP15"]
+        diff = library_diff(old, new, "mat")
+        self.assertEqual(diff.changed, ["MGP10 190mm depth"])
+        self.assertEqual(diff.removed, ["MGP15"])
+        self.assertEqual(diff.grades, {"MGP10", "MGP15"})
+        self.assertTrue(library_diff(old, old.copy()).is_empty)
+
+    def test_update_material_library(self):
+        new = self.store.material_library.copy()
+        new.loc[new["name"] == "MGP10 190mm depth", "f_b"] = 15.0
+        recalc = self.store.update_libraries(material_library=new)
+        # only the size-adjusted MGP10 member depends on the depth variant
+        np.testing.assert_array_equal(recalc.recomputed, [1])
+        np.testing.assert_array_equal(recalc.changed, [1])
+        expected = MemberBatch.from_records(self.records, material_library=new).M_d
+        np.testing.assert_array_equal(self.store.results["M_d"], expected)
+
+        new.loc[new["name"] == "MGP10", "f_c"] = 20.0
+        recalc = self.store.update_libraries(material_library=new)
+        np.testing.assert_array_equal(recalc.recomputed, [0, 1])
+        # the 190mm member uses the MGP10 190mm depth variant, and is unchanged
+        self.assertEqual(list(recalc.to_frame()["index"]), [0])
+        np.testing.assert_array_equal(recalc.previous["M_d"], recalc.current["M_d"])
+
+    def test_update_section_library(self):
+        new = import_section_library()
+        new = new.loc[new["name"] != "2/90x45"]
+        recalc = self.store.update_libraries(section_library=new)
+        np.testing.assert_array_equal(recalc.changed, [3])
+        self.assertIn(3, recalc.errors)
+        self.assertTrue(np.isnan(self.store.results["N_dc"][3]))
+
+    def test_save_load(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, "results.json")
+            self.store.save(path)
+            loaded = ResultStore.load(path)
+        for name, val in self.store.results.items():
+            np.testing.assert_array_equal(loaded.results[name], val)
+        self.assertEqual(loaded.dependencies, self.store.dependencies)
+
+
+if __name__ == "__main__":
+    unittest.main()
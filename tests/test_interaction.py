@@ -0,0 +1,58 @@
+import unittest
+import numpy as np
+from timberas.geometry import TimberSection
+from timberas.material import TimberMaterial
+from timberas.member import BoardMember, EffectiveLengthFactor
+from timberas.batch import MemberBatch
+from timberas.interaction import check_interaction
+from timberas.loads import wall_frame_combinations, combine_actions
+from timberas.AS1684_dicts import wall_frame_design_load_cases_flexural
+
+
+class TestInteraction(unittest.TestCase):
+    """unit tests for combined actions checks"""
+
+    def setUp(self):
+        self.member_dict = {
+            "sec": TimberSection.from_library("90x45"),
+            "mat": TimberMaterial.from_library("MGP10"),
+            "g_13": EffectiveLengthFactor.FRAMING_STUDS,
+            "L": 2700,
+            "L_a": {"x": None, "y": 1350},
+            "k_1": 1.0,
+        }
+        self.member = BoardMember(**self.member_dict)
+
+    def test_member(self):
+        check = self.member.check_interaction(M_star=0.3, N_star=4.0)
+        m_ratio = 0.3 / self.member.M_d
+        self.assertAlmostEqual(check.compression_x, m_ratio**2 + 4.0 / self.member.N_dcx)
+        self.assertAlmostEqual(check.compression_y, m_ratio + 4.0 / self.member.N_dcy)
+        self.assertTrue(np.isnan(check.tension))
+        self.assertEqual(check.governing, "3.5(2)")
+
+        check = self.member.check_interaction(M_star=0.3, N_star=-4.0)
+        self.assertTrue(np.isnan(check.compression_x))
+        self.assertAlmostEqual(check.tension, m_ratio + 4.0 / self.member.N_dt)
+
+    def test_stud_wall_batch(self):
+        """wall studs under wind load cases LC4 and LC5, members x load cases"""
+        batch = MemberBatch.from_members([self.member] * 3)
+        table = wall_frame_combinations()
+        table = table[table["name"].isin(["LC4 1.2G+Wu+Q1", "LC5 0.9G+Wu"])]
+        combined = combine_actions(
+            table, G=[1.0, 2.0, 3.0], Q1=0.5, Wu_c=2.0, Wu_t=[-6.0, -1.0, -0.5]
+        )
+        M_star = np.array(
+            [wall_frame_design_load_cases_flexural(w, 2.7)[3:] for w in (0.3, 0.5, 0.7)]
+        )
+        check = check_interaction(batch, M_star, combined.actions, k_1=combined.k_1)
+        self.assertEqual(check.utilisation.shape, (3, 2))
+        for i in range(3):
+            for j in range(2):
+                single = self.member.check_interaction(M_star[i, j], combined.actions[i, j])
+                self.assertAlmostEqual(check.utilisation[i, j], single.utilisation)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,32 @@
+import unittest
+from dataclasses import replace
+from timberas.geometry import SharedTimberSection, TimberSection
+from timberas.material import SharedTimberMaterial, sized_material
+
+
+class TestInterning(unittest.TestCase):
+    """unit tests for shared (interned) sections and materials"""
+
+    def test_shared_section(self):
+        sec = SharedTimberSection.from_library("190x45")
+        self.assertIs(SharedTimberSection.from_library("190x45"), sec)
+        self.assertEqual(sec.I_x, TimberSection.from_library("190x45").I_x)
+        self.assertEqual({sec: 1}[SharedTimberSection.from_section(sec)], 1)
+        with self.assertRaises(AttributeError):
+            sec.d = 240
+        deeper = SharedTimberSection.from_section(sec, d=240)
+        self.assertEqual(deeper.I_x, 45 * 240**3 / 12)
+        self.assertNotEqual(deeper.fingerprint, sec.fingerprint)
+
+    def test_shared_material(self):
+        mat = SharedTimberMaterial.from_library("MGP10 190mm depth")
+        self.assertIs(sized_material("MGP10", 190), mat)
+        self.assertEqual(len(mat.fingerprint), 64)
+        modified = replace(mat, f_b=15)
+        self.assertNotEqual(modified, mat)
+        with self.assertRaises(AttributeError):
+            modified.f_b = 16
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,70 @@
+import unittest
+import numpy as np
+from timberas.batch import MemberBatch, calc_k12
+from timberas.inverse import (
+    calc_k12_inverse,
+    max_length_for,
+    max_restraint_spacing_for,
+    required_section_modulus_for,
+)
+
+RECORDS = [
+    dict(sec="190x45", mat="MGP10", L=3000, L_a={"x": 3000, "y": 600}),
+    dict(
+        sec="240x45",
+        mat="MGP12",
+        L=2400,
+        L_a={"x": 2400, "y": 1200},
+        restraint_edge="tension",
+    ),
+]
+
+
+class TestInverse(unittest.TestCase):
+    """unit tests for closed-form inverse solvers"""
+
+    def setUp(self):
+        self.batch = MemberBatch.from_records(RECORDS, sig_figs=0)
+
+    def _rebuild(self, **columns):
+        return MemberBatch.from_records(
+            [dict(rec, **{k: v[i] for k, v in columns.items()}) for i, rec in enumerate(RECORDS)],
+            sig_figs=0,
+        )
+
+    def test_calc_k12_inverse(self):
+        rho_s = np.array([12.0, 18.0, 25.0, 40.0])
+        np.testing.assert_allclose(calc_k12_inverse(calc_k12(rho_s)), rho_s)
+        self.assertEqual(calc_k12_inverse(1.0), 10.0)
+        self.assertTrue(np.isnan(calc_k12_inverse(1.1)))
+
+    def test_max_length_for(self):
+        N_star = np.array([20.0, 30.0])
+        L = max_length_for(self.batch, N_star)
+        self.assertTrue(np.all(self._rebuild(L=L * 0.99).N_dc > N_star))
+        self.assertTrue(np.all(self._rebuild(L=L * 1.01).N_dc < N_star))
+        cases = max_length_for(self.batch, N_star[:, np.newaxis] * [0.5, 1.0])
+        self.assertEqual(cases.shape, (2, 2))
+        np.testing.assert_allclose(cases[:, 1], L)
+        # M_d with restraint held: inf if the member L_ay is sufficient, else nan
+        M_d = self.batch.M_d
+        L_M = max_length_for(self.batch, M_d * [0.99, 1.01], capacity="M_d")
+        self.assertEqual(L_M[0], np.inf)
+        self.assertTrue(np.isnan(L_M[1]))
+
+    def test_max_restraint_spacing_for(self):
+        M_star = np.array([3.0, 4.0])
+        L_ay = max_restraint_spacing_for(self.batch, M_star)
+        below = [{"x": rec["L"], "y": val * 0.99} for rec, val in zip(RECORDS, L_ay)]
+        above = [{"x": rec["L"], "y": val * 1.01} for rec, val in zip(RECORDS, L_ay)]
+        self.assertTrue(np.all(self._rebuild(L_a=below).M_d > M_star))
+        self.assertTrue(np.all(self._rebuild(L_a=above).M_d < M_star))
+
+    def test_required_section_modulus_for(self):
+        np.testing.assert_allclose(
+            required_section_modulus_for(self.batch, self.batch.M_d), self.batch.Z_x
+        )
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,131 @@
+import unittest
+import numpy as np
+from timberas.AS1684_dicts import wall_frame_design_load_cases_axial
+from timberas.batch import MemberBatch
+from timberas.loads import (
+    CombinedActions,
+    as1170_combinations,
+    wall_frame_combinations,
+    combine_actions,
+    check_combinations,
+)
+
+
+class TestLoadCombinations(unittest.TestCase):
+    """unit tests for load combination engine"""
+
+    def test_combine_actions(self):
+        combined = combine_actions(G=[2.0, 4.0], Q=[1.0, 0.0], Wu=[0.5, 1.0])
+        self.assertEqual(combined.actions.shape, (2, len(as1170_combinations())))
+        np.testing.assert_allclose(combined.actions[:, 1], [3.9, 4.8])
+        np.testing.assert_allclose(combined.r[:, 1], [1.5 / 3.9, 0.0])
+        np.testing.assert_allclose(combined.r[:, 0], 0.0)
+        with self.assertRaises(ValueError):
+            combine_actions(X=1.0)
+
+    def test_wall_frame_combinations(self):
+        """matches wall_frame_design_load_cases_axial"""
+        G, Q1, Q2, Q3, Wu_c, Wu_t = 3.0, 1.5, 0.5, 0.8, 2.0, -6.0
+        P_star, ratios = wall_frame_design_load_cases_axial(G, Q1, Q2, Q3, Wu_c, Wu_t)
+        combined = combine_actions(
+            wall_frame_combinations(), G=G, Q1=Q1, Q2=Q2, Q3=Q3, Wu_c=Wu_c, Wu_t=Wu_t
+        )
+        P = combined.actions
+        np.testing.assert_allclose(
+            [max(P[0], P[1]), P[2], P[3], max(P[4], P[5]), min(0, P[6])], P_star
+        )
+        np.testing.assert_allclose(combined.r[[1, 2, 3, 4]], ratios[:4])
+
+    def test_check_combinations(self):
+        batch = MemberBatch.from_records(
+            [
+                {"sec": "90x45", "mat": "MGP10", "L": 2700, "g_13": 0.9, "L_a": 1350},
+                {"sec": "90x35", "mat": "MGP10", "L": 2700, "g_13": 0.9, "L_a": 1350},
+            ]
+        )
+        combined = combine_actions(G=[3.0, 3.0], Q=[2.0, 0.0], Wu=[-40.0, 1.0])
+        check = check_combinations(batch, combined, negative_capacity="N_dt")
+        self.assertEqual(check.utilisation.shape, (2, 5))
+        single = MemberBatch.from_records(
+            [
+                {
+                    "sec": "90x45",
+                    "mat": "MGP10",
+                    "L": 2700,
+                    "g_13": 0.9,
+                    "L_a": 1350,
+                    "k_1": 0.8,
+                    "r": 3.0 / 6.6,
+                }
+            ]
+        )
+        self.assertAlmostEqual(check.capacities[0, 1], single.N_dc[0])
+        self.assertEqual(check.governing_name[0], "0.9G+Wu")
+        self.assertAlmostEqual(check.capacities[0, 4], single.N_dt[0] / 0.8, delta=0.01)
+        self.assertEqual(check.util_max.shape, (2,))
+
+    def test_check_combinations_pruned(self):
+        """pruning gives the same governing combinations as the exhaustive check"""
+        rng = np.random.default_rng(0)
+        n = 200
+        batch = MemberBatch.from_records(
+            [
+                {"sec": "90x45", "mat": "MGP10", "L": L, "g_13": 0.9}
+                for L in rng.uniform(2000, 3600, n)
+            ]
+        )
+        # no Q2 or Q3, so LC2 and LC3 cannot govern
+        combined = combine_actions(
+            wall_frame_combinations(),
+            G=rng.uniform(1, 5, n),
+            Q1=rng.uniform(0, 5, n),
+            Wu_c=rng.uniform(0, 8, n),
+            Wu_t=-rng.uniform(0, 8, n),
+        )
+        full = check_combinations(batch, combined, negative_capacity="N_dt")
+        pruned = check_combinations(batch, combined, negative_capacity="N_dt", prune=True)
+        np.testing.assert_array_equal(pruned.governing, full.governing)
+        np.testing.assert_array_equal(pruned.util_max, full.util_max)
+        evaluated = pruned.evaluated
+        np.testing.assert_array_equal(
+            pruned.utilisation[evaluated], full.utilisation[evaluated]
+        )
+        self.assertTrue(np.all(np.isnan(pruned.utilisation[~evaluated])))
+        self.assertFalse(np.any(evaluated[:, 2:4]))
+        self.assertGreater(pruned.n_skipped, full.utilisation.size // 2)
+
+    def test_pruned_across_L_CLR(self):
+        """M_d decreases with r where a higher r makes lateral restraint continuous"""
+        batch = MemberBatch(
+            b=[35.0],
+            d=190.0,
+            A_t=6650.0,
+            A_c=6650.0,
+            I_x=2.0e7,
+            I_y=6.79e5,
+            f_b=40.0,
+            f_t=20.0,
+            f_s=3.0,
+            f_c=30.0,
+            E=13300.0,
+            phi=0.9,
+            L=3000.0,
+            L_ax=3000.0,
+            L_ay=397.5,
+        )
+        combined = CombinedActions(
+            names=np.array(["A", "B"]),
+            k_1=np.array([1.0, 1.0]),
+            limit_state=np.array(["strength", "strength"]),
+            actions=np.array([[5.0, 4.99]]),
+            r=np.array([[0.13, 0.2]]),
+        )
+        full = check_combinations(batch, combined, "M_d")
+        np.testing.assert_array_equal(full.capacities, [[6.782, 6.746]])
+        pruned = check_combinations(batch, combined, "M_d", prune=True)
+        np.testing.assert_array_equal(pruned.governing, [1])
+        np.testing.assert_array_equal(pruned.util_max, full.util_max)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,86 @@
+import tempfile
+import unittest
+import numpy as np
+from timberas.batch import MemberBatch
+from timberas.lookup import CapacityTable
+from timberas.material import import_material_library
+
+
+class TestLookup(unittest.TestCase):
+    """unit tests for capacity lookup tables"""
+
+    @classmethod
+    def setUpClass(cls):
+        grid = np.geomspace(600, 6000, 200)
+        cls.table = CapacityTable.build(
+            L=grid,
+            L_ay=grid,
+            g_13=[0.9, 1.0],
+            sections=["90x45", "190x45"],
+            materials=["MGP10", "GL12"],
+            tolerance=0.01,
+        )
+
+    def test_error_bound(self):
+        rng = np.random.default_rng(1)
+        L = rng.uniform(600, 6000, 500)
+        L_ay = np.minimum(rng.uniform(600, 6000, 500), L)
+        for sec in ("90x45", "190x45"):
+            for output in ("N_dc", "M_d"):
+                value, bound = self.table.query(
+                    sec, "MGP10", L, L_ay, output, g_13=0.9, return_bound=True
+                )
+                exact = self.table._exact(sec, "MGP10", L, L_ay, output, 0.9, 0.25)
+                self.assertTrue(np.all(np.abs(value - exact) <= bound + 1e-9))
+                self.assertTrue(np.all(bound <= 0.01 * exact))
+        self.assertGreater(self.table.stats["interpolated"], 0)
+        # outside the grid or an untabulated g_13 is evaluated exactly
+        value, bound = self.table.query("90x45", "MGP10", [300, 2400], 300, g_13=0.7,
+                                        return_bound=True)
+        np.testing.assert_array_equal(bound, 0)
+
+    def test_persistence(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            self.table.save(tmp)
+            loaded = CapacityTable.load(tmp)
+            np.testing.assert_array_equal(
+                loaded.query("190x45", "MGP10", [1000, 2000], [900, 1200], "M_d"),
+                self.table.query("190x45", "MGP10", [1000, 2000], [900, 1200], "M_d"),
+            )
+            self.assertTrue(np.all(np.isnan(loaded.query("190x45", "GL12", 1000, 900))))
+
+    def test_custom_inputs(self):
+        """float L_a and custom material library in exact evaluation"""
+        library = import_material_library()
+        mgp10 = library["name"].str.startswith("MGP10")
+        library["f_b"] = np.where(mgp10, 0.8 * library["f_b"], library["f_b"])
+        grid = np.geomspace(600, 6000, 50)
+        table = CapacityTable.build(
+            L=grid,
+            L_ay=grid,
+            sections=["190x45"],
+            materials=["MGP10"],
+            member_inputs={"L_a": 1200},
+            material_library=library,
+        )
+        L, L_ay = [3000, 8000], [900, 900]
+        records = [
+            {
+                "sec": "190x45",
+                "mat": "MGP10",
+                "update_from_section_size": True,
+                "L": length,
+                "L_a": {"x": 1200, "y": spacing},
+            }
+            for length, spacing in zip(L, L_ay)
+        ]
+        expected = MemberBatch.from_records(records, material_library=library).M_d
+        exact = table._exact("190x45", "MGP10", L, L_ay, "M_d", 1.0, 0.25)
+        np.testing.assert_array_equal(exact, expected)
+        # outside the grid, evaluated exactly
+        self.assertEqual(table.query("190x45", "MGP10", 8000, 900, "M_d"), expected[1])
+        self.assertLess(expected[1], MemberBatch.from_records(records).M_d[1])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -1,5 +1,6 @@
 import unittest
-from timberas.material import TimberMaterial
+import numpy as np
+from timberas.material import TimberMaterial, SizedMaterialCache, size_adjusted_properties
 
 # from timberas.utils import ApplicationCategory
 
@@ -59,6 +60,45 @@ class TestTimberMaterial(unittest.TestCase):
         self.timber_material_glulam.update_from_section_size(200)
         self.assertAlmostEqual(self.timber_material_glulam.f_t, 1.906, places=3)
 
+    def test_size_adjusted_properties(self):
+        """unit tests for size_adjusted_properties function"""
+        mgp10 = TimberMaterial.from_library("MGP10")
+        props = size_adjusted_properties(mgp10, [90, 190, 215, 290])
+        np.testing.assert_allclose(props["f_b"], [17, 16, 15.5, 14])
+        np.testing.assert_allclose(props["f_t"], [7.7, 7.1, 6.85, 6.1])
+        self.assertEqual(props["name"][2], "MGP10 215mm depth")
+        with self.assertRaises(ValueError):
+            size_adjusted_properties(mgp10, 300)
+        a17 = TimberMaterial.from_library("A17 45mm breadth")
+        props = size_adjusted_properties(a17, [90, 190, 240], [35, 45, 35])
+        np.testing.assert_allclose(props["f_t"], [26, 21, 18])
+        with self.assertRaises(ValueError):
+            size_adjusted_properties(a17, 190)
+        props = size_adjusted_properties(self.timber_material, [100, 200])
+        np.testing.assert_allclose(props["f_t"], [2.0, 1.906], atol=1e-3)
+        self.assertEqual(self.timber_material.f_t, 2.0)
+
+    def test_sized_material_cache(self):
+        """unit tests for SizedMaterialCache class"""
+        cache = SizedMaterialCache(maxsize=2)
+        mat = cache.get("MGP10", 190, 45)
+        self.assertIs(cache.get("MGP10", 190.0, 35), mat)
+        self.assertEqual(mat.f_b, 16)
+        with self.assertRaises(AttributeError):
+            mat.f_b = 17
+        cache.get("MGP10", 240)
+        cache.get("MGP10", 290)
+        self.assertEqual(
+            cache.stats, {"hits": 1, "misses": 3, "evictions": 1, "size": 2, "maxsize": 2}
+        )
+        # materials with nan attributes (density, G) are keyed by content
+        cache = SizedMaterialCache()
+        names = ["GL12", "F17 Seasoned Hardwood", "MGP10"]
+        for _ in range(3):
+            for name in names:
+                cache.get(TimberMaterial.from_library(name), 190, 45)
+        self.assertEqual((cache.hits, cache.misses), (6, 3))
+
     def test_from_dict(self):
         """unit tests for from_dict method"""
         dict_material = {
@@ -0,0 +1,74 @@
+import unittest
+from dataclasses import replace
+from timberas.geometry import TimberSection
+from timberas.material import TimberMaterial
+from timberas.member import BoardMember, MemberInputs, RestraintEdge, rho_constants
+
+
+class TestMemberInputs(unittest.TestCase):
+    """unit tests for normalised member inputs"""
+
+    def setUp(self):
+        self.sec = TimberSection.from_library("90x45")
+        self.mat = TimberMaterial.from_library("MGP10")
+
+    def test_normalised_axes(self):
+        mem = BoardMember(
+            sec=self.sec,
+            mat=self.mat,
+            L=3000,
+            L_a={"x": None, "y": 600, "phi": 1200},
+            g_13={"x": 0.7, "y": 1.0},
+            restraint_edge="compression",
+        )
+        inputs = mem.inputs
+        self.assertEqual((inputs.L_ax, inputs.L_ay, inputs.L_a_phi), (3000, 600, 1200))
+        self.assertEqual((inputs.g_13_x, inputs.g_13_y), (0.7, 1.0))
+        self.assertIs(inputs.restraint_edge, RestraintEdge.COMPRESSION)
+        self.assertEqual((mem.rho_c, mem.rho_b), rho_constants(True, 10000, 18.0, 17, 0.25))
+        # normalised once, rebuilt after an input edit
+        self.assertIs(mem.inputs, inputs)
+        mem.L_a = 900
+        self.assertEqual((mem.L_ax, mem.L_ay), (900, 900))
+        self.assertIsNot(mem.inputs, inputs)
+
+    def test_material_edit(self):
+        mat = replace(self.mat)
+        mem = BoardMember(sec=self.sec, mat=mat, L=3000)
+        rho_b, M_d = mem.rho_b, mem.M_d
+        mat.f_b = 2 * mat.f_b
+        self.assertNotEqual(mem.rho_b, rho_b)
+        rho_b = mem.rho_b
+        mat.E *= 2
+        self.assertNotEqual(mem.rho_b, rho_b)
+        mem.solve_capacities()
+        self.assertNotEqual(mem.M_d, M_d)
+
+    def test_in_place_edit(self):
+        mem = BoardMember(sec=self.sec, mat=self.mat, L=3000, L_a={"x": None, "y": 1200})
+        self.assertEqual(mem.L_ay, 1200)
+        mem.L_a["y"] = 300
+        self.assertEqual(mem.L_ay, 300)
+        mem.solve_capacities()
+        fresh = BoardMember(sec=self.sec, mat=self.mat, L=3000, L_a={"x": None, "y": 300})
+        self.assertEqual((mem.S1, mem.M_d), (fresh.S1, fresh.M_d))
+
+    def test_validation(self):
+        with self.assertRaises(KeyError):
+            BoardMember(sec=self.sec, mat=self.mat, g_13={"x": 1.0})
+        with self.assertRaises(KeyError):
+            BoardMember(sec=self.sec, mat=self.mat, L_a={"x": 600})
+        with self.assertRaises(TypeError):
+            BoardMember(sec=self.sec, mat=self.mat, L_a=[600, 600])
+        with self.assertRaises(ValueError):
+            BoardMember(sec=self.sec, mat=self.mat, restraint_edge="top")
+        mem = BoardMember(sec=self.sec, mat=self.mat, L_a={"y": 600})
+        with self.assertRaises(KeyError):
+            mem.L_ax  # pylint: disable=pointless-statement
+        with self.assertRaises(KeyError):
+            mem.L_a_phi  # pylint: disable=pointless-statement
+        self.assertIsInstance(MemberInputs.from_member(mem), MemberInputs)
+
+
+if __name__ == "__main__":
+    unittest.main()
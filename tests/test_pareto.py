@@ -0,0 +1,135 @@
+import unittest
+import numpy as np
+from timberas.batch import MemberBatch
+from timberas.geometry import import_section_library
+from timberas.grouping import utilisation
+from timberas.material import import_material_library
+from timberas.pareto import pareto_front, utilisation_lower_bound, _grade_bounds
+from timberas.sweep import library_pairs, _is_valid
+
+
+class TestPareto(unittest.TestCase):
+    """unit tests for the Pareto front search of library section/grade pairs"""
+
+    def setUp(self):
+        self.sl = import_section_library()
+        self.ml = import_material_library()
+        self.pairs = library_pairs(self.sl, self.ml)
+        self.materials = ["MGP10", "MGP12", "F17 Seasoned Hardwood", "GL10", "GL13"]
+        self.densities = {"F17 Seasoned Hardwood": 900.0}
+        self.member_inputs = {"L_a": {"x": None, "y": 900}, "g_13": 0.9}
+
+    def brute_force(self, L, demands, max_utilisation=None):
+        """(sec, mat) pairs on the front, from all pairs evaluated"""
+        sec_lib = self.sl.drop_duplicates("name").set_index("name")
+        mat_lib = self.ml.drop_duplicates("name").set_index("name")
+        records, masses = [], []
+        for sec in self.pairs.index:
+            for mat in self.materials:
+                rec = {
+                    **self.member_inputs,
+                    "L": L,
+                    "sec": sec,
+                    "mat": mat,
+                    "member_type": "glulam" if mat.startswith("GL") else "board",
+                    "update_from_section_size": True,
+                }
+                if not self.pairs.loc[sec, mat] or not _is_valid(rec, self.sl, self.ml):
+                    continue
+                row = sec_lib.loc[sec]
+                density = self.densities.get(mat, mat_lib.loc[mat, "density"])
+                records.append(rec)
+                masses.append(row.n * row.b * row.d * density * 1e-9 * L)
+        util = utilisation(MemberBatch.from_records(records, self.sl, self.ml), demands)
+        masses = np.array(masses)
+        ok = ~np.isnan(util)
+        if max_utilisation is not None:
+            ok &= util <= max_utilisation
+        idx = np.flatnonzero(ok)
+        front, best = [], np.inf
+        for k in idx[np.lexsort((util[idx], masses[idx]))]:
+            if util[k] < best:
+                best = util[k]
+                front.append((records[k]["sec"], records[k]["mat"]))
+        return front
+
+    def test_pareto_front(self):
+        result = pareto_front(
+            L=3000,
+            N_star=[12.0, -4.0],
+            M_star=3.0,
+            V_star=4.0,
+            member_inputs=self.member_inputs,
+            materials=self.materials,
+            pairs=self.pairs,
+            section_library=self.sl,
+            material_library=self.ml,
+            densities=self.densities,
+            block_size=8,
+        )
+        demands = {"N_c": 12.0, "N_t": 4.0, "M": 3.0, "V": 4.0}
+        self.assertEqual(result.demands, demands)
+        self.assertEqual(
+            list(zip(result.front.sec, result.front.mat)), self.brute_force(3000, demands)
+        )
+        # lightest first, utilisation strictly decreasing
+        self.assertTrue(np.all(np.diff(result.front["mass"]) > 0))
+        self.assertTrue(np.all(np.diff(result.front["utilisation"]) < 0))
+        counts = result.counts
+        self.assertEqual(counts["candidates"], self.pairs[self.materials].to_numpy().sum())
+        self.assertGreater(counts["pruned"], 0)
+        self.assertEqual(
+            counts["evaluated"] + counts["pruned"] + counts["excluded"], counts["candidates"]
+        )
+
+    def test_max_utilisation(self):
+        kwargs = dict(
+            L=4800,
+            M_star=8.0,
+            V_star=6.0,
+            member_inputs=self.member_inputs,
+            materials=self.materials,
+            pairs=self.pairs,
+            section_library=self.sl,
+            material_library=self.ml,
+            densities=self.densities,
+        )
+        result = pareto_front(**kwargs, max_utilisation=1.0)
+        self.assertTrue(np.all(result.front["utilisation"] <= 1.0))
+        self.assertEqual(
+            list(zip(result.front.sec, result.front.mat)),
+            self.brute_force(4800, {"N_c": 0.0, "N_t": 0.0, "M": 8.0, "V": 6.0}, 1.0),
+        )
+        # F-grade pairs are excluded without a density
+        kwargs["densities"] = None
+        result = pareto_front(**kwargs)
+        self.assertNotIn("F17 Seasoned Hardwood", set(result.front.mat))
+        self.assertGreaterEqual(
+            result.n_excluded, self.pairs["F17 Seasoned Hardwood"].to_numpy().sum()
+        )
+
+    def test_utilisation_lower_bound(self):
+        sections = ["90x45", "140x45", "2/90x45"]
+        materials = ["MGP10", "F17 Seasoned Hardwood", "MGP12"]
+        records = [
+            {"L": 3000, "L_a": 900, "sec": sec, "mat": mat, "update_from_section_size": True}
+            for sec, mat in zip(sections, materials)
+        ]
+        batch = MemberBatch.from_records(records, self.sl, self.ml)
+        demands = {"N_c": 5.0, "N_t": 0.0, "M": 2.0, "V": 3.0}
+        bound = utilisation_lower_bound(
+            demands,
+            batch.b,
+            batch.d,
+            batch.n,
+            _grade_bounds(materials, self.ml),
+            np.zeros(3, dtype=bool),
+            np.asarray(batch.seasoned, dtype=bool),
+            {"L": 3000},
+        )
+        self.assertTrue(np.all(bound > 0))
+        self.assertTrue(np.all(bound <= utilisation(batch, demands)))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,38 @@
+import unittest
+import numpy as np
+from timberas.batch import MemberBatch
+from timberas.reliability import Distribution, failure_probability, sample_batch
+
+
+class TestReliability(unittest.TestCase):
+    """unit tests for Monte Carlo reliability analysis"""
+
+    def setUp(self):
+        self.batch = MemberBatch.from_records(
+            [dict(sec="190x45", mat="MGP10", L=3000, L_a={"x": 3000, "y": 600})] * 2
+        )
+
+    def test_sample_batch(self):
+        rng = np.random.default_rng(0)
+        variables = {"d": Distribution("deterministic", 1.1), "f_b": Distribution(cov=0.2)}
+        sampled = sample_batch(self.batch, variables, rng, 1000)
+        self.assertEqual(sampled.shape, (2, 1000))
+        np.testing.assert_allclose(sampled.I_x[:, 0], self.batch.I_x * 1.1**3)
+        self.assertAlmostEqual(sampled.f_b.mean() / self.batch.f_b[0], 1.0, delta=0.02)
+
+    def test_failure_probability(self):
+        load = Distribution("gumbel", self.batch.M_d * [0.6, 1.2], 0.2)
+        result = failure_probability(
+            self.batch, load, capacity="M_d", n_samples=20000, seed=3, chunk_size=7000
+        )
+        self.assertEqual(result.n_failures.shape, (2,))
+        self.assertLess(result.p_f[0], result.p_f[1])
+        repeat = failure_probability(
+            self.batch, load, capacity="M_d", n_samples=20000, seed=3, chunk_size=7000
+        )
+        np.testing.assert_array_equal(result.n_failures, repeat.n_failures)
+        self.assertTrue(np.all(result.beta[0] > result.beta[1]))
+
+
+if __name__ == "__main__":
+    unittest.main()
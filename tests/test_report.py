@@ -0,0 +1,44 @@
+import csv
+import io
+import json
+import unittest
+from timberas.geometry import TimberSection
+from timberas.material import TimberMaterial
+from timberas.member import BoardMember
+from timberas.report import ReportWriter, write_report
+
+
+class TestReport(unittest.TestCase):
+    """unit tests for streaming report writer"""
+
+    def setUp(self):
+        sec = TimberSection.from_library("190x45")
+        mat = TimberMaterial.from_library("MGP10")
+        self.members = [BoardMember(sec=sec, mat=mat, L=L) for L in (1200, 2400, 3600)]
+        self.attributes = ["L", "k_1", "S3", "f_b", "I_x", "N_dc"]
+
+    def test_formats(self):
+        stream = io.StringIO()
+        self.assertEqual(write_report(iter(self.members), stream, "csv", self.attributes), 3)
+        rows = list(csv.DictReader(io.StringIO(stream.getvalue())))
+        self.assertEqual(float(rows[2]["N_dc"]), self.members[2].N_dc)
+        self.assertEqual(float(rows[0]["I_x"]), self.members[0].sec.I_x)
+
+        stream = io.StringIO()
+        write_report(self.members, stream, "json", self.attributes)
+        self.assertEqual(json.loads(stream.getvalue())[1]["S3"], self.members[1].S3)
+
+        stream = io.StringIO()
+        write_report(self.members, stream, "markdown", self.attributes, with_nomenclature=True)
+        lines = stream.getvalue().splitlines()
+        self.assertEqual(len(lines), 5)
+        self.assertIn("k_1 Load duration factor", lines[0])
+
+        stream = io.StringIO()
+        with ReportWriter(stream, "html", self.attributes) as writer:
+            writer.write(self.members[0])
+        self.assertEqual(stream.getvalue().count("<tr>"), 2)
+
+
+if __name__ == "__main__":
+    unittest.main()
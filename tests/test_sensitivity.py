@@ -0,0 +1,76 @@
+import unittest
+from unittest.mock import patch
+import numpy as np
+from timberas.batch import MemberBatch, CAPACITY_NAMES
+from timberas.geometry import TimberSection
+from timberas.material import TimberMaterial
+from timberas.member import BoardMember
+from timberas.sensitivity import capacity_gradients, calc_k12_derivative, GRADIENT_VARIABLES
+
+
+def rectangular_batch(**inputs):
+    """unrounded MemberBatch of rectangular sections, section properties from b and d"""
+    values = dict(
+        b=45.0, d=190.0, n=1, f_b=17.0, f_t=7.7, f_s=2.6, f_c=18.0, E=10000.0, phi=0.9,
+        L=4000.0, L_ax=4000.0, L_ay=1200.0, L_a_phi=800.0,
+    )
+    values.update(inputs)
+    b_tot, d = values["n"] * values["b"], values["d"]
+    values.update(A_t=b_tot * d, A_c=b_tot * d, I_x=b_tot * d**3 / 12, I_y=d * b_tot**3 / 12)
+    return MemberBatch(**values, sig_figs=0)
+
+
+class TestCapacityGradients(unittest.TestCase):
+    """unit tests for analytic capacity gradients"""
+
+    def test_k12_derivative(self):
+        x = np.array([5, 15, 25])
+        np.testing.assert_allclose(calc_k12_derivative(x), [0, -0.05, -400 / 25**3])
+
+    def test_finite_differences(self):
+        inputs = dict(
+            L=np.array([900.0, 3000.0, 7000.0, 3000.0, 3000.0]),
+            L_ay=np.array([2500.0, 600.0, 150.0, 600.0, 150.0]),
+            restraint_edge=np.array(
+                ["compression", "tension", "tension", "compression", "tension_and_torsional"]
+            ),
+        )
+        # slenderness coefficients are differentiated before rounding
+        with patch("timberas.batch.round_decimals", lambda val, digits: np.asarray(val, float)):
+            grads = capacity_gradients(rectangular_batch(**inputs))
+            for var in GRADIENT_VARIABLES:
+                x = np.asarray(getattr(rectangular_batch(**inputs), var), dtype=float)
+                h = 1e-6 * x
+                up = rectangular_batch(**{**inputs, var: x + h})
+                down = rectangular_batch(**{**inputs, var: x - h})
+                for name in CAPACITY_NAMES:
+                    fd = (getattr(up, name) - getattr(down, name)) / (2 * h)
+                    scale = np.abs(grads.values[name]) / x
+                    np.testing.assert_allclose(
+                        grads[name, var], fd, rtol=1e-6, atol=1e-6 * scale.max(), err_msg=var
+                    )
+
+    def test_member(self):
+        mem = BoardMember(
+            sec=TimberSection.from_library("2/90x45"),
+            mat=TimberMaterial.from_library("MGP10"),
+            L=3600,
+            L_a={"x": None, "y": 900},
+        )
+        mem.n_mem, mem.s = 4, 600
+        mem.solve_capacities()
+        grads = capacity_gradients(mem)
+        self.assertIsInstance(grads["M_d", "d"], float)
+        self.assertAlmostEqual(grads.values["M_d"], mem.M_d, delta=1e-3 * mem.M_d)
+        # k_9 increases with L for members in a parallel system
+        self.assertGreater(grads["M_d", "L"], 0)
+        batch = capacity_gradients(MemberBatch.from_members([mem]))
+        self.assertEqual(batch["M_d", "L"][0], 0.0)
+        self.assertEqual(len(grads.to_frame().columns), 6 * (1 + len(GRADIENT_VARIABLES)))
+        elasticity = grads.elasticities("V_d", {"d": mem.sec.d, "f_s": mem.mat.f_s})
+        self.assertAlmostEqual(elasticity["d"], 1.0)
+        self.assertAlmostEqual(elasticity["f_s"], 1.0)
+
+
+if __name__ == "__main__":
+    unittest.main()
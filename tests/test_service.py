@@ -0,0 +1,95 @@
+import asyncio
+import threading
+import unittest
+from unittest.mock import patch
+from timberas.service import DesignCheckService, DesignCheckClient, serve
+
+
+class TestDesignCheckService(unittest.IsolatedAsyncioTestCase):
+    """unit tests for DesignCheckService and JSON-lines server"""
+
+    async def test_submit(self):
+        async with DesignCheckService(max_wait=0.01) as service:
+            requests = [{"id": i, "sec": "90x45", "mat": "MGP10", "L": 2400} for i in range(20)]
+            responses = await asyncio.gather(*[service.submit(req) for req in requests])
+        self.assertEqual([res["id"] for res in responses], list(range(20)))
+        self.assertTrue(all(res["ok"] for res in responses))
+        self.assertAlmostEqual(responses[0]["result"]["N_dt"], 28.07)
+        self.assertLess(service.stats["batches"], 20)
+        self.assertEqual(service.stats["requests"], 20)
+
+    async def test_client(self):
+        async with DesignCheckService(max_queue=4) as service:
+            server = await serve(service)
+            port = server.sockets[0].getsockname()[1]
+            client = await DesignCheckClient.connect("127.0.0.1", port)
+            requests = [{"sec": "90x45", "mat": "MGP10", "L": 1000 + i} for i in range(50)]
+            requests.append({"sec": "unknown", "mat": "MGP10"})
+            responses = await asyncio.gather(*[client.check(req) for req in requests])
+            await client.close()
+            server.close()
+            await server.wait_closed()
+        self.assertTrue(all(res["ok"] for res in responses[:-1]))
+        self.assertFalse(responses[-1]["ok"])
+        self.assertIn("KeyError", responses[-1]["error"])
+        self.assertIn("total_ms", responses[0]["latency"])
+
+    async def test_failures(self):
+        """unexpected errors and stopping fail the requests of the current batch only"""
+        request = {"sec": "90x45", "mat": "MGP10", "L": 2400, "update_from_section_size": True}
+        service = await DesignCheckService(max_wait=0).start()
+        with patch.object(service, "evaluate", side_effect=RuntimeError("broken")):
+            with self.assertRaises(RuntimeError):
+                await asyncio.wait_for(service.submit(request), 5)
+        # the batching task is still running, and sized materials are shared across batches
+        for _ in range(2):
+            self.assertTrue((await asyncio.wait_for(service.submit(request), 5))["ok"])
+        self.assertGreater(service.sized_materials.hits, 0)
+
+        started, release = threading.Event(), threading.Event()
+
+        def blocked(requests):
+            started.set()
+            release.wait(5)
+            return []
+
+        with patch.object(service, "evaluate", side_effect=blocked):
+            task = asyncio.create_task(service.submit(request))
+            await asyncio.get_running_loop().run_in_executor(None, started.wait, 5)
+            await service.stop()
+            release.set()
+            with self.assertRaises(RuntimeError):
+                await asyncio.wait_for(task, 1)
+
+    async def test_client_stopped(self):
+        """requests in flight when the service stops receive error responses"""
+        service = await DesignCheckService(max_wait=0).start()
+        server = await serve(service)
+        port = server.sockets[0].getsockname()[1]
+        client = await DesignCheckClient.connect("127.0.0.1", port)
+        started, release = threading.Event(), threading.Event()
+
+        def blocked(requests):
+            started.set()
+            release.wait(5)
+            return []
+
+        request = {"sec": "90x45", "mat": "MGP10", "L": 2400}
+        with patch.object(service, "evaluate", side_effect=blocked):
+            tasks = [asyncio.create_task(client.check(request)) for _ in range(3)]
+            await asyncio.get_running_loop().run_in_executor(None, started.wait, 5)
+            await service.stop()
+            release.set()
+            responses = await asyncio.wait_for(asyncio.gather(*tasks), 5)
+        # requests after stopping are not started
+        responses.append(await asyncio.wait_for(client.check(request), 5))
+        await client.close()
+        server.close()
+        await server.wait_closed()
+        self.assertFalse(any(res["ok"] for res in responses))
+        self.assertIn("design check service stopped", responses[0]["error"])
+        self.assertIn("not started", responses[-1]["error"])
+
+
+if __name__ == "__main__":
+    unittest.main()
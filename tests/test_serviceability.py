@@ -0,0 +1,50 @@
+import unittest
+import numpy as np
+from timberas.geometry import TimberSection
+from timberas.material import TimberMaterial
+from timberas.member import BoardMember
+from timberas.serviceability import j_2_lookup, check_deflection, deflection_cases
+
+
+class TestServiceability(unittest.TestCase):
+    """unit tests for deflection checks"""
+
+    def test_j_2_lookup(self):
+        np.testing.assert_allclose(
+            j_2_lookup([True, True, False, True], [1, 365, 1000, 0.1]), [1, 2, 3, 1]
+        )
+
+    def test_member_deflection(self):
+        member = BoardMember(
+            sec=TimberSection.from_library("190x45"),
+            mat=TimberMaterial.from_library("MGP10"),
+            L=3600,
+        )
+        I_x = member.sec.I_x
+        self.assertAlmostEqual(
+            member.deflection(1.0), 5 * 3600**4 / (384 * 10000 * I_x)
+        )
+        self.assertAlmostEqual(member.deflection(1.0, duration=365), 2 * member.deflection(1.0))
+
+    def test_check_deflection(self):
+        L = np.array([3000.0, 3600.0, 4200.0])
+        check = check_deflection(
+            L=L,
+            E=10000,
+            I=45 * 190**3 / 12,
+            G=0.5,
+            Q=1.5,
+            spacing=450,
+            seasoned=True,
+        )
+        self.assertEqual(check.deflection.shape, (3, len(deflection_cases())))
+        w_Q = 1.5 * 0.45
+        expected = 5 * w_Q * L**4 / (384 * 10000 * 45 * 190**3 / 12)
+        np.testing.assert_allclose(check.deflection[:, 1], expected)
+        np.testing.assert_allclose(check.limit[:, 1], np.minimum(L / 360, 9.0))
+        self.assertTrue(np.all(np.diff(check.util_max) > 0))
+        self.assertEqual(check.passed.dtype, bool)
+
+
+if __name__ == "__main__":
+    unittest.main()
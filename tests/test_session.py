@@ -0,0 +1,92 @@
+import unittest
+from dataclasses import replace
+from timberas.geometry import TimberSection
+from timberas.material import TimberMaterial
+from timberas.member import BoardMember, CAPACITIES
+from timberas.session import DesignSession, affected_capacities
+
+
+class TestDesignSession(unittest.TestCase):
+    """unit tests for DesignSession class"""
+
+    def setUp(self):
+        self.sec = TimberSection.from_library("90x45")
+        self.mat = TimberMaterial.from_library("MGP10")
+        self.members = [
+            BoardMember(sec=self.sec, mat=self.mat, L=1800 + 300 * i, L_a={"x": None, "y": 600})
+            for i in range(4)
+        ]
+        self.other = BoardMember(
+            sec=TimberSection.from_library("190x45"), mat=self.mat, L=3000
+        )
+        self.session = DesignSession(self.members + [self.other], keep_events=True)
+        self.received = []
+        self.session.subscribe(self.received.append)
+
+    def assert_solved(self):
+        """session members have the capacities of newly created members"""
+        for mem in self.session.members:
+            fresh = BoardMember(
+                sec=replace(mem.sec), mat=replace(mem.mat), L=mem.L, L_a=mem.L_a, k_1=mem.k_1
+            )
+            for name in CAPACITIES:
+                self.assertEqual(str(getattr(mem, name)), str(getattr(fresh, name)))
+
+    def test_affected_capacities(self):
+        self.assertEqual(affected_capacities({"mat.f_b"}), ("M_d",))
+        self.assertEqual(affected_capacities({"L_a"}), ("N_dcy", "N_dc", "M_d"))
+        self.assertEqual(affected_capacities({"mat.density"}), ())
+        self.assertEqual(affected_capacities({"sig_figs"}), CAPACITIES)
+
+    def test_edit_material(self):
+        event = self.session.edit(self.mat, f_b=15.0)
+        self.assertEqual(event.recalculated, [0, 1, 2, 3, 4])
+        self.assertEqual(event.capacities, ("M_d",))
+        self.assertEqual({change.name for change in event.changed}, {"M_d"})
+        self.assertEqual(self.received, [event])
+        self.assert_solved()
+
+    def test_edit_section_and_member(self):
+        event = self.session.edit(self.sec, d=140)
+        self.assertEqual(event.recalculated, [0, 1, 2, 3])
+        self.assertEqual(self.sec.A_c, 140 * 45)
+        event = self.session.edit(self.members[0], L=2400.0)
+        self.assertEqual(event.recalculated, [0])
+        self.assertNotIn("N_dt", event.capacities)
+        self.assert_solved()
+        with self.assertRaises(KeyError):
+            self.session.edit(TimberMaterial.from_library("MGP12"), f_b=1)
+
+    def test_edit_k_9_parameters(self):
+        """BoardMember n_mem and s are class attributes, not dataclass fields"""
+
+        def fresh_M_d(mem):
+            fresh = BoardMember(sec=replace(mem.sec), mat=replace(mem.mat), L=mem.L, L_a=mem.L_a)
+            fresh.n_mem, fresh.s = 4, 300
+            fresh.solve_capacities()
+            return fresh.M_d
+
+        member = self.members[0]
+        event = self.session.edit(member, n_mem=4, s=300)
+        self.assertEqual(event.changes, {"n_mem": 4, "s": 300})
+        self.assertEqual(event.capacities, ("M_d",))
+        self.assertGreater(member.k_9, 1)
+        self.assertEqual(member.M_d, fresh_M_d(member))
+        self.members[1].n_mem, self.members[1].s = 4, 300
+        events = self.session.sync()
+        self.assertEqual(len(events), 1)
+        self.assertEqual(events[0].capacities, ("M_d",))
+        self.assertEqual(self.members[1].M_d, fresh_M_d(self.members[1]))
+
+    def test_sync(self):
+        self.mat.f_c = 20.0
+        self.members[1].k_1 = 0.8
+        events = self.session.sync()
+        self.assertEqual(len(events), 2)
+        self.assertEqual(self.session.sync(), [])
+        self.assert_solved()
+        self.assertEqual(len(self.session.events), 2)
+
+
+if __name__ == "__main__":
+    unittest.main()
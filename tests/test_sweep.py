@@ -0,0 +1,117 @@
+import json
+import os
+import tempfile
+import unittest
+import numpy as np
+from timberas.geometry import TimberSection
+from timberas.material import TimberMaterial
+from timberas.member import BoardMember
+from timberas.sweep import sweep, library_sweep, library_pairs, open_sweep, SWEEP_META_FILE
+
+
+class TestSweep(unittest.TestCase):
+    """unit tests for parametric sweeps"""
+
+    def setUp(self):
+        self.member_dict = {
+            "sec": TimberSection.from_library("90x45"),
+            "mat": TimberMaterial.from_library("MGP10"),
+            "g_13": 0.9,
+            "L": 2400,
+            "L_a": {"x": None, "y": 1200},
+        }
+        self.member = BoardMember(**self.member_dict)
+
+    def test_sweep(self):
+        L = [1200, 2400, 3600]
+        L_ay = [450, 900]
+        result = sweep(self.member, L=L, L_ay=L_ay, r=[0.25, 1.0])
+        self.assertEqual(result.shape, (3, 2, 2))
+        self.assertEqual(result.dims, ("L", "L_ay", "r"))
+        for i, length in enumerate(L):
+            for j, l_ay in enumerate(L_ay):
+                member = BoardMember(
+                    **(self.member_dict | {"L": length, "L_a": {"x": None, "y": l_ay}, "r": 1.0})
+                )
+                self.assertEqual(result["N_dc"][i, j, 1], member.N_dc)
+                self.assertEqual(result["M_d"][i, j, 1], member.M_d)
+        self.assertEqual(result.sel(L=2400, r=1.0).shape, (2,))
+        self.assertEqual(len(result.to_frame()), 12)
+
+    def test_sweep_follows_L(self):
+        """L_ax defaults to L and follows a swept L"""
+        result = sweep(self.member, outputs=("S3",), L=[1000, 2000])
+        np.testing.assert_allclose(result["S3"], [10.0, 20.0])
+
+    def test_sweep_out_dir(self):
+        """memory-mapped sweep outputs, resumed from the metadata sidecar"""
+        axes = {"L": [1200, 2400, 3600], "L_ay": [450, 900]}
+        in_memory = sweep(self.member, **axes)
+        with tempfile.TemporaryDirectory() as tmp:
+            result = sweep(self.member, out_dir=tmp, chunk_size=2, **axes)
+            self.assertIsInstance(result["N_dc"], np.memmap)
+            np.testing.assert_array_equal(result["N_dc"], in_memory["N_dc"])
+            del result
+            # interrupted after the first chunk: the first chunk is not recomputed
+            meta_path = os.path.join(tmp, SWEEP_META_FILE)
+            with open(meta_path, encoding="utf-8") as f:
+                meta = json.load(f)
+            meta.update(completed_chunks=1, complete=False)
+            with open(meta_path, "w", encoding="utf-8") as f:
+                json.dump(meta, f)
+            with self.assertRaises(ValueError):
+                open_sweep(tmp)
+            reopened = np.load(os.path.join(tmp, "N_dc.npy"), mmap_mode="r+")
+            reopened[:] = -1
+            reopened.flush()
+            del reopened
+            result = sweep(self.member, out_dir=tmp, chunk_size=2, **axes)
+            self.assertTrue(np.all(result["N_dc"][:2] == -1))
+            np.testing.assert_array_equal(result["N_dc"][2], in_memory["N_dc"][2])
+            self.assertEqual(open_sweep(tmp).sel(L=3600)["M_d"].shape, (2,))
+            del result
+
+            # interrupted, then rerun with a different chunk size: recomputed
+            meta.update(completed_chunks=1, complete=False)
+            with open(meta_path, "w", encoding="utf-8") as f:
+                json.dump(meta, f)
+            result = sweep(self.member, out_dir=tmp, chunk_size=1, **axes)
+            np.testing.assert_array_equal(result["N_dc"], in_memory["N_dc"])
+            del result
+
+            # different template with the same sweep axes: recomputed
+            other = BoardMember(
+                **{
+                    **self.member_dict,
+                    "sec": TimberSection.from_library("140x45"),
+                    "mat": TimberMaterial.from_library("MGP12"),
+                }
+            )
+            result = sweep(other, out_dir=tmp, chunk_size=2, **axes)
+            np.testing.assert_array_equal(result["N_dc"], sweep(other, **axes)["N_dc"])
+            self.assertFalse(np.array_equal(result["N_dc"], in_memory["N_dc"]))
+
+    def test_library_sweep(self):
+        pairs = library_pairs()
+        self.assertTrue(pairs.loc["90x45", "MGP10"])
+        self.assertFalse(pairs.loc["90x45", "F7 Unseasoned Hardwood"])
+        self.assertTrue(pairs.loc["GL395x85", "GL12"])
+        charts = library_sweep(
+            sections=["90x45", "190x45"],
+            materials=["MGP10", "GL12"],
+            L=[1200, 2400],
+            member_inputs={"g_13": 0.9, "L_a": {"x": None, "y": 1200}},
+        )
+        self.assertEqual(charts.shape, (2, 2, 2))
+        self.assertEqual(charts.sel(sec="90x45", mat="MGP10", L=2400)["N_dc"], self.member.N_dc)
+        self.assertTrue(np.all(np.isnan(charts.sel(mat="GL12")["N_dc"])))
+        mat = TimberMaterial.from_library("MGP10")
+        mat.update_from_section_size(190)
+        member = BoardMember(
+            **(self.member_dict | {"sec": TimberSection.from_library("190x45"), "mat": mat})
+        )
+        self.assertEqual(charts.sel(sec="190x45", mat="MGP10", L=2400)["M_d"], member.M_d)
+
+
+if __name__ == "__main__":
+    unittest.main()